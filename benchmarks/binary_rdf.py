@@ -0,0 +1,81 @@
+"""
+Compare binary RDF with N-Triples and JSON-LD for the Works in
+sample/batch.jsonld: body size, plain and gzipped, and the time a client
+takes to parse each back into triples:
+
+    uv run python benchmarks/binary_rdf.py [--rounds 3]
+
+No database is needed. N-Triples and JSON-LD are parsed with rdflib, binary
+RDF with the reference decoder both on its own and into an rdflib Graph.
+"""
+
+import argparse
+import gzip
+import json
+import pathlib
+import time
+from collections.abc import Callable
+from typing import Any
+
+from rdflib import Graph
+
+from bluecore_api.app.utils.serialize.binary import (
+    binary_rdf,
+    decode,
+    decode_graph,
+)
+from bluecore_api.app.utils.serialize.ntriples import ntriples
+from bluecore_api.app.utils.serialize.triples import all_triples
+
+SAMPLE = pathlib.Path(__file__).parent.parent / "sample" / "batch.jsonld"
+
+
+def measure(label: str, parse: Callable[[bytes], Any], body: bytes, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parse(body)
+    elapsed = (time.perf_counter() - start) / rounds
+    print(
+        f"{label:26} {len(body) / 1024:9.0f} KiB "
+        f"{len(gzip.compress(body)) / 1024:9.0f} KiB gz {elapsed * 1000:9.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    batch = json.loads(SAMPLE.read_text())
+    context = batch[0]["@context"]
+    triples = list(all_triples(batch, context))
+    bodies = {
+        "jsonld": json.dumps(batch).encode(),
+        "nt": b"".join(ntriples(triples)),
+        "binary": b"".join(binary_rdf(triples)),
+    }
+    print(f"{len(batch)} Works, {len(triples)} triples, {args.rounds} rounds")
+    print(f"{'':26} {'size':>13} {'gzipped':>16} {'parse':>12}")
+    measure(
+        "JSON-LD (rdflib)",
+        lambda body: Graph().parse(data=body, format="json-ld"),
+        bodies["jsonld"],
+        args.rounds,
+    )
+    measure(
+        "N-Triples (rdflib)",
+        lambda body: Graph().parse(data=body, format="nt"),
+        bodies["nt"],
+        args.rounds,
+    )
+    measure(
+        "binary (decode)",
+        lambda body: list(decode(body)),
+        bodies["binary"],
+        args.rounds,
+    )
+    measure("binary (rdflib Graph)", decode_graph, bodies["binary"], args.rounds)
+
+
+if __name__ == "__main__":
+    main()
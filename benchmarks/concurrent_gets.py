@@ -0,0 +1,69 @@
+"""
+Measure concurrent GET throughput against a running Blue Core API.
+
+Fires `--requests` GETs at each path with `--concurrency` requests in flight
+and reports requests/second and latency percentiles. Run it against a server
+on the previous release and on this branch (same data, same worker count) to
+compare:
+
+    uv run python benchmarks/concurrent_gets.py http://localhost:3000 \\
+        /works/<uuid>.jsonld /instances/<uuid>.cbd.xml "/search/?q=history"
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def _worker(
+    client: httpx.AsyncClient, path: str, remaining: list[int], latencies: list[float]
+) -> None:
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        start = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+
+
+async def run(base_url: str, path: str, requests: int, concurrency: int) -> None:
+    latencies: list[float] = []
+    remaining = [requests]
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60, follow_redirects=True
+    ) as client:
+        # warm up connections and any per-process caches
+        await client.get(path)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(_worker(client, path, remaining, latencies) for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{path}: {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50 {quantiles[49] * 1000:7.1f} ms  "
+        f"p95 {quantiles[94] * 1000:7.1f} ms  "
+        f"p99 {quantiles[98] * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base_url")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    for path in args.paths:
+        asyncio.run(run(args.base_url, path, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
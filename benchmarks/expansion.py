@@ -0,0 +1,82 @@
+"""
+Compare expansion with the serialize/re-parse round trips it replaced, for a
+Work linked to many other resources:
+
+    uv run python benchmarks/expansion.py [--links 60] [--rounds 5]
+
+No database is needed. The Work is the first one in sample/batch.jsonld and
+its other resources are the batch's other Works, stored as OtherResources.
+"""
+
+import argparse
+import json
+import pathlib
+import time
+from collections.abc import Callable
+
+from bluecore_models.models import BibframeOtherResources, OtherResource, Work
+from bluecore_models.utils.graph import load_jsonld
+
+from bluecore_api.expansion import expand_resource_as_graph, expand_resource_graph
+
+SAMPLE = pathlib.Path(__file__).parent.parent / "sample" / "batch.jsonld"
+
+
+def round_trip_graph(work: Work):
+    graph = load_jsonld(work.data)
+    for row in work.other_resources:
+        other_graph = load_jsonld(row.other_resource.data)
+        graph.parse(data=other_graph.serialize(format="json-ld"), format="json-ld")
+    return graph
+
+
+def round_trip_jsonld(work: Work) -> dict:
+    data = json.loads(round_trip_graph(work).serialize(format="json-ld"))
+    return Work(uri=work.uri, data=data).data
+
+
+def load_work(links: int) -> Work:
+    nodes = json.loads(SAMPLE.read_text())
+    if links >= len(nodes):
+        raise SystemExit(f"{SAMPLE.name} has {len(nodes) - 1} Works to link")
+    work = Work(uri=nodes[0]["@id"], data=nodes[0])
+    for i, node in enumerate(nodes[1 : links + 1], start=1):
+        other = OtherResource(id=i, uri=node["@id"], data=node)
+        work.other_resources.append(
+            BibframeOtherResources(other_resource=other, bibframe_resource=work)
+        )
+    return work
+
+
+def measure(label: str, expand: Callable[[Work], object], work, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        expand(work)
+    elapsed = time.perf_counter() - start
+    print(f"{label:28} {elapsed / rounds * 1000:9.1f} ms/expansion")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--links", type=int, default=60)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    work = load_work(args.links)
+    print(f"1 Work with {args.links} other resources, {args.rounds} rounds")
+    for label, old, new in [
+        (
+            "Graph",
+            round_trip_graph,
+            lambda doc: expand_resource_as_graph(doc, load_jsonld(doc.data)),
+        ),
+        ("JSON-LD", round_trip_jsonld, expand_resource_graph),
+    ]:
+        before = measure(f"{label} (round trip)", old, work, args.rounds)
+        after = measure(f"{label} (merged)", new, work, args.rounds)
+        print(f"{label:28} {before / after:9.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare the JSON-LD and Sinopia JSON response encoders with the previous
+pydantic path, using the Works in sample/batch.jsonld:
+
+    uv run python benchmarks/jsonld_responses.py [--rounds 20]
+
+No database is needed; the Works are built in memory.
+"""
+
+import argparse
+import json
+import pathlib
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from bluecore_models.models import Work
+
+from bluecore_api.app.utils.serialize.response_generator import (
+    as_jsonld,
+    as_vnd_sinopia_json,
+)
+from bluecore_api.constants import CONTEXT_URL
+from bluecore_api.schemas.schemas import WorkSchema
+
+SAMPLE = pathlib.Path(__file__).parent.parent / "sample" / "batch.jsonld"
+
+
+def pydantic_jsonld(doc: Work) -> bytes:
+    doc.data["@context"] = CONTEXT_URL
+    return json.dumps(WorkSchema.model_validate(doc).data).encode()
+
+
+def pydantic_sinopia_json(doc: Work) -> bytes:
+    doc.data["@context"] = CONTEXT_URL
+    return WorkSchema.model_validate(doc).model_dump_json().encode()
+
+
+def load_works() -> list[Work]:
+    now = datetime.now(UTC)
+    return [
+        Work(
+            id=i,
+            uuid=uuid.uuid4(),
+            uri=node["@id"],
+            data=node,
+            hub_id=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i, node in enumerate(json.loads(SAMPLE.read_text()))
+    ]
+
+
+def measure(label: str, encode: Callable[[Work], bytes], works, rounds: int) -> float:
+    start = time.perf_counter()
+    size = 0
+    for _ in range(rounds):
+        for work in works:
+            size += len(encode(work))
+    elapsed = time.perf_counter() - start
+    per_doc = elapsed / (rounds * len(works)) * 1_000_000
+    print(f"{label:28} {per_doc:9.1f} µs/doc  {size / rounds / 1024:9.0f} KiB/round")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    works = load_works()
+    print(f"{len(works)} Works from {SAMPLE.name}, {args.rounds} rounds")
+    for label, old, new in [
+        ("JSON-LD", pydantic_jsonld, lambda doc: as_jsonld(doc, False).body),
+        (
+            "Sinopia JSON",
+            pydantic_sinopia_json,
+            lambda doc: as_vnd_sinopia_json(doc, False).body,
+        ),
+    ]:
+        before = measure(f"{label} (pydantic)", old, works, args.rounds)
+        after = measure(f"{label} (orjson)", new, works, args.rounds)
+        print(f"{label:28} {before / after:9.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
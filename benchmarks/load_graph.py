@@ -0,0 +1,51 @@
+"""
+Compare reading the Works in sample/batch.jsonld into rdflib Graphs with
+`load_jsonld` against `load_graph`, which walks them against the
+precompiled CONTEXT:
+
+    uv run python benchmarks/load_graph.py [--rounds 3]
+
+No database is needed.
+"""
+
+import argparse
+import copy
+import json
+import pathlib
+import time
+from collections.abc import Callable
+from typing import Any
+
+from bluecore_models.utils.graph import load_jsonld
+
+from bluecore_api.app.utils.serialize.graph import load_graph, rdf_triples
+
+SAMPLE = pathlib.Path(__file__).parent.parent / "sample" / "batch.jsonld"
+
+
+def measure(label: str, read: Callable[[Any], Any], batch: list, rounds: int):
+    elapsed = 0.0
+    for _ in range(rounds):
+        # load_jsonld may set the documents' @context, so each round gets a copy
+        documents = copy.deepcopy(batch)
+        start = time.perf_counter()
+        for data in documents:
+            read(data)
+        elapsed += time.perf_counter() - start
+    print(f"{label:24} {elapsed / rounds * 1000:9.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    batch = json.loads(SAMPLE.read_text())
+    print(f"{len(batch)} Works, {args.rounds} rounds")
+    measure("load_jsonld", load_jsonld, batch, args.rounds)
+    measure("load_graph", load_graph, batch, args.rounds)
+    measure("rdf_triples", lambda data: tuple(rdf_triples(data)), batch, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
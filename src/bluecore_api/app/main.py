@@ -13,6 +13,7 @@ from fastapi_keycloak_middleware import (
     get_auth,
 )
 from fastapi_mcp import AuthConfig, FastApiMCP
+from sqlalchemy.exc import DBAPIError
 
 from bluecore_api.app.config.logging_setup import setup_logging
 
@@ -20,16 +21,22 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/../../")
 
 from bluecore_models.utils.graph import CONTEXT
 
+from bluecore_api.app.routes.batch_get import endpoints as batch_get_routes
 from bluecore_api.app.routes.batches import endpoints as batch_endpoints
 from bluecore_api.app.routes.convert import endpoints as convert_endpoints
 from bluecore_api.app.routes.export import endpoints as export_routes
 from bluecore_api.app.routes.hubs import endpoints as hub_routes
 from bluecore_api.app.routes.instances import endpoints as instance_routes
+from bluecore_api.app.routes.internal import endpoints as internal_routes
 from bluecore_api.app.routes.other_resources import endpoints as resource_routes
 from bluecore_api.app.routes.profiles import endpoints as profile_routes
 from bluecore_api.app.routes.search import endpoints as search_routes
 from bluecore_api.app.routes.works import endpoints as work_routes
 from bluecore_api.change_documents.routes import change_documents
+from bluecore_api.cpu_pool import CpuPoolUnavailable
+from bluecore_api.database import is_query_canceled
+from bluecore_api.middleware.compression import CompressionMiddleware
+from bluecore_api.middleware.disconnect import CancelOnDisconnectMiddleware
 from bluecore_api.middleware.keycloak_auth import (
     BypassKeycloakForGet,
     CompatibleFastAPI,
@@ -37,6 +44,7 @@ from bluecore_api.middleware.keycloak_auth import (
     set_user_context,
 )
 from bluecore_api.middleware.redirect_headers import RedirectLocationMiddleware
+from bluecore_api.query_stats import QueryStatsMiddleware
 
 """Initialize logging config"""
 setup_logging()
@@ -83,12 +91,14 @@ base_app.include_router(hub_routes, tags=["Hubs"])
 base_app.include_router(work_routes, tags=["Works"])
 base_app.include_router(instance_routes, tags=["Instances"])
 base_app.include_router(resource_routes, tags=["Resources"])
+base_app.include_router(batch_get_routes, tags=["Resources"])
 base_app.include_router(profile_routes, tags=["Profiles"])
 base_app.include_router(search_routes, tags=["Search"])
 base_app.include_router(change_documents, tags=["Change Documents"])
 base_app.include_router(batch_endpoints, tags=["Batches"])
 base_app.include_router(export_routes, tags=["Export"])
 base_app.include_router(convert_endpoints, tags=["Convert"])
+base_app.include_router(internal_routes)
 
 # MCP write methods require a create/update permission
 _mcp_write_permission = CheckPermissions(
@@ -164,12 +174,32 @@ else:
     application = CompatibleFastAPI(app=middleware_wrapped_app)
     base_app.add_middleware(RedirectLocationMiddleware)
 
+base_app.add_middleware(QueryStatsMiddleware)
 base_app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allows for any local client to connect
     allow_methods=["*"],
     allow_headers=["*"],
 )
+base_app.add_middleware(CancelOnDisconnectMiddleware)
+base_app.add_middleware(CompressionMiddleware)
+
+
+@base_app.exception_handler(DBAPIError)
+async def database_error(request: Request, error: DBAPIError) -> Response:
+    """A read that ran past its statement timeout is a 503 rather than a 500."""
+    if is_query_canceled(error):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "The query took too long, try narrowing it"},
+        )
+    raise error
+
+
+@base_app.exception_handler(CpuPoolUnavailable)
+async def cpu_pool_unavailable(request: Request, error: CpuPoolUnavailable) -> Response:
+    """A full CPU pool, or a task that ran past its timeout, is a 503."""
+    return JSONResponse(status_code=503, content={"detail": str(error)})
 
 
 @base_app.get("/")
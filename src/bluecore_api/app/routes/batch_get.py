@@ -0,0 +1,86 @@
+"""
+POST /resources/batch-get: many Works, Instances and Hubs in one request.
+
+Editors and sync jobs used to fetch related resources one GET at a time.
+This route reads them all in a fixed number of queries and returns them
+together, as a JSON array or as one RDF graph.
+
+- BATCH_GET_MAX: most uuids and URIs a request may ask for (default 100)
+"""
+
+import os
+
+from bluecore_models.models import Hub, Instance, ResourceBase, Work
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import with_polymorphic
+
+from bluecore_api import materialized
+from bluecore_api.app.utils.serialize.loading import batch_options
+from bluecore_api.app.utils.serialize.response_generator import (
+    BATCH_FORMATS,
+    batch_response,
+)
+from bluecore_api.cpu_pool import rendered
+from bluecore_api.database import get_async_db
+from bluecore_api.schemas.schemas import BatchGetSchema
+
+BATCH_GET_MAX = int(os.getenv("BATCH_GET_MAX", "100"))
+
+endpoints = APIRouter()
+
+
+@endpoints.post("/resources/batch-get", operation_id="batch_get_resources")
+async def batch_get(
+    batch: BatchGetSchema,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """
+    The Works, Instances and Hubs with the given `uuids` and `uris`, in the
+    order asked for, as `format`: "jsonld" (the default) or
+    "vnd.sinopia.json" for a JSON array, "nt", "ttl", "rdf" or "brdf" for a
+    single graph. Identifiers that match nothing are left out.
+    """
+    if len(batch.uuids) + len(batch.uris) > BATCH_GET_MAX:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {BATCH_GET_MAX} uuids and uris can be fetched at once",
+        )
+    if batch.format not in BATCH_FORMATS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"format must be one of {', '.join(sorted(BATCH_FORMATS))}",
+        )
+
+    resource = with_polymorphic(ResourceBase, [Hub, Instance, Work])
+    found = []
+    if batch.uuids or batch.uris:
+        stmt = (
+            select(resource)
+            .where(
+                resource.type.in_(materialized.MATERIALIZED_TYPES),
+                or_(resource.uuid.in_(batch.uuids), resource.uri.in_(batch.uris)),
+            )
+            .options(*batch_options(resource, batch.expand))
+        )
+        found = (await db.execute(stmt)).scalars().all()
+    by_identifier = {str(doc.uuid): doc for doc in found} | {
+        doc.uri: doc for doc in found
+    }
+    docs = list(
+        {
+            doc.id: doc
+            for identifier in [*map(str, batch.uuids), *batch.uris]
+            if (doc := by_identifier.get(identifier)) is not None
+        }.values()
+    )
+    expansions = await materialized.read_many(
+        db, [doc.id for doc in docs], batch.format, batch.expand
+    )
+
+    # Serializers lazy load other resources, so they run under run_sync
+    resp = await db.run_sync(
+        lambda _: batch_response(docs, batch.expand, batch.format, expansions)
+    )
+    return await rendered(resp)
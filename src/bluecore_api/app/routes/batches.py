@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 
 from bluecore_api import workflow
 from bluecore_api.constants import READ_ONLY_ROLES, KeycloakRole
+from bluecore_api.cpu_pool import cpu_pool
 from bluecore_api.middleware.bluecore_check_permissions import (
     BluecoreCheckPermissions as BCP,
 )
@@ -27,16 +28,21 @@ def _dag_for_filename(filename: str) -> str:
     return "resource_loader"
 
 
-def _xml_to_jsonld_and_save(
+def _xml_to_jsonld(xml_data: bytes | str) -> str:
+    """Convert RDF/XML (bytes or str) to JSON-LD; run in the CPU pool."""
+    g = rdflib.Graph()
+    g.parse(data=xml_data, format="xml")
+    return g.serialize(format="json-ld")
+
+
+async def _xml_to_jsonld_and_save(
     upload_root: Path, xml_data: bytes | str, name: str | None = None
 ) -> str:
     """
     Convert RDF/XML (bytes or str) to JSON-LD, save under ./uploads/<uuid>/<name>.jsonld,
     and return the /opt/airflow/uploads/... file_location string.
     """
-    g = rdflib.Graph()
-    g.parse(data=xml_data, format="xml")
-    jsonld_text = g.serialize(format="json-ld")
+    jsonld_text = await cpu_pool.run(_xml_to_jsonld, xml_data)
 
     safe_name = (name or "batch").rsplit(".", 1)[0]
     batch_file = f"{uuid4()}/{safe_name}.jsonld"
@@ -122,7 +128,9 @@ async def create_batch_file(
                 )
             name = data.get("name") or "batch"
 
-            file_location = _xml_to_jsonld_and_save(upload_root, rdfxml, name=name)
+            file_location = await _xml_to_jsonld_and_save(
+                upload_root, rdfxml, name=name
+            )
             workflow_id = await workflow.create_batch_from_uri(
                 file_location, user_uid=user_uid
             )
@@ -134,7 +142,7 @@ async def create_batch_file(
             if not xml_bytes:
                 raise HTTPException(status_code=422, detail="Empty XML body.")
 
-            file_location = _xml_to_jsonld_and_save(upload_root, xml_bytes)
+            file_location = await _xml_to_jsonld_and_save(upload_root, xml_bytes)
             workflow_id = await workflow.create_batch_from_uri(
                 file_location, user_uid=user_uid
             )
@@ -9,6 +9,7 @@ from pymarc import MARCReader
 from pymarc.marcxml import record_to_xml
 
 from bluecore_api.constants import READ_ONLY_ROLES, KeycloakRole
+from bluecore_api.cpu_pool import cpu_pool
 from bluecore_api.middleware.bluecore_check_permissions import (
     BluecoreCheckPermissions as BCP,
 )
@@ -45,6 +46,24 @@ def _marcxml_to_bibframe_jsonld(marcxml_bytes: bytes) -> str:
     return g.serialize(format="json-ld")
 
 
+class ConversionError(Exception):
+    """Why a MARCXML document couldn't be converted."""
+
+
+def _convert_marcxml(marcxml_bytes: bytes) -> str:
+    """
+    `_marcxml_to_bibframe_jsonld` for the CPU pool. lxml's errors come back
+    as a ConversionError message, which survives the trip from a worker
+    process whatever the error carries.
+    """
+    try:
+        return _marcxml_to_bibframe_jsonld(marcxml_bytes)
+    except etree.XMLSyntaxError as exc:
+        raise ConversionError(f"Invalid XML: {exc}")
+    except etree.XSLTApplyError as exc:
+        raise ConversionError(f"Transformation failed: {exc}")
+
+
 @endpoints.post(
     "/marc2xml",
     dependencies=[Depends(BCP(KeycloakRole.CREATE, READ_ONLY_ROLES))],
@@ -125,10 +144,8 @@ async def marc2bibframe(
         raise HTTPException(status_code=422, detail="Empty MARCXML payload.")
 
     try:
-        jsonld = _marcxml_to_bibframe_jsonld(marcxml_bytes)
-    except etree.XMLSyntaxError as exc:
-        raise HTTPException(status_code=422, detail=f"Invalid XML: {exc}")
-    except etree.XSLTApplyError as exc:
-        raise HTTPException(status_code=422, detail=f"Transformation failed: {exc}")
+        jsonld = await cpu_pool.run(_convert_marcxml, marcxml_bytes)
+    except ConversionError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
 
     return Response(content=jsonld, media_type="application/ld+json")
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import os
@@ -6,27 +7,52 @@ from pathlib import Path
 from bluecore_models.bluecore_graph import save_graph
 from bluecore_models.models import Hub
 from bluecore_models.utils.graph import BF, load_jsonld
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+)
 from rdflib import RDF
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from bluecore_api import deletion, materialized
 from bluecore_api.app.utils.deserializer import deserialize, request_body_openapi
 from bluecore_api.app.utils.examples import HUB_EXAMPLE
+from bluecore_api.app.utils.serialize.loading import load_options
 from bluecore_api.app.utils.serialize.response_generator import as_jsonld
-from bluecore_api.app.utils.serializer import serialize
+from bluecore_api.app.utils.serializer import (
+    requested_format,
+    serialize_cached,
+    serialize_expanded,
+)
+from bluecore_api.conditional import resource_validators
 from bluecore_api.constants import CONTEXT_URL, READ_ONLY_ROLES, KeycloakRole
+from bluecore_api.cpu_pool import CpuPoolUnavailable, rendered
 from bluecore_api.database import (
+    get_async_db,
     get_db,
     get_session_maker,
 )
 from bluecore_api.middleware.bluecore_check_permissions import (
     BluecoreCheckPermissions as BCP,
 )
+from bluecore_api.representation_cache import representation_cache
 from bluecore_api.schemas.schemas import (
     HubCreateSchema,
     HubSchema,
     HubUpdateSchema,
 )
+from bluecore_api.selective_expansion import (
+    Expansion,
+    expansion_param,
+    select_links,
+)
+from bluecore_api.single_flight import read_key, single_flight
 
 endpoints = APIRouter()
 logger = logging.getLogger(__name__)
@@ -36,25 +62,65 @@ BLUECORE_URL = os.environ.get("BLUECORE_URL", "https://bcld.info/")
 
 @endpoints.get("/hubs/{hub_uuid}", response_model=HubSchema, operation_id="get_hub")
 async def read_hub(
-    hub_uuid: str, request: Request, expand: bool = False, db: Session = Depends(get_db)
+    hub_uuid: str,
+    request: Request,
+    expansion: Expansion | None = Depends(expansion_param),
+    db: AsyncSession = Depends(get_async_db),
 ):
     uuid, format = (
         Path(hub_uuid).name.split(".", 1) if "." in hub_uuid else (hub_uuid, None)
     )
-    db_hub = db.query(Hub).filter(Hub.uuid == uuid).first()
-    if db_hub is None:
-        raise HTTPException(status_code=404, detail=f"Hub {hub_uuid} not found")
-
-    # html is not supported for Hubs for now, serve jsonld when html is requested
-    try:
-        resp: Response | None = serialize(db_hub, expand, format, request)
-        if resp:
-            return resp
-    except Exception:
-        logger.exception("Failed to serialize hub %s as %s", hub_uuid, format)
-
-    # No recognized format, return the default JSON-LD serialization
-    return as_jsonld(db_hub, expand)
+    representation = requested_format(format, request)
+    validators = await resource_validators(db, Hub, uuid, representation, expansion)
+    if validators is not None and validators.matches(request):
+        return validators.not_modified()
+
+    async def render() -> Response:
+        # Hubs fall back to JSON-LD for anything else
+        jsonld_representation = representation or "jsonld"
+        expand = expansion is not None
+        expand_all = expansion is not None and expansion.complete
+        expanded = await materialized.read(
+            db, Hub, uuid, jsonld_representation, expand_all
+        )
+        db_hub = await db.scalar(
+            select(Hub)
+            .where(Hub.uuid == uuid)
+            .options(
+                *load_options(Hub, representation, expand_all and expanded is None)
+            )
+        )
+        if db_hub is None:
+            raise HTTPException(status_code=404, detail=f"Hub {hub_uuid} not found")
+        await select_links(db, db_hub, expansion, representation)
+
+        # html is not supported for Hubs for now, serve jsonld when html is requested
+        resp: Response | None = None
+        try:
+            if expanded is not None:
+                resp = await db.run_sync(
+                    lambda _: serialize_expanded(
+                        db_hub, expanded, jsonld_representation
+                    )
+                )
+            else:
+                resp = await serialize_cached(db, db_hub, expansion, format, request)
+            resp = await rendered(resp)
+        except CpuPoolUnavailable:
+            raise
+        except Exception:
+            logger.exception("Failed to serialize hub %s as %s", hub_uuid, format)
+
+        if resp is None:
+            # No recognized format, return the default JSON-LD serialization
+            resp = await db.run_sync(lambda _: as_jsonld(db_hub, expand))
+        return resp
+
+    # concurrent requests for the same version share one rendering
+    resp = await single_flight.run(
+        read_key(request, representation, expansion, validators), render
+    )
+    return validators.apply(resp) if validators else resp
 
 
 @endpoints.get(
@@ -83,15 +149,21 @@ async def create_hub_embedding(hub_uuid: str):
     openapi_extra=request_body_openapi(HubCreateSchema, HUB_EXAMPLE),
 )
 async def create_hub(
+    background_tasks: BackgroundTasks,
     hub: HubCreateSchema = Depends(deserialize(HubCreateSchema)),
     db: Session = Depends(get_db),
     session_maker=Depends(get_session_maker),
 ):
     graph = load_jsonld(json.loads(hub.data))
-    result_graph = save_graph(session_maker, graph, BLUECORE_URL)
+    result_graph = await asyncio.to_thread(
+        save_graph, session_maker, graph, BLUECORE_URL
+    )
     hub_uri = str(next(result_graph.subjects(RDF.type, BF.Hub)))
     doc = db.query(Hub).filter(Hub.uri == hub_uri).first()
     if doc:
+        background_tasks.add_task(
+            materialized.refresh_resources, session_maker, [doc.id]
+        )
         doc.data["@context"] = CONTEXT_URL
     return doc
 
@@ -105,6 +177,7 @@ async def create_hub(
 )
 async def update_hub(
     hub_uuid: str,
+    background_tasks: BackgroundTasks,
     hub: HubUpdateSchema = Depends(deserialize(HubUpdateSchema)),
     db: Session = Depends(get_db),
     session_maker=Depends(get_session_maker),
@@ -115,8 +188,12 @@ async def update_hub(
 
     if hub.data is not None:
         graph = load_jsonld(json.loads(hub.data))
-        save_graph(session_maker, graph, BLUECORE_URL)
+        await asyncio.to_thread(save_graph, session_maker, graph, BLUECORE_URL)
+        await representation_cache.invalidate(hub_uuid)
         db.refresh(db_hub)
+        background_tasks.add_task(
+            materialized.refresh_resources, session_maker, [db_hub.id]
+        )
         db_hub.data["@context"] = CONTEXT_URL
 
     return db_hub
@@ -132,31 +209,14 @@ async def delete_hub(
     hub_uuid: str,
     db: Session = Depends(get_db),
 ):
-    db_hub = db.query(Hub).filter(Hub.uuid == hub_uuid).first()
-    if db_hub is None:
+    hub_id = db.scalar(select(Hub.id).where(Hub.uuid == hub_uuid))
+    if hub_id is None:
         raise HTTPException(status_code=404, detail=f"Hub {hub_uuid} not found")
-    for work in db_hub.works:
-        for instance in work.instances:
-            for rbc in instance.classes:
-                db.delete(rbc)
-            for bor in instance.other_resources:
-                db.delete(bor)
-            for version in instance.versions:
-                db.delete(version)
-            db.delete(instance)
-        for rbc in work.classes:
-            db.delete(rbc)
-        for bor in work.other_resources:
-            db.delete(bor)
-        for version in work.versions:
-            db.delete(version)
-        db.delete(work)
-    for rbc in db_hub.classes:
-        db.delete(rbc)
-    for bor in db_hub.other_resources:
-        db.delete(bor)
-    for version in db_hub.versions:
-        db.delete(version)
-    db.delete(db_hub)
+    # read before the cascade deletes them
+    uuids = deletion.hub_uuids(db, hub_id)
+    counts = deletion.delete_hub(db, hub_id)
     db.commit()
+    for uuid in uuids:
+        await representation_cache.invalidate(uuid)
+    deletion.log_counts("Hub", hub_uuid, counts)
     return Response(status_code=204)
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 from pathlib import Path
@@ -5,29 +6,54 @@ from pathlib import Path
 from bluecore_models.bluecore_graph import save_graph
 from bluecore_models.models import Instance, Work
 from bluecore_models.utils.graph import BF, load_jsonld
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+)
 from rdflib import RDF, URIRef
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from bluecore_api import deletion, materialized
 from bluecore_api.app.utils.deserializer import deserialize, request_body_openapi
 from bluecore_api.app.utils.examples import INSTANCE_EXAMPLE
+from bluecore_api.app.utils.serialize.loading import CBD_FORMATS, load_options
 from bluecore_api.app.utils.serialize.response_generator import as_html
 from bluecore_api.app.utils.serializer import (
-    serialize,
+    requested_format,
+    serialize_cached,
+    serialize_expanded,
 )
+from bluecore_api.conditional import resource_validators
 from bluecore_api.constants import CONTEXT_URL, READ_ONLY_ROLES, KeycloakRole
+from bluecore_api.cpu_pool import rendered
 from bluecore_api.database import (
+    CBD_STATEMENT_TIMEOUT_MS,
+    get_async_db,
     get_db,
     get_session_maker,
+    set_statement_timeout,
 )
 from bluecore_api.middleware.bluecore_check_permissions import (
     BluecoreCheckPermissions as BCP,
 )
+from bluecore_api.representation_cache import representation_cache
 from bluecore_api.schemas.schemas import (
     InstanceCreateSchema,
     InstanceSchema,
     InstanceUpdateSchema,
 )
+from bluecore_api.selective_expansion import (
+    Expansion,
+    expansion_param,
+    select_links,
+)
+from bluecore_api.single_flight import read_key, single_flight
 
 endpoints = APIRouter()
 
@@ -42,25 +68,58 @@ BLUECORE_URL = os.environ.get("BLUECORE_URL", "https://bcld.info/")
 async def read_instance(
     instance_uuid: str,
     request: Request,
-    expand: bool = False,
-    db: Session = Depends(get_db),
+    expansion: Expansion | None = Depends(expansion_param),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Response:
     uuid, format = (
         Path(instance_uuid).name.split(".", 1)
         if "." in instance_uuid
         else (instance_uuid, None)
     )
-    db_instance = db.query(Instance).filter(Instance.uuid == uuid).first()
-
-    if db_instance is None:
-        raise HTTPException(status_code=404, detail="Instance not found")
+    representation = requested_format(format, request)
+    validators = await resource_validators(
+        db, Instance, uuid, representation, expansion
+    )
+    if validators is not None and validators.matches(request):
+        return validators.not_modified()
+
+    async def render() -> Response:
+        if representation in CBD_FORMATS:
+            await set_statement_timeout(db, CBD_STATEMENT_TIMEOUT_MS)
+        expand_all = expansion is not None and expansion.complete
+        expanded = await materialized.read(
+            db, Instance, uuid, representation, expand_all
+        )
+        db_instance = await db.scalar(
+            select(Instance)
+            .where(Instance.uuid == uuid)
+            .options(
+                *load_options(Instance, representation, expand_all and expanded is None)
+            )
+        )
 
-    resp: Response | None = serialize(db_instance, expand, format, request)
-    if resp:
-        return resp
+        if db_instance is None:
+            raise HTTPException(status_code=404, detail="Instance not found")
+        await select_links(db, db_instance, expansion, representation)
 
-    # No recognized format, return the default HTML serialization
-    return as_html(db_instance, request)
+        # Serializers lazy load the work and other resources: run them in run_sync
+        resp: Response | None
+        if expanded is not None:
+            resp = await db.run_sync(
+                lambda _: serialize_expanded(db_instance, expanded, representation)
+            )
+        else:
+            resp = await serialize_cached(db, db_instance, expansion, format, request)
+        if resp is None:
+            # No recognized format, return the default HTML serialization
+            resp = await db.run_sync(lambda _: as_html(db_instance, request))
+        return await rendered(resp)
+
+    # concurrent requests for the same version share one rendering
+    resp = await single_flight.run(
+        read_key(request, representation, expansion, validators), render
+    )
+    return validators.apply(resp) if validators else resp
 
 
 @endpoints.get(
@@ -89,6 +148,7 @@ async def create_instance_embedding(instance_uuid: str):
     openapi_extra=request_body_openapi(InstanceCreateSchema, INSTANCE_EXAMPLE),
 )
 async def create_instance(
+    background_tasks: BackgroundTasks,
     instance: InstanceCreateSchema = Depends(deserialize(InstanceCreateSchema)),
     db: Session = Depends(get_db),
     session_maker=Depends(get_session_maker),
@@ -103,12 +163,17 @@ async def create_instance(
         graph += load_jsonld(db_work.data)
         instance_subject = next(graph.subjects(RDF.type, BF.Instance))
         graph.add((instance_subject, BF.instanceOf, URIRef(db_work.uri)))
-    result_graph = save_graph(session_maker, graph, BLUECORE_URL)
+    result_graph = await asyncio.to_thread(
+        save_graph, session_maker, graph, BLUECORE_URL
+    )
     instance_uri = str(next(result_graph.subjects(RDF.type, BF.Instance)))
 
     doc = db.query(Instance).filter(Instance.uri == instance_uri).first()
 
     if doc:
+        background_tasks.add_task(
+            materialized.refresh_resources, session_maker, [doc.id]
+        )
         doc.data["@context"] = CONTEXT_URL
     return doc
 
@@ -122,6 +187,7 @@ async def create_instance(
 )
 async def update_instance(
     instance_uuid: str,
+    background_tasks: BackgroundTasks,
     instance: InstanceUpdateSchema = Depends(deserialize(InstanceUpdateSchema)),
     db: Session = Depends(get_db),
     session_maker=Depends(get_session_maker),
@@ -143,8 +209,12 @@ async def update_instance(
             graph += load_jsonld(db_work.data)
             instance_subject = next(graph.subjects(RDF.type, BF.Instance))
             graph.add((instance_subject, BF.instanceOf, URIRef(db_work.uri)))
-        save_graph(session_maker, graph, BLUECORE_URL)
+        await asyncio.to_thread(save_graph, session_maker, graph, BLUECORE_URL)
+        await representation_cache.invalidate(instance_uuid)
         db.refresh(db_instance)
+        background_tasks.add_task(
+            materialized.refresh_resources, session_maker, [db_instance.id]
+        )
 
         db_instance.data["@context"] = CONTEXT_URL
 
@@ -161,17 +231,13 @@ async def delete_instance(
     instance_uuid: str,
     db: Session = Depends(get_db),
 ):
-    db_instance = db.query(Instance).filter(Instance.uuid == instance_uuid).first()
-    if db_instance is None:
+    instance_id = db.scalar(select(Instance.id).where(Instance.uuid == instance_uuid))
+    if instance_id is None:
         raise HTTPException(
             status_code=404, detail=f"Instance {instance_uuid} not found"
         )
-    for rbc in db_instance.classes:
-        db.delete(rbc)
-    for bor in db_instance.other_resources:
-        db.delete(bor)
-    for version in db_instance.versions:
-        db.delete(version)
-    db.delete(db_instance)
+    counts = deletion.delete_instance(db, instance_id)
     db.commit()
+    await representation_cache.invalidate(instance_uuid)
+    deletion.log_counts("Instance", instance_uuid, counts)
     return Response(status_code=204)
@@ -0,0 +1,84 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from bluecore_api import materialized
+from bluecore_api.constants import READ_ONLY_ROLES, KeycloakRole
+from bluecore_api.cpu_pool import cpu_pool
+from bluecore_api.database import get_db
+from bluecore_api.db_pool import all_pool_stats
+from bluecore_api.middleware.bluecore_check_permissions import (
+    BluecoreCheckPermissions as BCP,
+)
+from bluecore_api.other_resource_cache import other_resource_cache
+from bluecore_api.representation_cache import representation_cache
+from bluecore_api.single_flight import single_flight
+
+endpoints = APIRouter()
+
+
+@endpoints.get("/internal/pool", include_in_schema=False)
+async def pool_stats() -> dict[str, Any]:
+    """
+    Connection pool telemetry per engine: connections checked out, overflow in
+    use, checkout wait-time histogram and timeouts. Not a public GET, so it
+    stays behind Keycloak.
+    """
+    return all_pool_stats()
+
+
+@endpoints.get("/internal/cpu", include_in_schema=False)
+async def cpu_stats() -> dict[str, Any]:
+    """
+    CPU pool telemetry: tasks running or queued, rejections, timeouts and
+    queue-wait and execution-time histograms.
+    """
+    return cpu_pool.snapshot()
+
+
+@endpoints.get("/internal/cache", include_in_schema=False)
+async def cache_stats() -> dict[str, Any]:
+    """
+    Size, hits, misses, hit rate, evictions and invalidations of the
+    representation and OtherResource graph caches.
+    """
+    return {
+        "representations": representation_cache.snapshot(),
+        "other_resource_graphs": other_resource_cache.snapshot(),
+    }
+
+
+@endpoints.get("/internal/coalescing", include_in_schema=False)
+async def coalescing_stats() -> dict[str, Any]:
+    """
+    Concurrent identical reads: renders run, renders shared, and requests
+    that were given a shared response instead of rendering their own.
+    """
+    return single_flight.snapshot()
+
+
+@endpoints.post(
+    "/internal/expansions/rebuild",
+    include_in_schema=False,
+    dependencies=[Depends(BCP(KeycloakRole.UPDATE, READ_ONLY_ROLES))],
+)
+def rebuild_expansions(
+    after: int = 0, limit: int = 100, db: Session = Depends(get_db)
+) -> dict[str, Any]:
+    """
+    Builds the materialized expansions of the next `limit` Works, Instances
+    and Hubs after id `after`. Repeat with the returned `next` until it is null.
+    """
+    return materialized.rebuild(db, after, limit)
+
+
+@endpoints.get("/internal/expansions/check", include_in_schema=False)
+def check_expansions(
+    after: int = 0, limit: int = 100, db: Session = Depends(get_db)
+) -> dict[str, Any]:
+    """
+    Lists the resources after id `after` whose materialized expansion is
+    missing, stale or no longer matches expanding them on the fly.
+    """
+    return materialized.check(db, after, limit)
@@ -3,15 +3,33 @@ import os
 from datetime import UTC, datetime
 from typing import Any
 
-from bluecore_models.models import BibframeOtherResources, OtherResource
-from fastapi import APIRouter, Depends, HTTPException, Response
+from bluecore_models.models import OtherResource
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+)
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from bluecore_api import deletion, materialized
+from bluecore_api.app.utils.serialize.loading import list_options
+from bluecore_api.conditional import row_validators
 from bluecore_api.constants import CONTEXT_URL, READ_ONLY_ROLES, KeycloakRole
-from bluecore_api.database import get_db
+from bluecore_api.database import (
+    get_async_db,
+    get_db,
+    get_list_db,
+    get_session_maker,
+)
 from bluecore_api.middleware.bluecore_check_permissions import (
     BluecoreCheckPermissions as BCP,
 )
+from bluecore_api.other_resource_cache import other_resource_cache
 from bluecore_api.schemas.schemas import (
     OtherResourceCreateSchema,
     OtherResourceSchema,
@@ -54,23 +72,29 @@ async def read_other_resources(
     uri: str | None = None,
     limit: int = 10,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_list_db),
 ):
     """
     Accessor function that searches for an existing uri or returns a
     slice of other resources with limit and offsets
     """
     if uri:
-        db_other_resource = (
-            db.query(OtherResource).filter(OtherResource.uri == uri).first()
+        db_other_resource = await db.scalar(
+            select(OtherResource).where(OtherResource.uri == uri)
         )
         if not db_other_resource:
             raise HTTPException(
                 status_code=404, detail=f"Other Resource with uri {uri} not found"
             )
         return db_other_resource
-    db_other_resources = db.query(OtherResource).limit(limit).offset(offset).all()
-    total = db.query(OtherResource).count()
+    stmt = (
+        select(OtherResource)
+        .options(*list_options(OtherResource))
+        .limit(limit)
+        .offset(offset)
+    )
+    db_other_resources = (await db.execute(stmt)).scalars().all()
+    total = await db.scalar(select(func.count()).select_from(OtherResource))
     for doc in db_other_resources:
         add_context_to_data(doc)
     payload: dict[str, Any] = {"resources": db_other_resources, "total": total}
@@ -83,9 +107,21 @@ async def read_other_resources(
     response_model=OtherResourceSchema,
     operation_id="get_resource",
 )
-async def read_other_resource(resource_id: str, db: Session = Depends(get_db)):
-    db_other_resource = (
-        db.query(OtherResource).filter(OtherResource.id == resource_id).first()
+async def read_other_resource(
+    resource_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    validators = await row_validators(
+        db, OtherResource, OtherResource.id == resource_id
+    )
+    if validators is not None:
+        if validators.matches(request):
+            return validators.not_modified()
+        response.headers.update(validators.headers())
+    db_other_resource = await db.scalar(
+        select(OtherResource).where(OtherResource.id == resource_id)
     )
     if db_other_resource is None:
         raise HTTPException(
@@ -129,7 +165,9 @@ async def create_other_resource(
 async def update_other_resource(
     resource_id: str,
     other_resource: OtherResourceUpdateSchema,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    session_maker=Depends(get_session_maker),
 ):
     db_other_resource = (
         db.query(OtherResource).filter(OtherResource.id == resource_id).first()
@@ -143,8 +181,15 @@ async def update_other_resource(
     if other_resource.data:
         # bluecore_api #126
         db_other_resource.data = json.loads(other_resource.data)
+    db_other_resource.updated_at = datetime.now(UTC)
 
     db.commit()
+    await other_resource_cache.invalidate(db_other_resource.id)
+    background_tasks.add_task(
+        materialized.refresh_resources,
+        session_maker,
+        materialized.linked_resource_ids(db, db_other_resource.id),
+    )
     db.refresh(db_other_resource)
     add_context_to_data(db_other_resource)
     return db_other_resource
@@ -158,27 +203,22 @@ async def update_other_resource(
 )
 async def delete_other_resource(
     resource_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
+    session_maker=Depends(get_session_maker),
 ):
-    db_other_resource = (
-        db.query(OtherResource).filter(OtherResource.id == resource_id).first()
+    other_resource_id = db.scalar(
+        select(OtherResource.id).where(OtherResource.id == resource_id)
     )
-    if db_other_resource is None:
+    if other_resource_id is None:
         raise HTTPException(
             status_code=404, detail=f"Other Resource {resource_id} not found"
         )
-    for bor in (
-        db.query(BibframeOtherResources)
-        .filter(BibframeOtherResources.other_resource_id == db_other_resource.id)
-        .all()
-    ):
-        db.delete(bor)
-    for bor in db_other_resource.other_resources:
-        db.delete(bor)
-    for rbc in db_other_resource.classes:
-        db.delete(rbc)
-    for version in db_other_resource.versions:
-        db.delete(version)
-    db.delete(db_other_resource)
+    # read before the links to it are deleted
+    linked_ids = materialized.linked_resource_ids(db, other_resource_id)
+    counts = deletion.delete_other_resource(db, other_resource_id)
     db.commit()
+    await other_resource_cache.invalidate(other_resource_id)
+    background_tasks.add_task(materialized.refresh_resources, session_maker, linked_ids)
+    deletion.log_counts("Other Resource", resource_id, counts)
     return Response(status_code=204)
@@ -4,12 +4,16 @@ from uuid import uuid4
 
 from bluecore_models.models import Profile
 from bluecore_models.utils.graph import load_jsonld, replace_uri
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from rdflib import RDF, Namespace, URIRef
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from bluecore_api.app.utils.serialize.loading import list_options
+from bluecore_api.conditional import row_validators
 from bluecore_api.constants import READ_ONLY_ROLES, KeycloakRole
-from bluecore_api.database import get_db
+from bluecore_api.database import get_async_db, get_db, get_list_db
 from bluecore_api.middleware.bluecore_check_permissions import (
     BluecoreCheckPermissions as BCP,
 )
@@ -66,21 +70,22 @@ async def read_profiles(
     uri: str | None = None,
     limit: int = 10,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_list_db),
 ):
     """
     Search for an existing profile by uri, or return a slice of profiles
     with limit and offset.
     """
     if uri:
-        db_profile = db.query(Profile).filter(Profile.uri == uri).first()
+        db_profile = await db.scalar(select(Profile).where(Profile.uri == uri))
         if not db_profile:
             raise HTTPException(
                 status_code=404, detail=f"Profile with uri {uri} not found"
             )
         return db_profile
-    db_profiles = db.query(Profile).limit(limit).offset(offset).all()
-    total = db.query(Profile).count()
+    stmt = select(Profile).options(*list_options(Profile)).limit(limit).offset(offset)
+    db_profiles = (await db.execute(stmt)).scalars().all()
+    total = await db.scalar(select(func.count()).select_from(Profile))
     return {
         "profiles": db_profiles,
         "total": total,
@@ -93,8 +98,18 @@ async def read_profiles(
     response_model=ProfileSchema,
     operation_id="get_profile",
 )
-async def read_profile(profile_uuid: str, db: Session = Depends(get_db)):
-    db_profile = db.query(Profile).filter(Profile.uuid == profile_uuid).first()
+async def read_profile(
+    profile_uuid: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    validators = await row_validators(db, Profile, Profile.uuid == profile_uuid)
+    if validators is not None:
+        if validators.matches(request):
+            return validators.not_modified()
+        response.headers.update(validators.headers())
+    db_profile = await db.scalar(select(Profile).where(Profile.uuid == profile_uuid))
     if db_profile is None:
         raise HTTPException(status_code=404, detail=f"Profile {profile_uuid} not found")
     return db_profile
@@ -1,3 +1,4 @@
+import json
 import os
 import re
 from typing import Any
@@ -10,22 +11,27 @@ from bluecore_models.models import (
     ResourceBase,
     Work,
 )
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse
-from sqlalchemy import Select, func, select
-from sqlalchemy.orm import Session, noload
+from sqlalchemy import Select, bindparam, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
 
 from bluecore_api.app.templating import templates
 from bluecore_api.app.utils.serialize.html import (
     resource_title,
 )
+from bluecore_api.app.utils.serialize.loading import list_options
 from bluecore_api.constants import (
     CONTEXT_URL,
     DEFAULT_SEARCH_PAGE_LENGTH,
+    ContainsField,
     SearchType,
 )
-from bluecore_api.database import get_db
+from bluecore_api.database import get_search_db
 from bluecore_api.schemas.schemas import (
+    ContainsResultSchema,
     SearchProfileResultSchema,
     SearchResultSchema,
 )
@@ -42,6 +48,13 @@ INVALID_WILDCARD_MAPPER = re.compile(r"(\*\s*)+")
 PHRASE_LEADING_WILDCARD_MAPPER = re.compile(r"^(\*(__PH__)*)+")
 TRAILING_OPERATOR_MAPPER = re.compile(r"\s*(&|\|)\s*$")
 
+DEFAULT_CONTAINS_FIELDS = [
+    ContainsField.URI,
+    ContainsField.UUID,
+    ContainsField.TYPE,
+    ContainsField.UPDATED_AT,
+]
+
 
 def format_query(query: str) -> str:
     """
@@ -145,7 +158,7 @@ def create_count_query(query: Select[tuple[ResourceBase | OtherResource]]):
     operation_id="search",
 )
 async def search(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_search_db),
     limit: int = Query(DEFAULT_SEARCH_PAGE_LENGTH, ge=0, le=100),
     offset: int = 0,
     q: str = "",
@@ -160,7 +173,11 @@ async def search(
         Stop words will not be ignored and stemming will not be applied in this mode.
     Otherwise, it will use "english" language for the full-text search.
     """
-    stmt = select(ResourceBase).where(ResourceBase.type.in_(get_types(type)))
+    stmt = (
+        select(ResourceBase)
+        .where(ResourceBase.type.in_(get_types(type)))
+        .options(*list_options(ResourceBase))
+    )
     formatted = format_query(q)
     if formatted:
         lang: str = "simple" if "<->" in formatted else "english"
@@ -177,9 +194,9 @@ async def search(
         stmt = stmt.order_by(ResourceBase.id)
         links_query = f"&type={type}"
     count_query = create_count_query(stmt)
-    total = db.scalar(count_query)
+    total = await db.scalar(count_query)
     stmt = stmt.offset(offset).limit(limit)
-    results = db.execute(stmt).scalars().all()
+    results = (await db.execute(stmt)).scalars().all()
     for result in results:
         result.data["@context"] = CONTEXT_URL
     links = generate_links(
@@ -199,7 +216,7 @@ async def search(
 @endpoints.get("/search", response_class=HTMLResponse, include_in_schema=False)
 async def search_html(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_search_db),
     limit: int = Query(DEFAULT_SEARCH_PAGE_LENGTH, ge=0, le=100),
     offset: int = 0,
     q: str = "",
@@ -210,7 +227,11 @@ async def search_html(
     Backs the header search box (the form posts here, distinct from the
     JSON `GET /search/`) and renders the ``search_results.html`` template.
     """
-    stmt = select(ResourceBase).where(ResourceBase.type.in_(get_types(type)))
+    stmt = (
+        select(ResourceBase)
+        .where(ResourceBase.type.in_(get_types(type)))
+        .options(*list_options(ResourceBase))
+    )
     formatted = format_query(q)
     if formatted:
         lang = "simple" if "<->" in formatted else "english"
@@ -223,8 +244,8 @@ async def search_html(
         )
     else:
         stmt = stmt.order_by(ResourceBase.id)
-    total = db.scalar(create_count_query(stmt)) or 0
-    results = db.execute(stmt.offset(offset).limit(limit)).scalars().all()
+    total = await db.scalar(create_count_query(stmt)) or 0
+    results = (await db.execute(stmt.offset(offset).limit(limit))).scalars().all()
     for result in results:
         result.data["@context"] = CONTEXT_URL
 
@@ -280,6 +301,74 @@ async def search_html(
     )
 
 
+def parse_fragment(fragment: str) -> dict[str, Any]:
+    """
+    The JSON-LD fragment to match. Its "@context" is dropped because stored
+    resources have none.
+    """
+    try:
+        parsed = json.loads(fragment)
+    except json.JSONDecodeError as error:
+        raise HTTPException(
+            status_code=422, detail=f"fragment is not valid JSON: {error}"
+        )
+    if not isinstance(parsed, dict):
+        raise HTTPException(status_code=422, detail="fragment must be a JSON object")
+    parsed.pop("@context", None)
+    if not parsed:
+        raise HTTPException(status_code=422, detail="fragment must not be empty")
+    return parsed
+
+
+@endpoints.get(
+    "/search/contains",
+    response_model=ContainsResultSchema,
+    operation_id="search_contains",
+)
+async def search_contains(
+    fragment: str,
+    db: AsyncSession = Depends(get_search_db),
+    type: SearchType = SearchType.ALL,
+    fields: list[ContainsField] = Query(DEFAULT_CONTAINS_FIELDS),
+    limit: int = Query(DEFAULT_SEARCH_PAGE_LENGTH, ge=1, le=100),
+    after: int | None = None,
+) -> dict[str, Any]:
+    """
+    Works and Instances whose JSON-LD contains `fragment`, using PostgreSQL
+    `data @> fragment`. Write the fragment in the compacted shape the
+    resources are stored and returned in, e.g. `{"carrier": {"@id": "..."}}`.
+
+    Results are ordered by id and paged by keyset: follow `links.next`, which
+    passes the last id seen as `after`. Each result has its `id` plus the
+    requested `fields`; add `data` to get the JSON-LD itself.
+    """
+    contained = parse_fragment(fragment)
+    columns = [ResourceBase.id]
+    columns += [getattr(ResourceBase, field) for field in dict.fromkeys(fields)]
+    stmt = (
+        select(*columns)
+        .where(ResourceBase.type.in_(get_types(type)))
+        .where(ResourceBase.data.op("@>")(bindparam("fragment", contained, JSONB)))
+        .order_by(ResourceBase.id)
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(ResourceBase.id > after)
+    results = [dict(row) for row in (await db.execute(stmt)).mappings()]
+    for result in results:
+        if isinstance(result.get("data"), dict):
+            result["data"]["@context"] = CONTEXT_URL
+
+    params = {"fragment": fragment, "type": type, "fields": fields, "limit": limit}
+    first = f"{BLUECORE_URL.rstrip('/')}/api/search/contains?" + urlencode(
+        params, doseq=True
+    )
+    links: dict[str, str | None] = {"first": first}
+    if len(results) == limit:
+        links["next"] = f"{first}&after={results[-1]['id']}"
+    return {"results": results, "links": links}
+
+
 @endpoints.get(
     "/search/profile",
     response_model=SearchProfileResultSchema,
@@ -287,7 +376,7 @@ async def search_html(
     operation_id="search_profile",
 )
 async def search_profile(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_search_db),
     q: str = "",
     limit: int = Query(DEFAULT_SEARCH_PAGE_LENGTH, ge=0, le=100),
     offset: int = 0,
@@ -295,7 +384,7 @@ async def search_profile(
     """
     Search for profiles in the resource base.
     """
-    stmt = select(Profile)
+    stmt = select(Profile).options(*list_options(Profile))
 
     formatted = format_query(q)
     if formatted:
@@ -307,10 +396,10 @@ async def search_profile(
     else:
         links_query = ""
     count_query = create_count_query(stmt)
-    total = db.scalar(count_query)
+    total = await db.scalar(count_query)
 
     stmt = stmt.offset(offset).limit(limit)
-    results = db.execute(stmt).scalars().all()
+    results = (await db.execute(stmt)).scalars().all()
     links = generate_links(
         verb="search/profile",
         slice_size=len(results),
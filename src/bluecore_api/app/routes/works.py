@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 from pathlib import Path
@@ -5,27 +6,54 @@ from pathlib import Path
 from bluecore_models.bluecore_graph import save_graph
 from bluecore_models.models import Work
 from bluecore_models.utils.graph import BF, load_jsonld
-from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+)
 from rdflib import RDF
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from bluecore_api import deletion, materialized
 from bluecore_api.app.utils.deserializer import deserialize, request_body_openapi
 from bluecore_api.app.utils.examples import WORK_EXAMPLE
+from bluecore_api.app.utils.serialize.loading import CBD_FORMATS, load_options
 from bluecore_api.app.utils.serialize.response_generator import as_html
-from bluecore_api.app.utils.serializer import serialize
+from bluecore_api.app.utils.serializer import (
+    requested_format,
+    serialize_cached,
+    serialize_expanded,
+)
+from bluecore_api.conditional import resource_validators
 from bluecore_api.constants import CONTEXT_URL, READ_ONLY_ROLES, KeycloakRole
+from bluecore_api.cpu_pool import rendered
 from bluecore_api.database import (
+    CBD_STATEMENT_TIMEOUT_MS,
+    get_async_db,
     get_db,
     get_session_maker,
+    set_statement_timeout,
 )
 from bluecore_api.middleware.bluecore_check_permissions import (
     BluecoreCheckPermissions as BCP,
 )
+from bluecore_api.representation_cache import representation_cache
 from bluecore_api.schemas.schemas import (
     WorkCreateSchema,
     WorkSchema,
     WorkUpdateSchema,
 )
+from bluecore_api.selective_expansion import (
+    Expansion,
+    expansion_param,
+    select_links,
+)
+from bluecore_api.single_flight import read_key, single_flight
 
 endpoints = APIRouter()
 
@@ -36,23 +64,52 @@ BLUECORE_URL = os.environ.get("BLUECORE_URL", "https://bcld.info/")
 async def read_work(
     work_uuid: str,
     request: Request,
-    expand: bool = False,
-    db: Session = Depends(get_db),
+    expansion: Expansion | None = Depends(expansion_param),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Response:
     uuid, format = (
         Path(work_uuid).name.split(".", 1) if "." in work_uuid else (work_uuid, None)
     )
 
-    db_work = db.query(Work).filter(Work.uuid == uuid).first()
-    if db_work is None:
-        raise HTTPException(status_code=404, detail=f"Work {work_uuid} not found")
-
-    resp: Response | None = serialize(db_work, expand, format, request)
-    if resp:
-        return resp
-
-    # No recognized format, return the default HTML serialization
-    return as_html(db_work, request)
+    representation = requested_format(format, request)
+    validators = await resource_validators(db, Work, uuid, representation, expansion)
+    if validators is not None and validators.matches(request):
+        return validators.not_modified()
+
+    async def render() -> Response:
+        if representation in CBD_FORMATS:
+            await set_statement_timeout(db, CBD_STATEMENT_TIMEOUT_MS)
+        expand_all = expansion is not None and expansion.complete
+        expanded = await materialized.read(db, Work, uuid, representation, expand_all)
+        db_work = await db.scalar(
+            select(Work)
+            .where(Work.uuid == uuid)
+            .options(
+                *load_options(Work, representation, expand_all and expanded is None)
+            )
+        )
+        if db_work is None:
+            raise HTTPException(status_code=404, detail=f"Work {work_uuid} not found")
+        await select_links(db, db_work, expansion, representation)
+
+        # Serializers lazy load other resources, so they run under run_sync
+        resp: Response | None
+        if expanded is not None:
+            resp = await db.run_sync(
+                lambda _: serialize_expanded(db_work, expanded, representation)
+            )
+        else:
+            resp = await serialize_cached(db, db_work, expansion, format, request)
+        if resp is None:
+            # No recognized format, return the default HTML serialization
+            resp = await db.run_sync(lambda _: as_html(db_work, request))
+        return await rendered(resp)
+
+    # concurrent requests for the same version share one rendering
+    resp = await single_flight.run(
+        read_key(request, representation, expansion, validators), render
+    )
+    return validators.apply(resp) if validators else resp
 
 
 @endpoints.get(
@@ -81,15 +138,21 @@ async def create_work_embedding(work_uuid: str):
     openapi_extra=request_body_openapi(WorkCreateSchema, WORK_EXAMPLE),
 )
 async def create_work(
+    background_tasks: BackgroundTasks,
     work: WorkCreateSchema = Depends(deserialize(WorkCreateSchema)),
     db: Session = Depends(get_db),
     session_maker=Depends(get_session_maker),
 ):
     graph = load_jsonld(json.loads(work.data))
-    result_graph = save_graph(session_maker, graph, BLUECORE_URL)
+    result_graph = await asyncio.to_thread(
+        save_graph, session_maker, graph, BLUECORE_URL
+    )
     work_uri = str(next(result_graph.subjects(RDF.type, BF.Work)))
     doc = db.query(Work).filter(Work.uri == work_uri).first()
     if doc:
+        background_tasks.add_task(
+            materialized.refresh_resources, session_maker, [doc.id]
+        )
         doc.data["@context"] = CONTEXT_URL
     return doc
 
@@ -103,6 +166,7 @@ async def create_work(
 )
 async def update_work(
     work_uuid: str,
+    background_tasks: BackgroundTasks,
     work: WorkUpdateSchema = Depends(deserialize(WorkUpdateSchema)),
     db: Session = Depends(get_db),
     session_maker=Depends(get_session_maker),
@@ -113,8 +177,12 @@ async def update_work(
 
     if work.data is not None:
         graph = load_jsonld(json.loads(work.data))
-        save_graph(session_maker, graph, BLUECORE_URL)
+        await asyncio.to_thread(save_graph, session_maker, graph, BLUECORE_URL)
+        await representation_cache.invalidate(work_uuid)
         db.refresh(db_work)
+        background_tasks.add_task(
+            materialized.refresh_resources, session_maker, [db_work.id]
+        )
         db_work.data["@context"] = CONTEXT_URL
 
     return db_work
@@ -130,23 +198,14 @@ async def delete_work(
     work_uuid: str,
     db: Session = Depends(get_db),
 ):
-    db_work = db.query(Work).filter(Work.uuid == work_uuid).first()
-    if db_work is None:
+    work_id = db.scalar(select(Work.id).where(Work.uuid == work_uuid))
+    if work_id is None:
         raise HTTPException(status_code=404, detail=f"Work {work_uuid} not found")
-    for instance in db_work.instances:
-        for rbc in instance.classes:
-            db.delete(rbc)
-        for bor in instance.other_resources:
-            db.delete(bor)
-        for version in instance.versions:
-            db.delete(version)
-        db.delete(instance)
-    for rbc in db_work.classes:
-        db.delete(rbc)
-    for bor in db_work.other_resources:
-        db.delete(bor)
-    for version in db_work.versions:
-        db.delete(version)
-    db.delete(db_work)
+    # read before the cascade deletes them
+    uuids = deletion.work_uuids(db, work_id)
+    counts = deletion.delete_work(db, work_id)
     db.commit()
+    for uuid in uuids:
+        await representation_cache.invalidate(uuid)
+    deletion.log_counts("Work", work_uuid, counts)
     return Response(status_code=204)
@@ -1,15 +1,17 @@
 import copy
-import json
-from typing import Any
+from collections.abc import Callable
+from typing import Any, NamedTuple
 
 from bluecore_models.models import Instance, Work
-from bluecore_models.utils.graph import CONTEXT, load_jsonld
 from fastapi import HTTPException
 from lxml import etree
 from rdflib import Graph, Namespace
 
+from bluecore_api.app.utils.serialize.graph import add_document, load_graph
 from bluecore_api.constants import BibframeType
-from bluecore_api.expansion import expand_resource_as_graph
+from bluecore_api.cpu_pool import spool
+from bluecore_api.expansion import add_other_resources, other_resources_of
+from bluecore_api.other_resource_cache import OtherResourceData
 
 BF_NAMESPACE = Namespace("http://id.loc.gov/ontologies/bibframe/")
 RDF_NAMESPACE = Namespace("http://www.w3.org/1999/02/22-rdf-syntax-ns#")
@@ -44,6 +46,43 @@ def reorder_instance_types(instance_data: dict[str, Any]) -> dict[str, Any]:
     return instance_data
 
 
+class CbdSource(NamedTuple):
+    """A resource's JSON-LD and its other resources, ready for the CPU pool."""
+
+    data: dict[str, Any]
+    others: list[OtherResourceData]
+
+
+def _source(
+    resource: Instance | Work, reorder: Callable[[dict[str, Any]], dict[str, Any]]
+) -> CbdSource:
+    # reorder a copy: the loaded resource's data is left as it is
+    data = dict(resource.data)
+    if isinstance(data.get("@type"), list):
+        data["@type"] = list(data["@type"])
+    return CbdSource(reorder(data), other_resources_of(resource))
+
+
+def cbd_sources(instance: Instance) -> list[CbdSource]:
+    """
+    The resources making up an Instance's CBD: the Instance, its Work and any
+    other Instances of that Work, each with its related resources.
+    """
+    work = instance.work
+    uuid = str(instance.uuid)
+    # The xml serialization uses the first @type to determine the root element
+    # Make sure 'Work' is the first in the list of types for the work
+    sources = [
+        _source(instance, reorder_instance_types),
+        _source(work, reorder_work_types),
+    ]
+    # If the work has multiple instances, include them in the graph
+    for related_instance in work.instances:
+        if uuid != str(related_instance.uuid):
+            sources.append(_source(related_instance, reorder_instance_types))
+    return sources
+
+
 def generate_cbd_graph(instance: Instance) -> Graph:
     """
     Generate a CBD graph for a given Instance.
@@ -55,29 +94,17 @@ def generate_cbd_graph(instance: Instance) -> Graph:
     Returns:
         Graph: RDF graph containing the CBD for the given Instance
     """
-    instance.data = reorder_instance_types(instance.data)
-    instance_graph: Graph = load_jsonld(instance.data)
-    instance_graph = expand_resource_as_graph(instance, instance_graph)
+    return cbd_graph(cbd_sources(instance))
 
-    work = instance.work
-    # The xml serialization uses the first @type to determine the root element
-    # Make sure 'Work' is the first in the list of types for the work
-    work.data = reorder_work_types(work.data)
-    # Add context as we are not calling load_jsonld on the work data
-    work.data["@context"] = CONTEXT
-    instance_graph.parse(data=json.dumps(work.data), format="json-ld")
-    instance_graph = expand_resource_as_graph(work, instance_graph)
 
-    uuid = str(instance.uuid)
-    # If the work has multiple instances, include them in the graph
-    for related_instance in work.instances:
-        if uuid != str(related_instance.uuid):
-            related_instance.data = reorder_instance_types(related_instance.data)
-            related_instance.data["@context"] = CONTEXT
-            instance_graph.parse(
-                data=json.dumps(related_instance.data), format="json-ld"
-            )
-            instance_graph = expand_resource_as_graph(related_instance, instance_graph)
+def cbd_graph(sources: list[CbdSource]) -> Graph:
+    """The CBD graph of the resources `cbd_sources` collected."""
+    instance, *others = sources
+    instance_graph: Graph = load_graph(instance.data)
+    add_other_resources(instance_graph, instance.others)
+    for source in others:
+        add_document(instance_graph, source.data)
+        add_other_resources(instance_graph, source.others)
 
     instance_graph.bind("bf", BF_NAMESPACE, override=True, replace=True)
     instance_graph.bind("madsrdf", MADSRDF_NAMESPACE, override=True, replace=True)
@@ -129,8 +156,7 @@ def cbd_jsonld(instance: Instance) -> str:
             status_code=400, detail="CBD serialization is only supported for Instances"
         )
 
-    instance_graph = generate_cbd_graph(instance)
-    return instance_graph.serialize(format="json-ld", indent=2)
+    return cbd_graph(cbd_sources(instance)).serialize(format="json-ld", indent=2)
 
 
 def cbd_xml(instance: Instance) -> str:
@@ -139,6 +165,19 @@ def cbd_xml(instance: Instance) -> str:
             status_code=400, detail="CBD serialization is only supported for Instances"
         )
 
-    instance_graph = generate_cbd_graph(instance)
-    instance_root = generate_cbd_xml(instance_graph)
+    instance_root = generate_cbd_xml(cbd_graph(cbd_sources(instance)))
     return etree.tostring(instance_root, encoding="utf-8").decode("utf-8")
+
+
+# The write functions run in the CPU pool and write to a spool file
+
+
+def write_cbd_jsonld(destination: str, sources: list[CbdSource]) -> None:
+    with spool(destination) as out:
+        cbd_graph(sources).serialize(destination=out, format="json-ld", indent=2)
+
+
+def write_cbd_xml(destination: str, sources: list[CbdSource]) -> None:
+    instance_root = generate_cbd_xml(cbd_graph(sources))
+    with spool(destination) as out:
+        etree.ElementTree(instance_root).write(out, encoding="utf-8")
@@ -0,0 +1,68 @@
+"""
+rdflib Graphs of stored JSON-LD, without rdflib's JSON-LD parser.
+
+`load_jsonld` runs every document through rdflib's general-purpose parser,
+which processes bluecore_models' large CONTEXT again each time. Documents
+`serialize.triples` can read are walked against its precompiled CONTEXT
+instead and their triples added to the Graph directly; anything else still
+goes through `load_jsonld`, so the result is the same either way.
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+from bluecore_models.utils.graph import init_graph, load_jsonld
+from rdflib import BNode, Graph, URIRef
+from rdflib import Literal as RdfLiteral
+from rdflib.term import Node
+
+from bluecore_api.app.utils.serialize.triples import (
+    IRI,
+    BlankNode,
+    JsonLdTriples,
+    Literal,
+    Term,
+    supported,
+)
+
+
+def rdf_triples(data: Any) -> Iterator[tuple[Node, Node, Node]]:
+    """The triples `load_jsonld` reads from the stored document `data`."""
+    if not supported(data):
+        yield from load_jsonld(data)
+        return
+    for subject, predicate, object in JsonLdTriples().triples(data):
+        yield to_rdflib(subject), URIRef(predicate), to_rdflib(object)
+
+
+def load_graph(data: Any) -> Graph:
+    """The stored document `data` in a Graph, as `load_jsonld` reads it."""
+    if not supported(data):
+        return load_jsonld(data)
+    return add_document(init_graph(), data)
+
+
+def add_document(graph: Graph, data: Any) -> Graph:
+    """Adds the triples of the stored document `data` to `graph`."""
+    graph.addN((s, p, o, graph) for s, p, o in rdf_triples(data))
+    return graph
+
+
+def to_rdflib(term: Term) -> Node:
+    if isinstance(term, Literal):
+        return RdfLiteral(term.lexical, lang=term.language, datatype=term.datatype)
+    if isinstance(term, BlankNode):
+        return BNode(term)
+    return URIRef(term)
+
+
+def from_rdflib(node: Node) -> Term:
+    if isinstance(node, RdfLiteral):
+        return Literal(
+            str(node),
+            None if node.datatype is None else str(node.datatype),
+            node.language,
+        )
+    if isinstance(node, BNode):
+        return BlankNode(node)
+    return IRI(node)
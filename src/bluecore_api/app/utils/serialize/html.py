@@ -11,12 +11,12 @@ from urllib.parse import urlparse
 
 from bluecore_models.models import Instance, Work
 from bluecore_models.namespaces import MADS
-from bluecore_models.utils.graph import load_jsonld
 from fastapi import Request, Response
 from rdflib import Graph, URIRef
 from rdflib.namespace import RDFS
 
 from bluecore_api.app.templating import BLUECORE_URL, templates
+from bluecore_api.other_resource_cache import other_resource_cache
 
 logger = logging.getLogger(__name__)
 
@@ -137,7 +137,7 @@ def _build_label_map(resource: Instance | Work) -> dict[str, str]:
     for row in resource.other_resources:
         other = row.other_resource
         try:
-            graph += load_jsonld(other.data)
+            other_resource_cache.add_to(graph, other)
         except Exception:
             logger.exception("Failed to load OtherResource %s", other.uuid)
             continue
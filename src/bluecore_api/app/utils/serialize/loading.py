@@ -0,0 +1,116 @@
+"""
+Eager-loading options for the resource GET routes.
+
+The serializers walk `other_resources` -> `other_resource` (expansion, HTML
+labels, CBD) and, for some formats, `instance.work` and `work.instances`.
+Left to lazy loading that is one query per link. These options load exactly
+what the requested representation touches, in a fixed number of queries.
+"""
+
+from typing import Any
+
+from bluecore_models.models import (
+    BibframeOtherResources,
+    Hub,
+    Instance,
+    ResourceBase,
+    Work,
+)
+from sqlalchemy.orm import defer, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+type Resource = type[Hub | Instance | Work]
+
+# Representations that render the resource's own JSON-LD, and only need the
+# linked other resources when expanded.
+GRAPH_FORMATS = {
+    "brdf",
+    "json",
+    "jsonld",
+    "nt",
+    "rdf",
+    "ttl",
+    "vnd.sinopia.json",
+    "application/json",
+    "application/ld+json",
+    "application/n-triples",
+    "application/rdf+xml",
+    "application/vnd.bluecore.rdf",
+    "application/vnd.sinopia+json",
+    "text/turtle",
+}
+
+# Graph formats rendered from the expanded JSON-LD document itself, which
+# can be read from the materialized expansions (see bluecore_api.materialized)
+EXPANDED_JSONLD_FORMATS = {
+    "json",
+    "jsonld",
+    "vnd.sinopia.json",
+    "application/json",
+    "application/ld+json",
+    "application/vnd.sinopia+json",
+}
+
+CBD_FORMATS = {
+    "cbd.jsonld",
+    "cbd.xml",
+    "application/cbd+jsonld",
+    "application/cbd+xml",
+}
+
+
+def _other_resources(model: Resource) -> LoaderOption:
+    return selectinload(model.other_resources).joinedload(
+        BibframeOtherResources.other_resource
+    )
+
+
+def load_options(model: Resource, format: str | None, expand: bool) -> list:
+    """
+    Loader options for reading `model` as `format`, which is a format
+    extension, an Accept media type or "html" (see serializer.requested_format).
+    None means the route's default representation.
+    """
+    if format in GRAPH_FORMATS or model is Hub:
+        return [_other_resources(model)] if expand else []
+
+    if format in CBD_FORMATS:
+        if model is not Instance:
+            return []
+        # the Instance, its Work and the Work's other Instances, all expanded
+        return [
+            _other_resources(Instance),
+            selectinload(Instance.work).options(
+                _other_resources(Work),
+                selectinload(Work.instances).options(_other_resources(Instance)),
+            ),
+        ]
+
+    # HTML: labels come from the other resources, plus the sidebar links
+    if model is Instance:
+        return [_other_resources(Instance), selectinload(Instance.work)]
+    return [_other_resources(Work), selectinload(Work.instances)]
+
+
+def batch_options(entity: Any, expand: bool) -> list[LoaderOption]:
+    """
+    Loader options for POST /resources/batch-get, which selects `entity`, a
+    `with_polymorphic` of Hub, Instance and Work. Every format it offers
+    renders the resources' own data, plus their other resources when
+    expanded.
+    """
+    if not expand:
+        return []
+    return [
+        _other_resources(getattr(entity, model.__name__))
+        for model in (Hub, Instance, Work)
+    ]
+
+
+def list_options(model: type[ResourceBase]) -> list[LoaderOption]:
+    """
+    Loader options for list and search pages. None of them return the
+    full-text `data_vector`, which is about as large as `data`, so it stays
+    in Postgres. Filtering and ranking on it in SQL is unaffected.
+    """
+    return [defer(model.data_vector)]
@@ -0,0 +1,189 @@
+"""
+Streaming N-Triples, Turtle and RDF/XML writers for `serialize.triples`.
+
+rdflib renders a representation by building a Graph and serializing all of it
+into one string before the first byte is sent. These writers format triples
+as they are read from the stored JSON-LD and hand them out in chunks of about
+CHUNK_SIZE bytes, so a large record starts arriving straight away and is
+never held in memory as a whole. Blank node labels and statement order differ
+from rdflib's, the graph is the same.
+"""
+
+import re
+from collections.abc import Iterable, Iterator
+from xml.sax.saxutils import escape, quoteattr
+
+from bluecore_api.app.utils.serialize.triples import (
+    IRI,
+    RDF_TYPE,
+    BlankNode,
+    Literal,
+    Term,
+    Triple,
+)
+
+CHUNK_SIZE = 64 * 1024
+
+# Prefixes for Turtle, as bound for the CBD graph and by rdflib by default
+PREFIXES = {
+    "bf": "http://id.loc.gov/ontologies/bibframe/",
+    "bflc": "http://id.loc.gov/ontologies/bflc/",
+    "madsrdf": "http://www.loc.gov/mads/rdf/v1#",
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+}
+
+# Local names written as prefixed names; anything else stays a full IRI
+LOCAL_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+# The element name of an RDF/XML property is its IRI's trailing NCName
+XML_LOCAL_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_.-]*$")
+BLANK_NODE_LABEL = re.compile(r"[A-Za-z0-9_]([A-Za-z0-9_.-]*[A-Za-z0-9_-])?")
+IRI_ESCAPES = re.compile(r'[\x00-\x20<>"{}|^`\\]')
+LITERAL_ESCAPES = {
+    ord("\\"): "\\\\",
+    ord('"'): '\\"',
+    ord("\n"): "\\n",
+    ord("\r"): "\\r",
+}
+
+
+def _iri(value: str) -> str:
+    return "<" + IRI_ESCAPES.sub(lambda c: f"\\u{ord(c.group()):04X}", value) + ">"
+
+
+def _blank_node(label: str) -> str:
+    if BLANK_NODE_LABEL.fullmatch(label):
+        return "_:" + label
+    return "_:" + re.sub(r"[^A-Za-z0-9_]", "_", label)
+
+
+def _literal(literal: Literal, iri=_iri) -> str:
+    quoted = '"' + literal.lexical.translate(LITERAL_ESCAPES) + '"'
+    if literal.language:
+        return f"{quoted}@{literal.language}"
+    if literal.datatype:
+        return f"{quoted}^^{iri(literal.datatype)}"
+    return quoted
+
+
+def _nt_term(term: Term) -> str:
+    if isinstance(term, Literal):
+        return _literal(term)
+    if isinstance(term, BlankNode):
+        return _blank_node(term)
+    return _iri(term)
+
+
+def _prefixed(iri: str) -> str:
+    for prefix, namespace in PREFIXES.items():
+        if iri.startswith(namespace) and LOCAL_NAME.fullmatch(iri[len(namespace) :]):
+            return f"{prefix}:{iri[len(namespace) :]}"
+    return _iri(iri)
+
+
+def _ttl_term(term: Term) -> str:
+    if isinstance(term, Literal):
+        return _literal(term, iri=_prefixed)
+    if isinstance(term, BlankNode):
+        return _blank_node(term)
+    return _prefixed(term)
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[bytes]:
+    buffer: list[str] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def ntriples(triples: Iterable[Triple]) -> Iterator[bytes]:
+    """`triples` as N-Triples, in UTF-8 chunks."""
+    return _chunked(f"{_nt_term(s)} {_iri(p)} {_nt_term(o)} .\n" for s, p, o in triples)
+
+
+def turtle(triples: Iterable[Triple]) -> Iterator[bytes]:
+    """
+    `triples` as Turtle, in UTF-8 chunks. Consecutive statements about the
+    same subject are grouped, which the walk in `serialize.triples` produces
+    for each node object.
+    """
+    return _chunked(_turtle_lines(triples))
+
+
+def _turtle_lines(triples: Iterable[Triple]) -> Iterator[str]:
+    for prefix, namespace in PREFIXES.items():
+        yield f"@prefix {prefix}: {_iri(namespace)} .\n"
+    subject: IRI | BlankNode | None = None
+    for s, p, o in triples:
+        predicate = "a" if p == RDF_TYPE else _prefixed(p)
+        if s == subject and type(s) is type(subject):
+            yield f" ;\n    {predicate} {_ttl_term(o)}"
+        else:
+            if subject is not None:
+                yield " .\n"
+            yield f"\n{_ttl_term(s)} {predicate} {_ttl_term(o)}"
+            subject = s
+    if subject is not None:
+        yield " .\n"
+
+
+def rdfxml(triples: Iterable[Triple]) -> Iterator[bytes]:
+    """
+    `triples` as RDF/XML, in UTF-8 chunks: an rdf:Description for each run
+    of statements about the same subject, as `turtle` groups them.
+    """
+    return _chunked(_rdfxml_lines(triples))
+
+
+def _rdfxml_lines(triples: Iterable[Triple]) -> Iterator[str]:
+    yield '<?xml version="1.0" encoding="utf-8"?>\n<rdf:RDF'
+    for prefix, namespace in PREFIXES.items():
+        yield f"\n   xmlns:{prefix}={quoteattr(namespace)}"
+    yield ">\n"
+    subject: IRI | BlankNode | None = None
+    for s, p, o in triples:
+        if s != subject or type(s) is not type(subject):
+            if subject is not None:
+                yield "  </rdf:Description>\n"
+            yield f"  <rdf:Description {_xml_node('rdf:about', s)}>\n"
+            subject = s
+        yield f"    {_xml_property(p, o)}\n"
+    if subject is not None:
+        yield "  </rdf:Description>\n"
+    yield "</rdf:RDF>\n"
+
+
+def _xml_node(attribute: str, node: IRI | BlankNode) -> str:
+    if isinstance(node, BlankNode):
+        label = _blank_node(node)[2:]
+        # an rdf:nodeID is an NCName, which can't start with a digit
+        return f"rdf:nodeID={quoteattr(label if label[0].isalpha() else 'b' + label)}"
+    return f"{attribute}={quoteattr(node)}"
+
+
+def _xml_property(predicate: str, term: Term) -> str:
+    match = XML_LOCAL_NAME.search(predicate)
+    if match is None or match.start() == 0:
+        raise ValueError(f"Can't split {predicate} into an RDF/XML element name")
+    namespace, local = predicate[: match.start()], match.group()
+    name, declaration = f"ns0:{local}", f" xmlns:ns0={quoteattr(namespace)}"
+    for prefix, known in PREFIXES.items():
+        if namespace == known:
+            name, declaration = f"{prefix}:{local}", ""
+            break
+    if isinstance(term, Literal):
+        if term.language:
+            attributes = f" xml:lang={quoteattr(term.language)}"
+        elif term.datatype:
+            attributes = f" rdf:datatype={quoteattr(term.datatype)}"
+        else:
+            attributes = ""
+        return f"<{name}{declaration}{attributes}>{escape(term.lexical)}</{name}>"
+    return f"<{name}{declaration} {_xml_node('rdf:resource', term)}/>"
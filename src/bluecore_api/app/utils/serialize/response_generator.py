@@ -1,31 +1,157 @@
-import json
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+from uuid import UUID
 
+import orjson
 from bluecore_models.models import Hub, Instance, ResourceBase, Work
-from bluecore_models.utils.graph import load_jsonld
 from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
+from bluecore_api.app.utils.serialize.binary import (
+    BINARY_RDF_MEDIA_TYPE,
+    binary_rdf,
+    graph_triples,
+)
 from bluecore_api.app.utils.serialize.cbd import (
-    cbd_jsonld,
-    cbd_xml,
+    cbd_sources,
+    write_cbd_jsonld,
+    write_cbd_xml,
 )
+from bluecore_api.app.utils.serialize.graph import add_document, load_graph
 from bluecore_api.app.utils.serialize.html import (
     render_instance_html,
     render_work_html,
 )
+from bluecore_api.app.utils.serialize.ntriples import (
+    CHUNK_SIZE,
+    ntriples,
+    rdfxml,
+    turtle,
+)
+from bluecore_api.app.utils.serialize.triples import Triple, all_triples, supported
 from bluecore_api.constants import CONTEXT_URL
-from bluecore_api.expansion import expand_resource_as_graph, expand_resource_graph
+from bluecore_api.cpu_pool import OffloadedResponse, spool
+from bluecore_api.expansion import (
+    add_other_resources,
+    expand_resource_graph,
+    other_resources_of,
+)
+from bluecore_api.other_resource_cache import OtherResourceData
 from bluecore_api.schemas.schemas import HubSchema, InstanceSchema, WorkSchema
 
+type Writer = Callable[[Iterable[Triple]], Iterator[bytes]]
+
+# format extension: (streaming writer, rdflib format, media type)
+GRAPH_WRITERS: dict[str, tuple[Writer, str, str]] = {
+    "nt": (ntriples, "nt", "application/n-triples"),
+    "rdf": (rdfxml, "xml", "application/rdf+xml"),
+    "ttl": (turtle, "turtle", "text/turtle"),
+    "brdf": (binary_rdf, "brdf", BINARY_RDF_MEDIA_TYPE),
+}
+
+BATCH_FORMATS = {"json", "jsonld", "vnd.sinopia.json", *GRAPH_WRITERS}
+
 
 def create_response(
     doc: ResourceBase, expand: bool, format: str, return_type: str
 ) -> Response:
-    graph = load_jsonld(doc.data)
-    if expand:
-        graph = expand_resource_as_graph(doc, graph)
-    return Response(
-        content=graph.serialize(format=format),
+    others = other_resources_of(doc) if expand else []
+    return OffloadedResponse(
+        write_graph,
+        [doc.data],
+        others,
+        format,
         media_type=return_type,
+        chunk_size=CHUNK_SIZE,
+    )
+
+
+def write_graph(
+    destination: str, documents: list, others: list[OtherResourceData], format: str
+) -> None:
+    """`documents` and their other resources written as `format`, in the CPU pool."""
+    graph = load_graph(documents[0])
+    for data in documents[1:]:
+        add_document(graph, data)
+    add_other_resources(graph, others)
+    with spool(destination) as out:
+        if format == "brdf":
+            # not an rdflib format: the binary writer takes the graph's triples
+            for chunk in binary_rdf(graph_triples(graph)):
+                out.write(chunk)
+        else:
+            graph.serialize(destination=out, format=format)
+
+
+def stream_response(
+    doc: ResourceBase,
+    expand: bool,
+    writer: Writer,
+    format: str,
+    return_type: str,
+) -> Response:
+    """
+    Streams `doc` (with its other resources when expanded) through `writer`,
+    straight from the stored JSON-LD. Documents using JSON-LD features the
+    triple reader doesn't cover go through rdflib as before.
+    """
+    # read now: the body is written after the session has moved on
+    documents = [doc.data]
+    if expand:
+        documents.extend(row.other_resource.data for row in doc.other_resources)
+    if not all(supported(data) for data in documents):
+        return create_response(doc, expand, format, return_type)
+    return StreamingResponse(writer(all_triples(documents)), media_type=return_type)
+
+
+def batch_response(
+    docs: Sequence[ResourceBase],
+    expand: bool,
+    format: str,
+    expansions: dict[int, dict],
+) -> Response:
+    """
+    `docs` in one response, `format` being one of BATCH_FORMATS: a JSON array
+    for the JSON-LD formats, a single graph for the RDF ones. An other
+    resource several of the documents link to is included once. `expansions`
+    are materialized expansions by resource id.
+    """
+    if format in ("json", "jsonld"):
+        return Response(
+            content=orjson.dumps(
+                [jsonld(doc, expand, expansions.get(doc.id)) for doc in docs]
+            ),
+            media_type="application/ld+json",
+        )
+    if format == "vnd.sinopia.json":
+        return Response(
+            content=orjson.dumps(
+                [sinopia_json(doc, expand, expansions.get(doc.id)) for doc in docs],
+                default=_orjson_default,
+                option=orjson.OPT_UTC_Z,
+            ),
+            media_type="application/ld+json",
+        )
+
+    writer, rdflib_format, media_type = GRAPH_WRITERS[format]
+    others = {}
+    if expand:
+        for doc in docs:
+            for row in doc.other_resources:
+                others.setdefault(row.other_resource.id, row.other_resource)
+    documents = [doc.data for doc in docs]
+    graph_documents = [*documents, *(other.data for other in others.values())]
+    if all(supported(data) for data in graph_documents):
+        return StreamingResponse(
+            writer(all_triples(graph_documents)), media_type=media_type
+        )
+    return OffloadedResponse(
+        write_graph,
+        documents,
+        [OtherResourceData.of(other) for other in others.values()],
+        rdflib_format,
+        media_type=media_type,
+        chunk_size=CHUNK_SIZE,
     )
 
 
@@ -37,9 +163,11 @@ def as_cbd_jsonld(doc: ResourceBase, expand: bool) -> Response:
         raise HTTPException(
             status_code=400, detail="CBD serialization is only supported for Instances"
         )
-    return Response(
-        content=cbd_jsonld(doc),
+    return OffloadedResponse(
+        write_cbd_jsonld,
+        cbd_sources(doc),
         media_type="application/ld+json",
+        chunk_size=CHUNK_SIZE,
     )
 
 
@@ -48,9 +176,11 @@ def as_cbd_xml(doc: ResourceBase, expand: bool) -> Response:
         raise HTTPException(
             status_code=400, detail="CBD serialization is only supported for Instances"
         )
-    return Response(
-        content=cbd_xml(doc),
+    return OffloadedResponse(
+        write_cbd_xml,
+        cbd_sources(doc),
         media_type="application/rdf+xml",
+        chunk_size=CHUNK_SIZE,
     )
 
 
@@ -61,44 +191,90 @@ def as_html(doc: Instance | Work, request: Request) -> Response:
     return render_work_html(doc, request)
 
 
-def as_jsonld(doc: ResourceBase, expand: bool) -> Response:
-    jsonld_content = jsonld(doc, expand)
+def as_jsonld(
+    doc: ResourceBase, expand: bool, expanded: dict | None = None
+) -> Response:
     return Response(
-        content=json.dumps(jsonld_content.data),
+        content=orjson.dumps(jsonld(doc, expand, expanded)),
         media_type="application/ld+json",
     )
 
 
+def as_binary_rdf(doc: ResourceBase, expand: bool) -> Response:
+    return stream_response(doc, expand, binary_rdf, "brdf", BINARY_RDF_MEDIA_TYPE)
+
+
 def as_ntriples(doc: ResourceBase, expand: bool) -> Response:
-    return create_response(doc, expand, "nt", "application/n-triples")
+    return stream_response(doc, expand, ntriples, "nt", "application/n-triples")
 
 
 def as_rdfxml(doc: ResourceBase, expand: bool) -> Response:
-    return create_response(doc, expand, "xml", "application/rdf+xml")
+    return stream_response(doc, expand, rdfxml, "xml", "application/rdf+xml")
 
 
 def as_turtle(doc: ResourceBase, expand: bool) -> Response:
-    return create_response(doc, expand, "turtle", "text/turtle")
+    return stream_response(doc, expand, turtle, "turtle", "text/turtle")
+
+
+def _orjson_default(value: Any) -> Any:
+    """orjson encodes uuid.UUID itself only, not asyncpg's subclass of it."""
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError
 
 
-def as_vnd_sinopia_json(doc: ResourceBase, expand: bool) -> Response:
+def as_vnd_sinopia_json(
+    doc: ResourceBase, expand: bool, expanded: dict | None = None
+) -> Response:
+    """OPT_UTC_Z writes datetimes the way pydantic does."""
     return Response(
-        content=jsonld(doc, expand).model_dump_json(),
+        content=orjson.dumps(
+            sinopia_json(doc, expand, expanded),
+            default=_orjson_default,
+            option=orjson.OPT_UTC_Z,
+        ),
         media_type="application/ld+json",
     )
 
 
-def jsonld(doc: ResourceBase, expand: bool) -> HubSchema | InstanceSchema | WorkSchema:
-    if expand:
-        doc.data = expand_resource_graph(doc)
-    doc.data["@context"] = CONTEXT_URL
+def sinopia_json(
+    doc: ResourceBase, expand: bool, expanded: dict | None = None
+) -> dict[str, Any]:
+    """
+    The resource laid out as its Hub/Work/InstanceSchema, built from the
+    schema's fields rather than validated through it.
+    """
+    data = jsonld(doc, expand, expanded)
+    schema = _schema(doc)
+    return {
+        name: data if name == "data" else getattr(doc, name, field.default)
+        for name, field in schema.model_fields.items()
+    }
+
+
+def jsonld(
+    doc: ResourceBase, expand: bool, expanded: dict | None = None
+) -> dict[str, Any]:
+    """
+    The stored (or expanded) JSON-LD with our @context. The data comes from
+    the database, so it is encoded as is rather than revalidated. `expanded`
+    is an expansion read from the materialized expansions.
+    """
+    _schema(doc)
+    if expanded is not None:
+        data = expanded
+    else:
+        data = expand_resource_graph(doc) if expand else doc.data
+    return {**data, "@context": CONTEXT_URL}
+
 
+def _schema(doc: ResourceBase) -> type[HubSchema | InstanceSchema | WorkSchema]:
     if isinstance(doc, Instance):
-        return InstanceSchema.model_validate(doc)
+        return InstanceSchema
     elif isinstance(doc, Work):
-        return WorkSchema.model_validate(doc)
+        return WorkSchema
     elif isinstance(doc, Hub):
-        return HubSchema.model_validate(doc)
+        return HubSchema
     else:
         raise HTTPException(
             status_code=400,
@@ -0,0 +1,406 @@
+"""
+Triples straight from stored JSON-LD, without building an rdflib Graph.
+
+Resources are stored as JSON-LD that is either expanded (full IRIs),
+compacted with an @context of its own, or compacted against bluecore_models'
+CONTEXT, which `load_jsonld` applies to a document without one. `JsonLdTriples` walks that JSON and yields the same triples
+rdflib's parser would add to a Graph, as lightweight terms the writers in
+`serialize.ntriples` format directly.
+
+Only the JSON-LD the API stores is covered: local contexts made of terms,
+prefixes, @vocab, @language and typed or @id-coerced term definitions, node
+objects, value objects and @list. `supported` reports whether a document
+stays within that subset; callers use rdflib for anything else.
+
+CONTEXT is large and nearly every document is read against it, so its term
+map is compiled once, when this module is imported.
+"""
+
+import secrets
+from collections.abc import Iterable, Iterator
+from decimal import Decimal
+from itertools import count
+from typing import Any, NamedTuple
+
+from bluecore_models.utils.graph import CONTEXT
+
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+RDF_TYPE = RDF + "type"
+RDF_FIRST = RDF + "first"
+RDF_REST = RDF + "rest"
+RDF_NIL = RDF + "nil"
+
+# keywords that change the graph in ways the walker doesn't model
+UNSUPPORTED_KEYWORDS = {
+    "@direction",
+    "@graph",
+    "@included",
+    "@json",
+    "@nest",
+    "@reverse",
+}
+CONTEXT_KEYWORDS = {"@language", "@version", "@vocab"}
+TERM_KEYWORDS = {"@container", "@id", "@language", "@type"}
+CONTAINERS = {None, "@list", "@set"}
+
+
+class IRI(str):
+    pass
+
+
+class BlankNode(str):
+    pass
+
+
+class Literal(NamedTuple):
+    lexical: str
+    datatype: str | None = None
+    language: str | None = None
+
+
+type Term = IRI | BlankNode | Literal
+type Triple = tuple[IRI | BlankNode, IRI, Term]
+
+
+class TermDefinition(NamedTuple):
+    iri: str | None
+    type: str | None = None
+    container: str | None = None
+    language: str | None = None
+
+
+class ActiveContext:
+    def __init__(self) -> None:
+        self.terms: dict[str, TermDefinition] = {}
+        self.vocab: str | None = None
+        self.language: str | None = None
+
+    def update(self, local: Any) -> "ActiveContext":
+        """A new context with the definitions in `local` applied."""
+        updated = ActiveContext()
+        updated.terms = dict(self.terms)
+        updated.vocab, updated.language = self.vocab, self.language
+        for context in local if isinstance(local, list) else [local]:
+            if context is None:
+                updated = ActiveContext()
+                continue
+            if "@vocab" in context:
+                vocab = context["@vocab"]
+                updated.vocab = None if vocab is None else updated.expand(vocab)
+            if "@language" in context:
+                language = context["@language"]
+                updated.language = language.lower() if language else None
+            for term, definition in context.items():
+                if not term.startswith("@"):
+                    updated.terms[term] = updated._definition(term, definition)
+        return updated
+
+    def _definition(self, term: str, definition: Any) -> TermDefinition:
+        if definition is None:
+            return TermDefinition(None)
+        if isinstance(definition, str):
+            return TermDefinition(self.expand(definition))
+        if "@id" in definition:
+            iri = definition["@id"]
+        elif ":" in term:
+            iri = term
+        else:
+            # e.g. {"hasInstance": {"@type": "@id"}}: the term is read with @vocab
+            iri = None if self.vocab is None else self.vocab + term
+        datatype = definition.get("@type")
+        if datatype not in (None, "@id", "@vocab"):
+            datatype = self.expand(datatype)
+        language = None
+        if "@language" in definition:
+            # "" records an explicit null, which overrides the default language
+            language = (definition["@language"] or "").lower()
+        return TermDefinition(
+            iri=None if iri is None else self.expand(iri),
+            type=datatype,
+            container=definition.get("@container"),
+            language=language,
+        )
+
+    def expand(self, value: str, vocab: bool = True) -> str | None:
+        """Expand a term, compact IRI or IRI (section 5.2 of JSON-LD 1.1 API)."""
+        if value.startswith("@"):
+            return value
+        if vocab and value in self.terms:
+            return self.terms[value].iri
+        prefix, colon, suffix = value.partition(":")
+        if colon:
+            if prefix == "_" or suffix.startswith("//"):
+                return value
+            definition = self.terms.get(prefix)
+            if definition is not None and definition.iri is not None:
+                return definition.iri + suffix
+            return value
+        if vocab and self.vocab is not None:
+            return self.vocab + value
+        return value
+
+
+def supported(data: Any, context: Any = CONTEXT) -> bool:
+    """Whether `JsonLdTriples` can read `data`, stored with `context`."""
+    if isinstance(data, dict) and "@context" not in data:
+        context_supported = (
+            CONTEXT_SUPPORTED if context is CONTEXT else _supported_context(context)
+        )
+        if not context_supported:
+            return False
+    return all(
+        _supported_context(document.get("@context"))
+        and _supported_value(_nodes(document))
+        for document in _documents(data)
+    )
+
+
+def _documents(data: Any) -> list[dict]:
+    """
+    The documents `load_jsonld` parses from stored `data`: each item of a
+    list, as it is, or the single document.
+    """
+    documents = data if isinstance(data, list) else [data]
+    return [document for document in documents if isinstance(document, dict)]
+
+
+def _nodes(document: dict[str, Any]) -> list:
+    """The top-level nodes of a document, which may wrap them in @graph."""
+    data = {key: value for key, value in document.items() if key != "@context"}
+    if set(data) <= {"@graph"}:
+        nodes = data.get("@graph", [])
+        return nodes if isinstance(nodes, list) else [nodes]
+    return [data]
+
+
+def _supported_context(context: Any) -> bool:
+    for local in context if isinstance(context, list) else [context]:
+        if local is None:
+            continue
+        if not isinstance(local, dict):
+            # remote contexts
+            return False
+        for term, definition in local.items():
+            if term.startswith("@"):
+                if term not in CONTEXT_KEYWORDS:
+                    return False
+            elif isinstance(definition, dict):
+                if (
+                    not set(definition) <= TERM_KEYWORDS
+                    or definition.get("@container") not in CONTAINERS
+                ):
+                    return False
+            elif not isinstance(definition, str | None):
+                return False
+    return True
+
+
+CONTEXT_SUPPORTED = _supported_context(CONTEXT)
+COMPILED_CONTEXT = ActiveContext().update(CONTEXT) if CONTEXT_SUPPORTED else None
+
+
+def _supported_value(value: Any) -> bool:
+    if isinstance(value, list):
+        return all(_supported_value(item) for item in value)
+    if not isinstance(value, dict):
+        return True
+    for key, item in value.items():
+        if key in UNSUPPORTED_KEYWORDS:
+            return False
+        if key == "@context":
+            if not _supported_context(item):
+                return False
+        elif key == "@id":
+            # relative IRIs would need a document base
+            if not isinstance(item, str) or ":" not in item:
+                return False
+        elif not _supported_value(item):
+            return False
+    return True
+
+
+class JsonLdTriples:
+    """
+    Turns JSON-LD documents into triples. One instance is used per
+    serialization, so the blank nodes it mints for unlabelled node objects
+    stay distinct across the documents it reads, while labelled blank nodes
+    are shared between them, as they are when rdflib parses the same
+    documents into one Graph.
+    """
+
+    def __init__(self, context: Any = CONTEXT) -> None:
+        if context is CONTEXT and COMPILED_CONTEXT is not None:
+            self.context = COMPILED_CONTEXT
+        else:
+            self.context = ActiveContext().update(context)
+        self._prefix = f"N{secrets.token_hex(8)}"
+        self._ids = count()
+
+    def triples(self, data: Any) -> Iterator[Triple]:
+        """The triples in the stored document `data`, as `load_jsonld` reads it."""
+        # like load_jsonld, a single document without an @context of its own
+        # is read with this reader's context, anything else with its own only
+        default = (
+            self.context
+            if isinstance(data, dict) and "@context" not in data
+            else ActiveContext()
+        )
+        for document in _documents(data):
+            context = default
+            if "@context" in document:
+                context = context.update(document["@context"])
+            for node in _nodes(document):
+                if isinstance(node, dict):
+                    yield from self._node(node, context)
+
+    def _blank_node(self) -> BlankNode:
+        return BlankNode(f"{self._prefix}{next(self._ids)}")
+
+    def _node(self, node: dict[str, Any], context: ActiveContext) -> Iterator[Triple]:
+        """
+        Triples for a node object, after those of the nodes nested in it so
+        that each subject's statements come out together. Returns the subject.
+        """
+        if "@context" in node:
+            context = context.update(node["@context"])
+        subject = (
+            self._reference(node["@id"], context, vocab=False)
+            if "@id" in node
+            else self._blank_node()
+        )
+        own: list[Triple] = []
+        for key, value in node.items():
+            if key == "@type":
+                for rdf_type in value if isinstance(value, list) else [value]:
+                    rdf_type = self._reference(rdf_type, context)
+                    own.append((subject, IRI(RDF_TYPE), rdf_type))
+                continue
+            if key.startswith("@"):
+                continue
+            predicate = context.expand(key)
+            if predicate is None or ":" not in predicate or predicate.startswith("_:"):
+                # dropped by JSON-LD expansion, or not a valid RDF predicate
+                continue
+            definition = context.terms.get(key, TermDefinition(predicate))
+            if definition.container == "@list" and not _is_list(value):
+                value = {"@list": value}
+            for obj in (yield from self._objects(value, definition, context)):
+                own.append((subject, IRI(predicate), obj))
+        yield from own
+        return subject
+
+    def _objects(
+        self, value: Any, definition: TermDefinition, context: ActiveContext
+    ) -> Iterator[Triple]:
+        """Triples for nested nodes in `value`; returns its RDF objects."""
+        objects: list[Term] = []
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, list):
+                objects.extend((yield from self._objects(item, definition, context)))
+            elif isinstance(item, dict):
+                if "@value" in item:
+                    literal = self._value_object(item, context)
+                    if literal is not None:
+                        objects.append(literal)
+                elif "@list" in item:
+                    objects.append(
+                        (yield from self._list(item["@list"], definition, context))
+                    )
+                elif "@set" in item:
+                    objects.extend(
+                        (yield from self._objects(item["@set"], definition, context))
+                    )
+                else:
+                    objects.append((yield from self._node(item, context)))
+            elif item is not None:
+                objects.append(self._scalar(item, definition, context))
+        return objects
+
+    def _list(
+        self, items: Any, definition: TermDefinition, context: ActiveContext
+    ) -> Iterator[Triple]:
+        """Triples for an RDF collection; returns its head."""
+        members = yield from self._objects(
+            items, definition._replace(container=None), context
+        )
+        if not members:
+            return IRI(RDF_NIL)
+        nodes = [self._blank_node() for _ in members]
+        for index, (node, member) in enumerate(zip(nodes, members, strict=True)):
+            yield node, IRI(RDF_FIRST), member
+            rest = nodes[index + 1] if index + 1 < len(nodes) else IRI(RDF_NIL)
+            yield node, IRI(RDF_REST), rest
+        return nodes[0]
+
+    def _reference(
+        self, value: str, context: ActiveContext, vocab: bool = True
+    ) -> IRI | BlankNode:
+        iri = context.expand(value, vocab=vocab) or value
+        if iri.startswith("_:"):
+            return BlankNode(iri[2:])
+        return IRI(iri)
+
+    def _value_object(
+        self, item: dict[str, Any], context: ActiveContext
+    ) -> Literal | None:
+        value = item["@value"]
+        if value is None:
+            return None
+        datatype = item.get("@type")
+        if datatype is not None:
+            datatype = context.expand(datatype)
+        if isinstance(value, str):
+            language = item.get("@language")
+            if datatype is not None:
+                return Literal(value, datatype)
+            return Literal(value, language=language.lower() if language else None)
+        return _native(value, datatype)
+
+    def _scalar(
+        self, value: Any, definition: TermDefinition, context: ActiveContext
+    ) -> Term:
+        coercion = definition.type
+        if isinstance(value, str):
+            if coercion == "@id":
+                return self._reference(value, context, vocab=False)
+            if coercion == "@vocab":
+                return self._reference(value, context)
+            if coercion is not None:
+                return Literal(value, coercion)
+            language = (
+                context.language
+                if definition.language is None
+                else definition.language or None
+            )
+            return Literal(value, language=language)
+        datatype = coercion if coercion not in (None, "@id", "@vocab") else None
+        return _native(value, datatype)
+
+
+def _is_list(value: Any) -> bool:
+    return isinstance(value, dict) and "@list" in value
+
+
+def _native(value: bool | float, datatype: str | None) -> Literal:
+    """A JSON boolean or number as a literal (section 8.6 of JSON-LD 1.1 API)."""
+    if isinstance(value, bool):
+        return Literal("true" if value else "false", datatype or XSD + "boolean")
+    if isinstance(value, float) and (
+        not value.is_integer() or abs(value) >= 1e21 or datatype == XSD + "double"
+    ):
+        # repr has the fewest digits that read back as the same double
+        mantissa, exponent = format(Decimal(repr(value)), "E").split("E")
+        mantissa = mantissa.rstrip("0") if "." in mantissa else mantissa + "."
+        if mantissa.endswith("."):
+            mantissa += "0"
+        return Literal(f"{mantissa}E{int(exponent)}", datatype or XSD + "double")
+    return Literal(str(int(value)), datatype or XSD + "integer")
+
+
+def all_triples(documents: Iterable[Any], context: Any = CONTEXT) -> Iterator[Triple]:
+    """The triples of several stored documents, read into one graph."""
+    reader = JsonLdTriples(context)
+    for data in documents:
+        yield from reader.triples(data)
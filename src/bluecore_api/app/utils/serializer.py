@@ -2,8 +2,10 @@ from collections.abc import Callable
 
 from bluecore_models.models import Instance, Work
 from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from bluecore_api.app.utils.serialize.response_generator import (
+    as_binary_rdf,
     as_cbd_jsonld,
     as_cbd_xml,
     as_html,
@@ -13,9 +15,13 @@ from bluecore_api.app.utils.serialize.response_generator import (
     as_turtle,
     as_vnd_sinopia_json,
 )
+from bluecore_api.content_encoding import negotiate
+from bluecore_api.representation_cache import representation_cache
+from bluecore_api.selective_expansion import Expansion
 
 type SerializerFn = Callable[[Instance | Work, bool], Response | None]
 serializer_format_registry: dict[str, SerializerFn] = {
+    "brdf": as_binary_rdf,
     "cbd.jsonld": as_cbd_jsonld,
     "cbd.xml": as_cbd_xml,
     "json": as_jsonld,
@@ -33,11 +39,65 @@ serializer_accept_registry: dict[str, SerializerFn] = {
     "application/ld+json": as_jsonld,
     "application/n-triples": as_ntriples,
     "application/rdf+xml": as_rdfxml,
+    "application/vnd.bluecore.rdf": as_binary_rdf,
     "application/vnd.sinopia+json": as_vnd_sinopia_json,
     "text/turtle": as_turtle,
 }
 
 
+def serialize_expanded(
+    doc: Instance | Work, expanded: dict, representation: str
+) -> Response:
+    """`doc` as `representation`, one of EXPANDED_JSONLD_FORMATS, from `expanded`."""
+    if representation in ("vnd.sinopia.json", "application/vnd.sinopia+json"):
+        return as_vnd_sinopia_json(doc, True, expanded)
+    return as_jsonld(doc, True, expanded)
+
+
+def requested_format(format: str | None, request: Request) -> str | None:
+    """
+    The representation `serialize` will produce: a format extension, an
+    Accept media type, "html", or None for the route's default.
+    """
+    if format in serializer_format_registry:
+        return format
+    accept_header = request.headers.get("accept", "")
+    for accept_raw in accept_header.split(","):
+        accept = accept_raw.split(";")[0].strip()
+        if accept == "text/html":
+            return "html"
+        if accept in serializer_accept_registry:
+            return accept
+    return None
+
+
+async def serialize_cached(
+    db: AsyncSession,
+    doc: Instance | Work,
+    expansion: Expansion | None,
+    format: str | None,
+    request: Request,
+) -> Response | None:
+    """
+    `serialize`, reusing the body rendered for the same version of `doc`.
+    Reading `doc` may lazy load its links, so that runs under `db.run_sync`,
+    and the cache, which may be on a shared server, is used outside it.
+    """
+    representation = requested_format(format, request)
+    key = await db.run_sync(
+        lambda _: representation_cache.key(doc, representation, expansion)
+    )
+    encoding = negotiate(request.headers.get("accept-encoding"))
+    response = await representation_cache.get(key, encoding)
+    if response is None:
+        response = await db.run_sync(
+            lambda _: serialize(doc, expansion is not None, format, request)
+        )
+        if response is not None:
+            await representation_cache.put(key, response)
+    return response
+
+
 def serialize(
     doc: Instance | Work, expand: bool, format: str | None, request: Request
 ) -> Response | None:
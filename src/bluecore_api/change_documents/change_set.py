@@ -2,7 +2,7 @@ import math
 
 from bluecore_models.models import ResourceBase, Version
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager, load_only
 
 from bluecore_api.change_documents.counter import Counter
 from bluecore_api.constants import (
@@ -90,9 +90,21 @@ class ChangeSet(Counter, ChangeSetSchema):
             id=id, total_pages=total_pages, bc_type=bc_type, host=host
         )
 
+        # Activities only need timestamps, uri and type: fill in each version's
+        # resource from the join and leave both rows' data behind.
         stmt = (
             select(Version)
-            .join(ResourceBase)
+            .options(
+                load_only(Version.id, Version.resource_id, Version.created_at),
+                contains_eager(Version.resource).load_only(
+                    ResourceBase.id,
+                    ResourceBase.uri,
+                    ResourceBase.type,
+                    ResourceBase.created_at,
+                    ResourceBase.updated_at,
+                ),
+            )
+            .join(Version.resource)
             .filter(ResourceBase.type == bc_type)
             .order_by(Version.id)
             .offset((id - 1) * page_length)
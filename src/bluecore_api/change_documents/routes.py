@@ -1,12 +1,13 @@
 import os
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from bluecore_api.change_documents.change_set import ChangeSet
 from bluecore_api.change_documents.entry_point import EntryPoint
+from bluecore_api.conditional import feed_validators
 from bluecore_api.constants import DEFAULT_ACTIVITY_STREAMS_PAGE_LENGTH, BluecoreType
-from bluecore_api.database import get_db
+from bluecore_api.database import get_list_db
 from bluecore_api.schemas.change_documents.schemas import (
     ChangeSetSchema,
     EntryPointSchema,
@@ -27,13 +28,21 @@ change_documents = APIRouter()
     operation_id="get_instances_feed",
 )
 async def instances_entry_point(
-    db: Session = Depends(get_db),
-) -> EntryPointSchema:
-    return EntryPoint(
-        db=db,
-        bc_type=BluecoreType.INSTANCES,
-        host=host,
-        page_length=page_length,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_list_db),
+) -> EntryPointSchema | Response:
+    validators = await feed_validators(db, BluecoreType.INSTANCES, "feed", page_length)
+    if validators.matches(request):
+        return validators.not_modified()
+    response.headers.update(validators.headers())
+    return await db.run_sync(
+        lambda session: EntryPoint(
+            db=session,
+            bc_type=BluecoreType.INSTANCES,
+            host=host,
+            page_length=page_length,
+        )
     )
 
 
@@ -45,14 +54,24 @@ async def instances_entry_point(
 )
 async def instances_change_set(
     id: int,
-    db: Session = Depends(get_db),
-) -> ChangeSetSchema:
-    return ChangeSet(
-        db=db,
-        bc_type=BluecoreType.INSTANCES,
-        id=id,
-        host=host,
-        page_length=page_length,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_list_db),
+) -> ChangeSetSchema | Response:
+    validators = await feed_validators(
+        db, BluecoreType.INSTANCES, "page", id, page_length
+    )
+    if validators.matches(request):
+        return validators.not_modified()
+    response.headers.update(validators.headers())
+    return await db.run_sync(
+        lambda session: ChangeSet(
+            db=session,
+            bc_type=BluecoreType.INSTANCES,
+            id=id,
+            host=host,
+            page_length=page_length,
+        )
     )
 
 
@@ -63,13 +82,21 @@ async def instances_change_set(
     operation_id="get_instance_feed",
 )
 async def works_entry_point(
-    db: Session = Depends(get_db),
-) -> EntryPointSchema:
-    return EntryPoint(
-        db=db,
-        bc_type=BluecoreType.WORKS,
-        host=host,
-        page_length=page_length,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_list_db),
+) -> EntryPointSchema | Response:
+    validators = await feed_validators(db, BluecoreType.WORKS, "feed", page_length)
+    if validators.matches(request):
+        return validators.not_modified()
+    response.headers.update(validators.headers())
+    return await db.run_sync(
+        lambda session: EntryPoint(
+            db=session,
+            bc_type=BluecoreType.WORKS,
+            host=host,
+            page_length=page_length,
+        )
     )
 
 
@@ -81,12 +108,20 @@ async def works_entry_point(
 )
 async def works_change_set(
     id: int,
-    db: Session = Depends(get_db),
-) -> ChangeSetSchema:
-    return ChangeSet(
-        db=db,
-        bc_type=BluecoreType.WORKS,
-        id=id,
-        host=host,
-        page_length=page_length,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_list_db),
+) -> ChangeSetSchema | Response:
+    validators = await feed_validators(db, BluecoreType.WORKS, "page", id, page_length)
+    if validators.matches(request):
+        return validators.not_modified()
+    response.headers.update(validators.headers())
+    return await db.run_sync(
+        lambda session: ChangeSet(
+            db=session,
+            bc_type=BluecoreType.WORKS,
+            id=id,
+            host=host,
+            page_length=page_length,
+        )
     )
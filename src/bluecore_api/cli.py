@@ -141,6 +141,76 @@ def load_profiles(
         raise Exit(1)
 
 
+@app.command()
+def rebuild_expansions(
+    page_size: Annotated[int, Option(help="Resources rebuilt per request")] = 100,
+):
+    """
+    Build the materialized expanded JSON-LD of every Work, Instance and Hub,
+    e.g. after turning on MATERIALIZE_EXPANSIONS or a batch load.
+    """
+    rebuilt = 0
+    after: int | None = 0
+    try:
+        token = _get_token()
+        while after is not None:
+            resp = httpx.post(
+                f"{state['api_url']}/internal/expansions/rebuild",
+                headers={"Authorization": f"Bearer {token}"},
+                params={"after": after, "limit": page_size},
+                timeout=None,
+            )
+            resp.raise_for_status()
+            page = resp.json()
+            rebuilt += page["rebuilt"]
+            after = page["next"]
+            if state.get("verbose"):
+                printr(f"  rebuilt {rebuilt} expansions")
+
+        printr(f"[green]Rebuilt {rebuilt} expansions[/green]")
+    except httpx.HTTPError as e:
+        printr(f"[red]{e}[/red]")
+        raise Exit(1)
+
+
+@app.command()
+def check_expansions(
+    page_size: Annotated[int, Option(help="Resources checked per request")] = 100,
+):
+    """
+    Compare the materialized expansions with expanding each resource on the
+    fly, and list the ones that are missing, stale or differ.
+    """
+    checked = 0
+    problems: dict[str, list[int]] = {"missing": [], "stale": [], "mismatched": []}
+    after: int | None = 0
+    try:
+        token = _get_token()
+        while after is not None:
+            resp = httpx.get(
+                f"{state['api_url']}/internal/expansions/check",
+                headers={"Authorization": f"Bearer {token}"},
+                params={"after": after, "limit": page_size},
+                timeout=None,
+            )
+            resp.raise_for_status()
+            page = resp.json()
+            checked += page["checked"]
+            for name, ids in problems.items():
+                ids.extend(page[name])
+            after = page["next"]
+
+        printr(f"Checked {checked} expansions")
+        for name, ids in problems.items():
+            color = "red" if ids else "green"
+            printr(f"[{color}]{name}: {len(ids)}[/{color}] {ids or ''}")
+        if any(problems.values()):
+            raise Exit(1)
+    except httpx.HTTPError as e:
+        printr(f"[red]{e}[/red]")
+        raise Exit(1)
+
+
 @app.callback()
 def main(
     bluecore_url: Annotated[str | None, Option(help="Bluecore URL")] = None,
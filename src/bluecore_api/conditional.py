@@ -0,0 +1,161 @@
+"""
+Conditional GET support: strong ETags, Last-Modified and 304 responses.
+
+Validators are computed from a metadata query that reads ids and timestamps
+only, never `data`, so a client polling an unchanged resource or feed page
+gets its 304 without the resource being loaded or serialized.
+
+A resource's validators cover everything its representations draw on: the
+resource, for an Instance its Work and the Work's other Instances, for a Work
+its Instances, and the other resources all of those link to. Any of them
+changing, or a link being added or removed, changes the ETag. These
+resources, and change document feeds, have an ETag only: deleting the newest
+row they draw on, such as a linked other resource or a version, moves the
+latest date back, and If-Modified-Since compares dates. Other resources and
+profiles, rendered from their own row, also get Last-Modified.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from bluecore_models.models import (
+    BibframeOtherResources,
+    Hub,
+    Instance,
+    ResourceBase,
+    Version,
+    Work,
+)
+from fastapi import Request, Response
+from sqlalchemy import Select, func, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bluecore_api.constants import BluecoreType
+from bluecore_api.selective_expansion import Expansion
+
+
+@dataclass
+class Validators:
+    etag: str
+    last_modified: datetime | None
+
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                _utc(self.last_modified), usegmt=True
+            )
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        """True when the client's copy is current (RFC 9110 section 13.2.2)."""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole seconds
+        return _utc(self.last_modified).replace(microsecond=0) <= _utc(since)
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers())
+
+    def apply(self, response: Response) -> Response:
+        if response.status_code == 200:
+            response.headers.update(self.headers())
+        return response
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def make_validators(last_modified: datetime | None, *parts: Any) -> Validators:
+    digest = hashlib.sha256(
+        "\x1f".join(str(part) for part in (*parts, last_modified)).encode()
+    ).hexdigest()
+    return Validators(etag=f'"{digest[:32]}"', last_modified=last_modified)
+
+
+def _related_ids(model: type[Hub | Instance | Work], uuid: str) -> Select:
+    own_id = select(model.id).where(model.uuid == uuid)
+    if model is Instance:
+        work_id = select(Instance.work_id).where(Instance.uuid == uuid)
+        return union(
+            own_id,
+            work_id,
+            select(Instance.id).where(Instance.work_id == work_id.scalar_subquery()),
+        )
+    if model is Work:
+        return union(
+            own_id,
+            select(Instance.id).where(Instance.work_id == own_id.scalar_subquery()),
+        )
+    return own_id
+
+
+async def resource_validators(
+    db: AsyncSession,
+    model: type[Hub | Instance | Work],
+    uuid: str,
+    representation: str | None,
+    expansion: Expansion | None,
+) -> Validators | None:
+    """
+    Validators for `model` `uuid` as `representation` with `expansion`, or
+    None if it's missing. A selective expansion is covered by all the links,
+    which is more than it draws on but never less. A link added later can be
+    removed again, so there is no Last-Modified even while there are none.
+    """
+    related = _related_ids(model, uuid).subquery()
+    linked = select(BibframeOtherResources.other_resource_id).where(
+        BibframeOtherResources.bibframe_resource_id.in_(select(related))
+    )
+    last_modified, count = (
+        await db.execute(
+            select(func.max(ResourceBase.updated_at), func.count()).where(
+                ResourceBase.id.in_(union(select(related), linked))
+            )
+        )
+    ).one()
+    if not count:
+        return None
+    validators = make_validators(last_modified, uuid, count, representation, expansion)
+    validators.last_modified = None
+    return validators
+
+
+async def row_validators(
+    db: AsyncSession, model: type[ResourceBase], *where: Any
+) -> Validators | None:
+    """Validators for a resource rendered on its own: other resources, profiles."""
+    row = (await db.execute(select(model.id, model.updated_at).where(*where))).first()
+    if row is None:
+        return None
+    return make_validators(row.updated_at, model.__name__, row.id)
+
+
+async def feed_validators(
+    db: AsyncSession, bc_type: BluecoreType, *parts: Any
+) -> Validators:
+    """Validators for a change document feed, which changes only with versions."""
+    latest_id, latest_at, count = (
+        await db.execute(
+            select(func.max(Version.id), func.max(Version.created_at), func.count())
+            .select_from(Version)
+            .join(ResourceBase)
+            .where(ResourceBase.type == bc_type)
+        )
+    ).one()
+    validators = make_validators(latest_at, bc_type, latest_id, count, *parts)
+    validators.last_modified = None
+    return validators
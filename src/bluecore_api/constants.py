@@ -39,6 +39,17 @@ class SearchType(StrEnum):
     ALL = auto()
 
 
+class ContainsField(StrEnum):
+    """Columns a containment search can return."""
+
+    URI = auto()
+    UUID = auto()
+    TYPE = auto()
+    CREATED_AT = auto()
+    UPDATED_AT = auto()
+    DATA = auto()
+
+
 CONTEXT_URL = (
     os.environ.get("BLUECORE_URL", "https://bcld.info/").rstrip("/")
     + "/api/context.jsonld"
@@ -0,0 +1,144 @@
+"""
+Negotiated response compression: gzip, and brotli and zstd when the
+`brotli` and `zstandard` packages are installed (the `compression` extra).
+
+JSON-LD, RDF/XML and CBD XML shrink five to ten times, which matters to
+clients far from the API. `CompressionMiddleware` compresses responses on
+the way out, and the representation cache keeps the compressed variants of
+the bodies it holds so repeated hits don't compress them again.
+
+- COMPRESSION_ENCODINGS: encodings offered, in order of preference when the
+  client rates them equally (default "zstd,br,gzip"; empty disables)
+- COMPRESSION_MIN_BYTES: smaller bodies are sent as they are (default 1024)
+"""
+
+import os
+import zlib
+from typing import Protocol
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = {
+    "application/javascript",
+    "application/n-triples",
+    # binary RDF's strings still shrink about half
+    "application/vnd.bluecore.rdf",
+}
+
+
+class Encoder(Protocol):
+    def encode(self, data: bytes, final: bool) -> bytes:
+        """
+        Compresses `data`, flushed so the client can decode everything sent
+        so far; `final` ends the stream.
+        """
+        ...
+
+
+class GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        flush = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+class BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        body = self._compressor.process(data)
+        if final:
+            return body + self._compressor.finish()
+        return body + self._compressor.flush()
+
+
+class ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        flush = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if final
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+ENCODERS: dict[str, type[Encoder]] = {"gzip": GzipEncoder}
+if brotli is not None:
+    ENCODERS["br"] = BrotliEncoder
+if zstandard is not None:
+    ENCODERS["zstd"] = ZstdEncoder
+
+OFFERED = [
+    encoding.strip()
+    for encoding in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    if encoding.strip() in ENCODERS
+]
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """
+    The offered encoding the client rates highest (RFC 9110 section
+    12.5.3), or None to send the body as it is.
+    """
+    if not accept_encoding or not OFFERED:
+        return None
+    ratings: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ratings[name.strip().lower()] = quality
+    wildcard = ratings.get("*", 0.0)
+    rated = [
+        (ratings.get(encoding, wildcard), -rank, encoding)
+        for rank, encoding in enumerate(OFFERED)
+    ]
+    quality, _, encoding = max(rated)
+    return encoding if quality > 0 else None
+
+
+def compressible(media_type: str | None, size: int | None = None) -> bool:
+    """Whether a `media_type` body of `size` bytes, if known, is worth compressing."""
+    if media_type is None or (size is not None and size < MIN_BYTES):
+        return False
+    media_type = media_type.split(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith(("json", "xml"))
+        or media_type in COMPRESSIBLE_TYPES
+    )
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    return ENCODERS[encoding]().encode(body, final=True)
+
+
+def weak_etag(etag: str) -> str:
+    """A compressed body is no longer byte for byte the one a strong ETag names."""
+    return etag if etag.startswith("W/") else f"W/{etag}"
@@ -0,0 +1,303 @@
+"""
+Executor for CPU-bound rdflib, lxml and XSLT work.
+
+Parsing and serializing large graphs (RDF/XML and CBD responses, MARC to
+BIBFRAME conversion, RDF/XML batch uploads) used to run on the event loop,
+so one large request stalled every other request on the worker. That work
+is now handed to a pool, configured from the environment:
+
+- CPU_POOL_KIND: "process" (default) or "thread"; threads suit tests and
+  small deployments, but still hold the GIL
+- CPU_POOL_WORKERS: workers in the pool (default: the number of cores)
+- CPU_POOL_MAX_QUEUE: tasks waiting or running before new ones are refused
+  with a 503 (default 4 per worker)
+- CPU_TASK_TIMEOUT: seconds a request waits for its task before giving up
+  with a 503 (default 60)
+
+Tasks are plain module-level functions of picklable arguments. A response
+body rendered in the pool is written to a temporary file and sent from there
+in chunks, so it is never held in the API process as a whole. A task whose
+request timed out is cancelled if it hasn't started; one already running in
+another process finishes and keeps its place in the queue until it does.
+If a worker process dies (killed for running out of memory, say), the pool
+is replaced by a new one on the next task, and the requests it broke are
+answered with a 503.
+
+Queue wait and execution times are recorded per task and served by
+GET /internal/cpu so the pool can be sized against real traffic.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import contextmanager, suppress
+from typing import Any, BinaryIO
+
+import anyio
+from fastapi.responses import Response, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (milliseconds) of the queue wait and execution time histograms
+TIME_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 30000)
+
+
+class CpuPoolUnavailable(Exception):
+    """The pool is full or broken, or a task ran past CPU_TASK_TIMEOUT."""
+
+
+class Timings:
+    """Count, mean, max and histogram of a duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(TIME_BUCKETS_MS) + 1)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.histogram[bisect_left(TIME_BUCKETS_MS, seconds * 1000)] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        buckets = [f"<={bound}ms" for bound in TIME_BUCKETS_MS] + [
+            f">{TIME_BUCKETS_MS[-1]}ms"
+        ]
+        return {
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+            "histogram": dict(zip(buckets, self.histogram)),
+        }
+
+
+def _timed(fn: Callable[..., Any], args: tuple) -> tuple[float, float, Any]:
+    """Runs `fn` in a worker, returning when it started, how long it took and its result."""
+    started = time.time()
+    start = time.perf_counter()
+    result = fn(*args)
+    return started, time.perf_counter() - start, result
+
+
+class CpuPool:
+    def __init__(
+        self,
+        kind: str = "process",
+        workers: int | None = None,
+        max_queue: int | None = None,
+        timeout: float = 60,
+    ):
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue or 4 * self.workers
+        self.timeout = timeout
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self.active = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.queue_wait = Timings()
+        self.execution = Timings()
+
+    def _get_executor(self) -> Executor:
+        # created on first use, so importing the app doesn't start processes
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(
+                    self.workers, thread_name_prefix="cpu"
+                )
+            else:
+                # spawn rather than fork a process holding database connections
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._executor
+
+    async def run[T](self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        `fn(*args)` run in the pool. Raises CpuPoolUnavailable when the pool
+        is full or the task doesn't finish within the timeout.
+        """
+        with self._lock:
+            if self.active >= self.max_queue:
+                self.rejected += 1
+                raise CpuPoolUnavailable("The server is busy, try again shortly")
+            self.active += 1
+            self.submitted += 1
+            executor = self._get_executor()
+        submitted = time.time()
+        try:
+            future = executor.submit(_timed, fn, args)
+        except BaseException as error:
+            with self._lock:
+                self.active -= 1
+                self.failed += 1
+            # broken by a dead worker, or shut down
+            if isinstance(error, BrokenExecutor | RuntimeError):
+                self._discard(executor, error)
+                raise CpuPoolUnavailable("The server is busy, try again shortly")
+            raise
+        future.add_done_callback(lambda f: self._done(f, submitted))
+        try:
+            _, _, result = await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout
+            )
+        except TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            logger.error("%s ran past %ss", getattr(fn, "__name__", fn), self.timeout)
+            raise CpuPoolUnavailable("The request took too long, try again later")
+        except BrokenExecutor as error:
+            self._discard(executor, error)
+            raise CpuPoolUnavailable("The server is busy, try again shortly")
+        return result
+
+    def _discard(self, executor: Executor, error: BaseException) -> None:
+        """Drops a broken `executor`, so the next task starts a new one."""
+        with self._lock:
+            if self._executor is not executor:
+                # already replaced by another request
+                return
+            self._executor = None
+            self.restarts += 1
+        logger.error("CPU pool is broken, starting a new one: %r", error)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _done(self, future, submitted: float) -> None:
+        with self._lock:
+            self.active -= 1
+            if future.cancelled():
+                return
+            if future.exception() is not None:
+                self.failed += 1
+                return
+            started, elapsed, _ = future.result()
+            self.completed += 1
+            self.queue_wait.record(max(started - submitted, 0.0))
+            self.execution.record(elapsed)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "timeout": self.timeout,
+                "active": self.active,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "restarts": self.restarts,
+                "queue_wait": self.queue_wait.snapshot(),
+                "execution": self.execution.snapshot(),
+            }
+
+
+@contextmanager
+def spool(destination: str) -> Iterator[BinaryIO]:
+    """
+    Opens the file an OffloadedResponse made for its task's output. The file
+    must still be there, so a task that outlived its request's timeout
+    fails instead of leaving a new file behind.
+    """
+    with open(destination, "r+b") as out:
+        yield out
+
+
+class OffloadedResponse(StreamingResponse):
+    """
+    A response whose body `fn(destination, *args)` writes, in the CPU pool, to
+    the file `destination` (see `spool`). Pass it to `rendered` before
+    returning it, so a full pool or a timeout is still answered with a 503;
+    the body is then sent in chunks of `chunk_size` bytes.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., None],
+        *args: Any,
+        media_type: str,
+        chunk_size: int = 64 * 1024,
+    ):
+        self.task = (fn, args)
+        self.chunk_size = chunk_size
+        self.path: str | None = None
+        super().__init__(self._chunks(), media_type=media_type)
+
+    async def render_task(self) -> None:
+        if self.path is not None:
+            return
+        fn, args = self.task
+        fd, path = tempfile.mkstemp(prefix="bluecore-")
+        os.close(fd)
+        try:
+            await cpu_pool.run(fn, path, *args)
+        except BaseException:
+            os.unlink(path)
+            raise
+        self.path = path
+        self.headers["content-length"] = str(os.path.getsize(path))
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # the body may never have been read: the client left, or the
+            # request was cancelled, before it started
+            self._remove_file()
+
+    def _remove_file(self) -> None:
+        if self.path is not None:
+            with suppress(FileNotFoundError):
+                os.unlink(self.path)
+
+    async def _chunks(self) -> AsyncIterator[bytes]:
+        await self.render_task()
+        assert self.path is not None
+        try:
+            # read in a worker thread, as Starlette's FileResponse does
+            async with await anyio.open_file(self.path, "rb") as body:
+                while chunk := await body.read(self.chunk_size):
+                    yield chunk
+        finally:
+            self._remove_file()
+
+
+async def rendered[R: Response | None](response: R) -> R:
+    """Renders `response`'s body first when it is an OffloadedResponse."""
+    if isinstance(response, OffloadedResponse):
+        await response.render_task()
+    return response
+
+
+cpu_pool = CpuPool(
+    kind=os.getenv("CPU_POOL_KIND", "process"),
+    workers=int(os.getenv("CPU_POOL_WORKERS", "0")) or None,
+    max_queue=int(os.getenv("CPU_POOL_MAX_QUEUE", "0")) or None,
+    timeout=float(os.getenv("CPU_TASK_TIMEOUT", "60")),
+)
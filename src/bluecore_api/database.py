@@ -1,20 +1,146 @@
 import os
 
-from sqlalchemy import create_engine
+from bluecore_models.models.version import CURRENT_USER_ID
+from fastapi import Depends
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from bluecore_api.db_pool import PoolStats, instrumented_pool, pool_options
+from bluecore_api.query_stats import instrument
+from bluecore_api.replica import ReplicaLagMonitor, record_write, wrote_recently
 
 db_url = os.getenv("DATABASE_URL", "")
-engine = create_engine(db_url)
+
+# Statement timeouts for the heavy read routes, in milliseconds (0 disables)
+SEARCH_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_SEARCH_STATEMENT_TIMEOUT_MS", "10000"))
+LIST_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_LIST_STATEMENT_TIMEOUT_MS", "5000"))
+CBD_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_CBD_STATEMENT_TIMEOUT_MS", "15000"))
+
+# SQLSTATE Postgres reports for a statement stopped by statement_timeout or a
+# cancel request
+QUERY_CANCELED = "57014"
+
+engine = create_engine(
+    db_url,
+    poolclass=instrumented_pool(QueuePool, PoolStats("primary")),
+    **pool_options(),
+)
+instrument(engine)
 Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def async_db_url(url: str | URL) -> URL:
+    """
+    DATABASE_URL names a sync driver (psycopg2); point the same database at
+    asyncpg for the async engine.
+    """
+    return make_url(url).set(drivername="postgresql+asyncpg")
+
+
+async_engine = create_async_engine(
+    async_db_url(db_url),
+    poolclass=instrumented_pool(AsyncAdaptedQueuePool, PoolStats("primary-async")),
+    **pool_options(),
+)
+instrument(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
+
+# Optional read replica for GET traffic, see bluecore_api.replica
+replica_db_url = os.getenv("DATABASE_REPLICA_URL")
+ReplicaSessionLocal: async_sessionmaker[AsyncSession] | None = None
+replica_lag: ReplicaLagMonitor | None = None
+if replica_db_url:
+    replica_async_engine = create_async_engine(
+        async_db_url(replica_db_url),
+        poolclass=instrumented_pool(AsyncAdaptedQueuePool, PoolStats("replica-async")),
+        **pool_options(),
+    )
+    instrument(replica_async_engine.sync_engine)
+    ReplicaSessionLocal = async_sessionmaker(
+        bind=replica_async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+    replica_lag = ReplicaLagMonitor(replica_async_engine)
+
+
 def get_db():
+    """
+    Sync session on the primary, used by the write routes. The caller is
+    remembered as a recent writer so their reads skip the replica for a while.
+    """
     db = Session()
     try:
         yield db
     finally:
         db.close()
+        record_write(CURRENT_USER_ID.get())
 
 
 def get_session_maker():
     return Session
+
+
+async def read_session_maker() -> async_sessionmaker[AsyncSession]:
+    """Pick the replica for a read unless the user just wrote or it's lagging."""
+    if ReplicaSessionLocal is None or replica_lag is None:
+        return AsyncSessionLocal
+    if wrote_recently(CURRENT_USER_ID.get()):
+        return AsyncSessionLocal
+    if not await replica_lag.within_limit():
+        return AsyncSessionLocal
+    return ReplicaSessionLocal
+
+
+async def get_async_db():
+    """
+    Async session for read-only routes, so DB round trips don't block the
+    event loop. Reads go to the replica when one is configured. Code that
+    walks lazy relationships (the serializers, change documents) must run
+    through `AsyncSession.run_sync`.
+    """
+    session_maker = await read_session_maker()
+    async with session_maker() as db:
+        yield db
+
+
+def get_async_session_maker():
+    return AsyncSessionLocal
+
+
+async def set_statement_timeout(db: AsyncSession, milliseconds: int) -> None:
+    """Limit each statement in the session's current transaction."""
+    if milliseconds > 0:
+        await db.execute(
+            text("SELECT set_config('statement_timeout', :timeout, true)"),
+            {"timeout": str(milliseconds)},
+        )
+
+
+def async_db_with_timeout(milliseconds: int):
+    """A get_async_db dependency whose statements time out after `milliseconds`."""
+
+    async def dependency(db: AsyncSession = Depends(get_async_db)) -> AsyncSession:
+        await set_statement_timeout(db, milliseconds)
+        return db
+
+    return dependency
+
+
+get_search_db = async_db_with_timeout(SEARCH_STATEMENT_TIMEOUT_MS)
+get_list_db = async_db_with_timeout(LIST_STATEMENT_TIMEOUT_MS)
+
+
+def is_query_canceled(error: DBAPIError) -> bool:
+    # psycopg2 calls the SQLSTATE pgcode, asyncpg calls it sqlstate
+    sqlstate = getattr(error.orig, "pgcode", None) or getattr(
+        error.orig, "sqlstate", None
+    )
+    return sqlstate == QUERY_CANCELED
@@ -0,0 +1,145 @@
+"""
+Connection pool configuration and telemetry.
+
+Pool sizing comes from the environment so it can be tuned per deployment:
+
+- DB_POOL_SIZE: connections kept open (default 5)
+- DB_MAX_OVERFLOW: extra connections allowed under burst (default 10)
+- DB_POOL_TIMEOUT: seconds to wait for a connection before failing (default 30)
+- DB_POOL_RECYCLE: seconds before a connection is replaced, -1 to disable (default 1800)
+- DB_POOL_PRE_PING: "true" to test connections on checkout (default true)
+- DB_POOL_SLOW_CHECKOUT_MS: checkouts waiting longer than this are logged (default 100)
+
+Each engine's pool records how long requests waited for a connection and how
+many gave up, so the pool can be sized against real traffic. The numbers are
+served by GET /internal/pool and slow or failed checkouts are logged.
+"""
+
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (milliseconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+SLOW_CHECKOUT_MS = float(os.getenv("DB_POOL_SLOW_CHECKOUT_MS", "100"))
+
+
+def pool_options() -> dict[str, Any]:
+    """Keyword arguments for create_engine/create_async_engine."""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true") == "true",
+    }
+
+
+_registry: list["PoolStats"] = []
+
+
+class PoolStats:
+    """Checkout counters and wait-time histogram for one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Pool | None = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        _registry.append(self)
+
+    def record_checkout(self, pool: Pool, wait: float) -> None:
+        wait_ms = wait * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.wait_histogram[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+        if wait_ms > SLOW_CHECKOUT_MS:
+            logger.warning(
+                "Slow %s pool checkout: waited %.1f ms (%s)",
+                self.name,
+                wait_ms,
+                pool.status(),
+            )
+
+    def record_timeout(self, pool: Pool) -> None:
+        with self._lock:
+            self.timeouts += 1
+        logger.error(
+            "Timed out waiting for a %s connection (%s)", self.name, pool.status()
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            buckets = [f"<={bound}ms" for bound in WAIT_BUCKETS_MS] + [
+                f">{WAIT_BUCKETS_MS[-1]}ms"
+            ]
+            stats: dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "mean_wait_ms": (
+                    self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0
+                ),
+                "max_wait_ms": self.max_wait * 1000,
+                "wait_histogram": dict(zip(buckets, self.wait_histogram)),
+            }
+        pool = self.pool
+        if isinstance(pool, QueuePool):
+            stats |= {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+            }
+        return stats
+
+
+class _InstrumentedPoolMixin:
+    """Times each wait for a pooled connection."""
+
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats.pool = self  # type: ignore[assignment]
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.stats.record_timeout(self)  # type: ignore[arg-type]
+            raise
+        wait = time.perf_counter() - start
+        self.stats.record_checkout(self, wait)  # type: ignore[arg-type]
+        return connection
+
+
+def instrumented_pool(base: type[QueuePool], stats: PoolStats) -> type[QueuePool]:
+    """
+    A pool class reporting to `stats`. The stats live on the class so they
+    survive the pool being recreated by engine.dispose().
+    """
+    return type(
+        f"Instrumented{base.__name__}",
+        (_InstrumentedPoolMixin, base),
+        {"stats": stats},
+    )
+
+
+def all_pool_stats() -> dict[str, dict[str, Any]]:
+    return {stats.name: stats.snapshot() for stats in _registry}
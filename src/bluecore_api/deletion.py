@@ -0,0 +1,150 @@
+"""
+Set-based cascade deletes for Hubs, Works, Instances and Other Resources.
+
+Rather than loading the object graph and deleting row by row, each delete
+runs a fixed handful of `DELETE ... WHERE ... IN (subquery)` statements in the
+caller's transaction, so time and memory don't grow with the size of the
+hierarchy. Every delete function returns the affected-row count per table;
+`hub_uuids` and `work_uuids` list what a cascade will take with it, so the
+caller can drop those resources from the caches once it has committed.
+"""
+
+import logging
+
+from bluecore_models.models import (
+    BibframeOtherResources,
+    Hub,
+    Instance,
+    OtherResource,
+    ResourceBase,
+    ResourceBibframeClass,
+    Version,
+    Work,
+)
+from sqlalchemy import ColumnElement, delete, select, union_all
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# (mapped class, rows of that class to delete), ordered leaves first
+type Level = tuple[type[ResourceBase], ColumnElement[bool]]
+
+
+def _delete_levels(
+    db: Session, levels: list[Level], extra_links: ColumnElement[bool] | None = None
+) -> dict[str, int]:
+    resource_ids = union_all(
+        *(select(model.__table__.c.id).where(where) for model, where in levels)
+    )
+    links = BibframeOtherResources.__table__.c.bibframe_resource_id.in_(resource_ids)
+    if extra_links is not None:
+        links = links | extra_links
+
+    # Rows hanging off resource_base go first, while the subqueries that
+    # identify the hierarchy still see it.
+    counts = {
+        "versions": db.execute(
+            delete(Version.__table__).where(
+                Version.__table__.c.resource_id.in_(resource_ids)
+            )
+        ).rowcount,
+        "resource_bibframe_classes": db.execute(
+            delete(ResourceBibframeClass.__table__).where(
+                ResourceBibframeClass.__table__.c.resource_id.in_(resource_ids)
+            )
+        ).rowcount,
+        "bibframe_other_resources": db.execute(
+            delete(BibframeOtherResources.__table__).where(links)
+        ).rowcount,
+    }
+
+    # Subclass tables leaves first (instances before the works they point
+    # to), collecting ids for the shared resource_base rows.
+    base_table = ResourceBase.__table__
+    base_ids: list[int] = []
+    for model, where in levels:
+        table = model.__table__
+        deleted = (
+            db.execute(delete(table).where(where).returning(table.c.id)).scalars().all()
+        )
+        counts[table.name] = len(deleted)
+        if issubclass(model, ResourceBase) and table is not base_table:
+            base_ids.extend(deleted)
+    if base_ids:
+        counts[base_table.name] = db.execute(
+            delete(base_table).where(base_table.c.id.in_(base_ids))
+        ).rowcount
+    return counts
+
+
+def _uuids(db: Session, levels: list[Level]) -> list[str]:
+    resource_ids = union_all(
+        *(select(model.__table__.c.id).where(where) for model, where in levels)
+    )
+    base_table = ResourceBase.__table__
+    return [
+        str(uuid)
+        for uuid in db.scalars(
+            select(base_table.c.uuid).where(base_table.c.id.in_(resource_ids))
+        )
+    ]
+
+
+def _hub_levels(hub_id: int) -> list[Level]:
+    work_ids = select(Work.__table__.c.id).where(Work.__table__.c.hub_id == hub_id)
+    return [
+        (Instance, Instance.__table__.c.work_id.in_(work_ids)),
+        (Work, Work.__table__.c.hub_id == hub_id),
+        (Hub, Hub.__table__.c.id == hub_id),
+    ]
+
+
+def _work_levels(work_id: int) -> list[Level]:
+    return [
+        (Instance, Instance.__table__.c.work_id == work_id),
+        (Work, Work.__table__.c.id == work_id),
+    ]
+
+
+def delete_hub(db: Session, hub_id: int) -> dict[str, int]:
+    """A Hub, its Works and their Instances."""
+    return _delete_levels(db, _hub_levels(hub_id))
+
+
+def hub_uuids(db: Session, hub_id: int) -> list[str]:
+    """The uuids `delete_hub` deletes: the Hub's, its Works' and their Instances'."""
+    return _uuids(db, _hub_levels(hub_id))
+
+
+def delete_work(db: Session, work_id: int) -> dict[str, int]:
+    """A Work and its Instances."""
+    return _delete_levels(db, _work_levels(work_id))
+
+
+def work_uuids(db: Session, work_id: int) -> list[str]:
+    """The uuids `delete_work` deletes: the Work's and its Instances'."""
+    return _uuids(db, _work_levels(work_id))
+
+
+def delete_instance(db: Session, instance_id: int) -> dict[str, int]:
+    return _delete_levels(db, [(Instance, Instance.__table__.c.id == instance_id)])
+
+
+def delete_other_resource(db: Session, other_resource_id: int) -> dict[str, int]:
+    """An Other Resource, including the links to it from other resources."""
+    return _delete_levels(
+        db,
+        [(OtherResource, OtherResource.__table__.c.id == other_resource_id)],
+        extra_links=(
+            BibframeOtherResources.__table__.c.other_resource_id == other_resource_id
+        ),
+    )
+
+
+def log_counts(kind: str, key: str, counts: dict[str, int]) -> None:
+    logger.info(
+        "Deleted %s %s: %s",
+        kind,
+        key,
+        ", ".join(f"{table}={count}" for table, count in counts.items()),
+    )
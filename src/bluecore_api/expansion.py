@@ -1,18 +1,26 @@
-import json
+from collections.abc import Iterable
+from typing import Any
 
-from bluecore_models.models import Instance, Work
-from bluecore_models.utils.graph import load_jsonld
+from bluecore_models.models import Hub, Instance, Work
+from bluecore_models.utils.graph import CONTEXT
 from rdflib import Graph
 
+from bluecore_api.other_resource_cache import OtherResourceData, other_resource_cache
 
-def expand_resource_graph(db_resource: Instance | Work) -> list:
+
+def expand_resource_graph(db_resource: Hub | Instance | Work) -> dict:
     """
-    Takes a Bluecore Work or Instance and iterates through the entity's
-    other resources and adds the other resource RDF to the entity's graph.
+    Takes a Bluecore Work or Instance and combines the entity's JSON-LD with
+    the JSON-LD of its other resources, framed the way the entity's own data
+    is stored. The node lists are joined as they are, without a round trip
+    through an rdflib Graph.
     """
-    expanded_graph = load_jsonld(db_resource.data)
-    expanded_graph = expand_resource_as_graph(db_resource, expanded_graph)
-    return json.loads(expanded_graph.serialize(format="json-ld"))
+    nodes = jsonld_nodes(db_resource.data)
+    for row in db_resource.other_resources:
+        nodes.extend(jsonld_nodes(row.other_resource.data))
+    # The models frame node lists around the resource's URI when data is set.
+    # A transient copy does that without changing the loaded resource.
+    return type(db_resource)(uri=db_resource.uri, data=nodes).data
 
 
 def expand_resource_as_graph(db_resource: Instance | Work, graph: Graph) -> Graph:
@@ -20,9 +28,31 @@ def expand_resource_as_graph(db_resource: Instance | Work, graph: Graph) -> Grap
     Takes a Bluecore Work or Instance and iterates through the entity's
     other resources and adds the other resource RDF to the input graph.
     """
-    for row in db_resource.other_resources:
-        other_resource_graph = load_jsonld(row.other_resource.data)
-        graph.parse(
-            data=other_resource_graph.serialize(format="json-ld"), format="json-ld"
-        )
+    return add_other_resources(graph, other_resources_of(db_resource))
+
+
+def other_resources_of(db_resource: Hub | Instance | Work) -> list[OtherResourceData]:
+    """The entity's other resources, detached so they can go to the CPU pool."""
+    return [
+        OtherResourceData.of(row.other_resource) for row in db_resource.other_resources
+    ]
+
+
+def add_other_resources(graph: Graph, others: Iterable[OtherResourceData]) -> Graph:
+    """Adds the RDF of `others` to the input graph."""
+    for other in others:
+        other_resource_cache.add_to(graph, other)
     return graph
+
+
+def jsonld_nodes(data: Any) -> list[dict]:
+    """
+    The top-level nodes of a stored JSON-LD document, each carrying CONTEXT
+    as `load_jsonld` reads them, so they can be joined with other documents'.
+    """
+    if isinstance(data, dict):
+        if set(data) <= {"@context", "@graph"}:
+            data = data.get("@graph", [])
+        else:
+            data = [data]
+    return [{**node, "@context": CONTEXT} for node in data if isinstance(node, dict)]
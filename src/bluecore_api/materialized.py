@@ -0,0 +1,289 @@
+"""
+Expanded JSON-LD materialized when resources are written.
+
+`?expand=true` JSON-LD merges a resource's other resources into its own data
+and frames the result, on every request. With MATERIALIZE_EXPANSIONS=true
+that document is stored in `resource_expansions`, by a background task run
+once the response is sent, whenever a Work, Instance or Hub is written or one
+of the other resources it links to changes. An expanded GET then reads a
+single row.
+
+Each row records what it was built from: the resource's updated_at, the ids
+of the other resources it links to and their latest updated_at. Reads only
+accept a row that still matches, checked in the statement that fetches it,
+so a write made outside the API (a batch load, say) means expanding on the
+fly rather than serving a stale document.
+
+The table's migration belongs in bluecore-models (see the README). `rebuild`
+backfills it and `check` compares it with expanding on the fly.
+"""
+
+import logging
+import os
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from bluecore_models.models import (
+    BibframeOtherResources,
+    Hub,
+    Instance,
+    ResourceBase,
+    Work,
+)
+from bluecore_models.utils.graph import CONTEXT
+from rdflib.compare import isomorphic
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    ScalarSelect,
+    Table,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from bluecore_api.app.utils.serialize.graph import load_graph
+from bluecore_api.app.utils.serialize.loading import EXPANDED_JSONLD_FORMATS
+from bluecore_api.constants import BluecoreType
+from bluecore_api.expansion import expand_resource_graph
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("MATERIALIZE_EXPANSIONS", "false").lower() == "true"
+
+MATERIALIZED_TYPES = [BluecoreType.HUBS, BluecoreType.WORKS, BluecoreType.INSTANCES]
+
+resource_expansions = Table(
+    "resource_expansions",
+    ResourceBase.metadata,
+    Column(
+        "resource_id",
+        Integer,
+        ForeignKey("resource_base.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("data", JSONB, nullable=False),
+    Column("resource_updated_at", ResourceBase.__table__.c.updated_at.type),
+    Column("link_ids", ARRAY(Integer)),
+    Column("links_updated_at", ResourceBase.__table__.c.updated_at.type),
+    Column(
+        "built_at", DateTime(timezone=True), nullable=False, server_default=func.now()
+    ),
+)
+
+_links = BibframeOtherResources.__table__.c
+_linked = ResourceBase.__table__.alias("linked")
+
+
+def _link_ids(resource_id: Any) -> ScalarSelect:
+    return (
+        select(
+            func.array_agg(
+                aggregate_order_by(_links.other_resource_id, _links.other_resource_id)
+            )
+        )
+        .where(_links.bibframe_resource_id == resource_id)
+        .scalar_subquery()
+    )
+
+
+def _links_updated_at(resource_id: Any) -> ScalarSelect:
+    return (
+        select(func.max(_linked.c.updated_at))
+        .where(
+            _linked.c.id.in_(
+                select(_links.other_resource_id).where(
+                    _links.bibframe_resource_id == resource_id
+                )
+            )
+        )
+        .scalar_subquery()
+    )
+
+
+async def read(
+    db: AsyncSession,
+    model: type[Hub | Instance | Work],
+    uuid: str,
+    representation: str | None,
+    expand: bool,
+) -> dict | None:
+    """
+    The materialized expansion of `model` `uuid`, when `representation` is
+    rendered from one and it is up to date.
+    """
+    if not (ENABLED and expand and representation in EXPANDED_JSONLD_FORMATS):
+        return None
+    return await db.scalar(
+        select(resource_expansions.c.data)
+        .join(model, model.id == resource_expansions.c.resource_id)
+        .where(model.uuid == uuid, *_current(model))
+    )
+
+
+async def read_many(
+    db: AsyncSession,
+    resource_ids: Sequence[int],
+    representation: str | None,
+    expand: bool,
+) -> dict[int, dict]:
+    """`read` for several resources, by id; out of date ones are left out."""
+    if not (
+        ENABLED
+        and expand
+        and representation in EXPANDED_JSONLD_FORMATS
+        and resource_ids
+    ):
+        return {}
+    expansion = resource_expansions.c
+    rows = await db.execute(
+        select(expansion.resource_id, expansion.data)
+        .join(ResourceBase, ResourceBase.id == expansion.resource_id)
+        .where(expansion.resource_id.in_(resource_ids), *_current(ResourceBase))
+    )
+    return {resource_id: data for resource_id, data in rows}
+
+
+def _current(model: type[ResourceBase]) -> list:
+    """Conditions under which a row is still the expansion of `model`'s row."""
+    expansion = resource_expansions.c
+    return [
+        expansion.resource_updated_at.is_not_distinct_from(model.updated_at),
+        expansion.link_ids.is_not_distinct_from(_link_ids(expansion.resource_id)),
+        expansion.links_updated_at.is_not_distinct_from(
+            _links_updated_at(expansion.resource_id)
+        ),
+    ]
+
+
+def _values(resource: ResourceBase) -> dict[str, Any]:
+    others = [link.other_resource for link in resource.other_resources]
+    return {
+        "data": expand_resource_graph(resource),
+        "resource_updated_at": resource.updated_at,
+        "link_ids": sorted(other.id for other in others) or None,
+        "links_updated_at": max(
+            (other.updated_at for other in others if other.updated_at is not None),
+            default=None,
+        ),
+    }
+
+
+def refresh(db: Session, resource: ResourceBase | None) -> None:
+    """
+    Builds `resource`'s expansion and commits it. Call it once the resource
+    is saved, before the response adds its @context to the resource's data.
+    """
+    if not ENABLED or resource is None:
+        return
+    values = _values(resource)
+    db.execute(
+        insert(resource_expansions)
+        .values(resource_id=resource.id, **values)
+        .on_conflict_do_update(
+            index_elements=[resource_expansions.c.resource_id],
+            set_={**values, "built_at": func.now()},
+        )
+    )
+    db.commit()
+
+
+def linked_resource_ids(db: Session, other_resource_id: int) -> list[int]:
+    """The resources whose expansions include other resource `other_resource_id`."""
+    if not ENABLED:
+        return []
+    return list(
+        db.scalars(
+            select(_links.bibframe_resource_id)
+            .where(_links.other_resource_id == other_resource_id)
+            .distinct()
+        )
+    )
+
+
+def refresh_resources(
+    session_maker: Callable[[], Session], resource_ids: Sequence[int]
+) -> None:
+    """Rebuilds the expansions of `resource_ids`; run as a background task."""
+    if not ENABLED or not resource_ids:
+        return
+    with session_maker() as db:
+        resources = db.scalars(
+            select(ResourceBase).where(
+                ResourceBase.id.in_(resource_ids),
+                ResourceBase.type.in_(MATERIALIZED_TYPES),
+            )
+        ).all()
+        for resource in resources:
+            refresh(db, resource)
+    logger.info("Rebuilt %d expansions", len(resources))
+
+
+def _page(db: Session, after: int, limit: int) -> list[ResourceBase]:
+    return list(
+        db.scalars(
+            select(ResourceBase)
+            .where(ResourceBase.id > after, ResourceBase.type.in_(MATERIALIZED_TYPES))
+            .order_by(ResourceBase.id)
+            .limit(limit)
+        )
+    )
+
+
+def rebuild(db: Session, after: int = 0, limit: int = 100) -> dict[str, Any]:
+    """
+    Builds the expansions of the next `limit` resources after id `after`.
+    Call it again with the returned `next` until that is None.
+    """
+    page = _page(db, after, limit)
+    # each refresh commits, which expires the page
+    next_after = page[-1].id if len(page) == limit else None
+    for resource in page:
+        refresh(db, resource)
+    return {"rebuilt": len(page), "next": next_after}
+
+
+def check(db: Session, after: int = 0, limit: int = 100) -> dict[str, Any]:
+    """
+    Compares the materialized expansions of the next `limit` resources after
+    id `after` with expanding them on the fly. Rows that are out of date are
+    reported as stale; current rows whose graph differs as mismatched.
+    """
+    page = _page(db, after, limit)
+    rows = {
+        row.resource_id: row
+        for row in db.execute(
+            select(resource_expansions).where(
+                resource_expansions.c.resource_id.in_([r.id for r in page])
+            )
+        )
+    }
+    missing, stale, mismatched = [], [], []
+    for resource in page:
+        row = rows.get(resource.id)
+        if row is None:
+            missing.append(resource.id)
+            continue
+        expected = _values(resource)
+        if any(
+            getattr(row, name) != expected[name]
+            for name in ("resource_updated_at", "link_ids", "links_updated_at")
+        ):
+            stale.append(resource.id)
+        elif not isomorphic(_graph(row.data), _graph(expected["data"])):
+            mismatched.append(resource.id)
+    return {
+        "checked": len(page),
+        "missing": missing,
+        "stale": stale,
+        "mismatched": mismatched,
+        "next": page[-1].id if len(page) == limit else None,
+    }
+
+
+def _graph(data: dict):
+    return load_graph({**data, "@context": CONTEXT})
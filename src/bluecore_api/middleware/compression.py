@@ -0,0 +1,103 @@
+from starlette.datastructures import Headers, MutableHeaders
+
+from bluecore_api.content_encoding import (
+    ENCODERS,
+    MIN_BYTES,
+    compressible,
+    negotiate,
+    weak_etag,
+)
+
+
+class CompressionMiddleware:
+    """
+    Compresses text, JSON and XML responses with the encoding negotiated from
+    Accept-Encoding. Bodies are held back until MIN_BYTES have arrived, so a
+    small response goes out as it is; a streamed one is compressed chunk by
+    chunk, each flushed so the client can decode it straight away. Responses
+    that already carry a Content-Encoding, such as cached compressed
+    variants, pass through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding"))
+        if_none_match = request_headers.get("if-none-match", "")
+        start: dict | None = None
+        buffer: list[bytes] = []
+        buffered = 0
+        encoder = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, buffered, encoder, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if message["status"] == 304 and "etag" in headers:
+                    # validating a compressed variant: answer with its weak ETag
+                    weak = weak_etag(headers["etag"])
+                    if weak in if_none_match:
+                        headers["ETag"] = weak
+                if not compressible(headers.get("content-type")):
+                    passthrough = True
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                if "content-encoding" in headers and "etag" in headers:
+                    headers["ETag"] = weak_etag(headers["etag"])
+                if (
+                    encoding is None
+                    or message["status"] != 200
+                    or "content-encoding" in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                buffer.append(body)
+                buffered += len(body)
+                if more_body and buffered < MIN_BYTES:
+                    return
+                body = b"".join(buffer)
+                buffer.clear()
+                assert start is not None
+                if buffered < MIN_BYTES:
+                    # the whole body, and too small to be worth it
+                    await send(start)
+                    await send({**message, "body": body})
+                    return
+                encoder = ENCODERS[encoding]()
+                headers = MutableHeaders(scope=start)
+                headers["Content-Encoding"] = encoding
+                if "etag" in headers:
+                    headers["ETag"] = weak_etag(headers["etag"])
+                if more_body:
+                    del headers["content-length"]
+                    await send(start)
+                    await send({**message, "body": encoder.encode(body, final=False)})
+                    return
+                compressed = encoder.encode(body, final=True)
+                headers["Content-Length"] = str(len(compressed))
+                await send(start)
+                await send({**message, "body": compressed})
+                return
+
+            await send({**message, "body": encoder.encode(body, final=not more_body)})
+
+        await self.app(scope, receive, send_compressed)
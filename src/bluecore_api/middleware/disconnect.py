@@ -0,0 +1,62 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+CANCELLABLE_METHODS = {"GET", "HEAD"}
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    Stops a read when its client goes away, instead of letting it finish a
+    response nobody will receive. Cancelling the handler task cancels the
+    query it is awaiting: asyncpg sends Postgres a cancel request for it and
+    the connection goes back to the pool. Writes always run to completion.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in CANCELLABLE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue = asyncio.Queue()
+        finished = False
+        disconnected = False
+
+        async def send_wrapper(message):
+            nonlocal finished
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                finished = True
+
+        handler = asyncio.ensure_future(self.app(scope, messages.get, send_wrapper))
+
+        async def watch_for_disconnect():
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    # once the response is out, background tasks may still run
+                    if not finished:
+                        disconnected = True
+                        handler.cancel()
+                    return
+
+        watcher = asyncio.ensure_future(watch_for_disconnect())
+        try:
+            await handler
+        except asyncio.CancelledError:
+            if not disconnected:
+                handler.cancel()
+                raise
+            logger.info(
+                "Client disconnected, cancelled %s %s", scope["method"], scope["path"]
+            )
+        finally:
+            watcher.cancel()
@@ -74,6 +74,9 @@ class BypassKeycloakForGet:
         }
     )
 
+    """POST paths that only read, as public as the GETs they batch"""
+    READ_POST_PATHS = _with_api_root({"/resources/batch-get"})
+
     def __init__(self, app, keycloak_middleware):
         self.inner_app = app
         self.keycloak_middleware = keycloak_middleware
@@ -83,12 +86,16 @@ class BypassKeycloakForGet:
         path = scope["path"]
 
         if (
-            method == "GET"
-            and (
-                path in self.EXACT_PATHS
-                or any(path.startswith(prefix) for prefix in self.PREFIX_PATHS)
+            (
+                method == "GET"
+                and (
+                    path in self.EXACT_PATHS
+                    or any(path.startswith(prefix) for prefix in self.PREFIX_PATHS)
+                )
             )
-        ) or method == "OPTIONS":
+            or (method == "POST" and path in self.READ_POST_PATHS)
+            or method == "OPTIONS"
+        ):
             await self.inner_app(scope, receive, send)
         else:
             await self.keycloak_middleware(scope, receive, send)
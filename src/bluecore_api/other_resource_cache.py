@@ -0,0 +1,98 @@
+"""
+In-process LRU cache of parsed OtherResource graphs.
+
+The same vocabulary terms (media, carrier and issuance types, languages,
+common subjects) are linked from thousands of Works and Instances, and every
+expansion, CBD and HTML label lookup used to parse them again with
+`load_jsonld`. Their triples are cached under the OtherResource's id and
+updated_at, so an edit made outside the API never matches an old entry;
+`update_other_resource` and `delete_other_resource` also drop them straight
+away, in every worker when CACHE_URL is set (see bluecore_api.shared_cache).
+
+The cached triples are shared between requests and never mutated: callers
+add them to a graph of their own.
+
+OTHER_RESOURCE_CACHE_MAX_BYTES (default 32 MiB, 0 disables) bounds the
+approximate size of the cached triples.
+"""
+
+import os
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from bluecore_models.models import OtherResource
+from rdflib import Graph
+from rdflib.term import Node
+
+from bluecore_api.app.utils.serialize.graph import rdf_triples
+from bluecore_api.shared_cache import invalidations, shared_io
+from bluecore_api.sized_lru import SizedLRU
+
+MAX_BYTES = int(os.getenv("OTHER_RESOURCE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+NAMESPACE = "other_resources"
+
+# rough per-triple cost of the tuple and term objects, on top of their text
+TRIPLE_OVERHEAD = 200
+
+type Key = tuple[int, datetime | None]
+type Triples = tuple[tuple[Node, Node, Node], ...]
+
+
+class OtherResourceData(NamedTuple):
+    """
+    The parts of an OtherResource the cache reads, detached from its session
+    so they can be sent to the CPU pool (see bluecore_api.cpu_pool).
+    """
+
+    id: int | None
+    updated_at: datetime | None
+    data: Any
+
+    @classmethod
+    def of(cls, other: OtherResource) -> "OtherResourceData":
+        return cls(other.id, other.updated_at, other.data)
+
+
+class OtherResourceCache:
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self._triples: SizedLRU[Key, Triples] = SizedLRU(max_bytes)
+
+    def triples(self, other: OtherResource | OtherResourceData) -> Triples:
+        """The triples `load_jsonld` reads from `other`'s data."""
+        if not self._triples.enabled or other.id is None:
+            return tuple(rdf_triples(other.data))
+        key = (other.id, other.updated_at)
+        triples = self._triples.get(key)
+        if triples is None:
+            triples = tuple(rdf_triples(other.data))
+            self._triples.put(key, triples, _size(triples))
+        return triples
+
+    def add_to(self, graph: Graph, other: OtherResource | OtherResourceData) -> Graph:
+        """Adds `other`'s triples to `graph`."""
+        graph.addN((s, p, o, graph) for s, p, o in self.triples(other))
+        return graph
+
+    async def invalidate(self, other_resource_id: int) -> None:
+        """Drop `other_resource_id`'s triples, in every worker."""
+        self._triples.invalidate(other_resource_id)
+        await shared_io(invalidations.publish, NAMESPACE, other_resource_id)
+
+    def _invalidated(self, other_resource_id: str) -> None:
+        self._triples.invalidate(int(other_resource_id))
+
+    def clear(self) -> None:
+        """Empty the cache and reset its counters."""
+        self._triples.clear()
+
+    def snapshot(self) -> dict[str, int | float]:
+        return self._triples.snapshot()
+
+
+def _size(triples: Triples) -> int:
+    return sum(len(s) + len(p) + len(o) + TRIPLE_OVERHEAD for s, p, o in triples)
+
+
+other_resource_cache = OtherResourceCache()
+invalidations.subscribe(NAMESPACE, other_resource_cache._invalidated)
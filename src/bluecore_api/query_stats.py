@@ -0,0 +1,95 @@
+"""
+Per-request SQL instrumentation.
+
+`instrument` hooks an engine's cursor events so every statement is timed and
+attributed to the request in progress. `QueryStatsMiddleware` starts a fresh
+tally for each HTTP request and writes the statement count, total database
+time and slowest statement to the log when the request finishes.
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+# statements are trimmed to this many characters in the request log
+STATEMENT_LOG_LENGTH = 200
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str = ""
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # a failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start"):
+        connection.info["query_start"].pop()
+
+
+def instrument(engine: Engine) -> None:
+    """Time the statements `engine` runs. Use `async_engine.sync_engine` for async."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """Logs the SQL each HTTP request issued once it has been answered."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_query_stats.reset(token)
+            if stats.count:
+                logger.info(
+                    "%s %s: %d queries, %.1f ms in database, slowest %.1f ms: %s",
+                    scope["method"],
+                    scope["path"],
+                    stats.count,
+                    stats.total_time * 1000,
+                    stats.slowest_time * 1000,
+                    " ".join(stats.slowest_statement.split())[:STATEMENT_LOG_LENGTH],
+                )
@@ -0,0 +1,93 @@
+"""
+Routing rules for the optional read replica (DATABASE_REPLICA_URL).
+
+Read-only routes query the replica unless:
+
+- the calling user wrote through the API within the last
+  REPLICA_READ_YOUR_WRITES_SECONDS (default 5), so they see their own change, or
+- the replica is more than REPLICA_MAX_LAG_SECONDS (default 2) behind the
+  primary. Lag is checked at most every REPLICA_LAG_CHECK_INTERVAL seconds
+  (default 5).
+
+In both cases the read goes to the primary instead.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES_SECONDS = float(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "5"))
+MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "2"))
+LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", "5"))
+
+# Zero when the replica has replayed everything it received, so an idle
+# primary doesn't look like lag.
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+ANONYMOUS = "anonymous"
+
+_recent_writes: dict[str, float] = {}
+
+
+def record_write(uid: str | None) -> None:
+    """Remember that `uid` just wrote, so their next reads use the primary."""
+    if not uid or uid == ANONYMOUS:
+        return
+    now = time.monotonic()
+    _recent_writes[uid] = now + READ_YOUR_WRITES_SECONDS
+    # prune expired entries so the map stays the size of the active editors
+    for key in [k for k, expires in _recent_writes.items() if expires < now]:
+        del _recent_writes[key]
+
+
+def wrote_recently(uid: str | None) -> bool:
+    if not uid or uid == ANONYMOUS:
+        return False
+    return _recent_writes.get(uid, 0) > time.monotonic()
+
+
+class ReplicaLagMonitor:
+    """Caches the replica's replication lag between checks."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.lag: float | None = None
+        self.checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def within_limit(self) -> bool:
+        if time.monotonic() - self.checked_at > LAG_CHECK_INTERVAL:
+            async with self._lock:
+                if time.monotonic() - self.checked_at > LAG_CHECK_INTERVAL:
+                    await self._check()
+        return self.lag is not None and self.lag <= MAX_LAG_SECONDS
+
+    async def _check(self) -> None:
+        try:
+            async with self.engine.connect() as connection:
+                lag = await connection.scalar(LAG_QUERY)
+            self.lag = float(lag or 0)
+        except Exception:
+            logger.exception("Replica lag check failed, reading from the primary")
+            self.lag = None
+        self.checked_at = time.monotonic()
+        if self.lag is not None and self.lag > MAX_LAG_SECONDS:
+            logger.warning(
+                "Replica is %.1fs behind the primary, reading from the primary",
+                self.lag,
+            )
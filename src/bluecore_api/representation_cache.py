@@ -0,0 +1,186 @@
+"""
+Cache of rendered resource representations.
+
+Rendering JSON-LD, N-Triples, RDF/XML or Turtle means parsing the stored
+JSON-LD with rdflib and serializing it again. Bodies are cached under the
+resource's uuid and updated_at, the representation, the expansion asked for
+and, for expanded bodies, the ids and updated_at of the linked other
+resources. A changed resource
+therefore never matches an old entry, even when it was written outside the
+API. PUT and DELETE also drop a resource's entries straight away so they
+don't sit in the budget until they are evicted. Streamed bodies are stored
+once they have been sent in full.
+
+Compressed variants (see bluecore_api.content_encoding) are stored next to
+a body the first time a client asks for one, under the body's key plus the
+encoding, and count against the same budget.
+
+Entries are kept in process, or shared by every worker through CACHE_URL
+(see bluecore_api.shared_cache), which also tells the other workers when a
+resource's entries are invalidated. `get`, `put` and `invalidate` are
+coroutines so that, with the shared backend, the event loop never waits on
+the server.
+
+REPRESENTATION_CACHE_MAX_BYTES (default 64 MiB, 0 disables) bounds the total
+size of the cached bodies in process, and of each body in the shared cache.
+"""
+
+import os
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from bluecore_models.models import ResourceBase
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+from bluecore_api.app.utils.serialize.loading import GRAPH_FORMATS
+from bluecore_api.content_encoding import compress, compressible
+from bluecore_api.selective_expansion import Expansion
+from bluecore_api.shared_cache import TTL, cache_backend, invalidations, shared_io
+from bluecore_api.sized_lru import SizedLRU
+
+MAX_BYTES = int(os.getenv("REPRESENTATION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+NAMESPACE = "representations"
+
+type Key = tuple[str, datetime | None, str, str, tuple]
+# a Key and the encoding of a compressed variant
+type VariantKey = tuple[str, datetime | None, str, str, tuple, str]
+
+
+@dataclass
+class CachedBody:
+    body: bytes
+    media_type: str | None
+
+
+def _encode(cached: CachedBody) -> bytes:
+    return (cached.media_type or "").encode() + b"\n" + cached.body
+
+
+def _decode(data: bytes) -> CachedBody:
+    media_type, _, body = data.partition(b"\n")
+    return CachedBody(body, media_type.decode() or None)
+
+
+class RepresentationCache:
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self._bodies = cache_backend(NAMESPACE, max_bytes, _encode, _decode)
+        self._shared = not isinstance(self._bodies, SizedLRU)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._bodies.max_bytes
+
+    def key(
+        self,
+        doc: ResourceBase,
+        representation: str | None,
+        expansion: Expansion | None,
+    ) -> Key | None:
+        """
+        The cache key for rendering `doc` as `representation` with `expansion`,
+        or None when that representation isn't cached. HTML and CBD draw on
+        other Works and Instances, so only the resource's own graph formats
+        are cached. The expansion is part of the key even when it selects no
+        links, as expanded JSON-LD is rendered rather than stored.
+        """
+        if not self._bodies.enabled or representation not in GRAPH_FORMATS:
+            return None
+        links: tuple = ()
+        if expansion is not None:
+            # loaded already: expansion needs them (see serialize.loading)
+            links = tuple(
+                sorted(
+                    (link.other_resource.id, link.other_resource.updated_at)
+                    for link in doc.other_resources
+                )
+            )
+        return (str(doc.uuid), doc.updated_at, representation, str(expansion), links)
+
+    async def get(
+        self, key: Key | None, encoding: str | None = None
+    ) -> Response | None:
+        """
+        The cached body for `key`, compressed with `encoding` when that is
+        worth it. Only the body's own lookup counts as a hit or miss.
+        """
+        if key is None:
+            return None
+        return await shared_io(self._get, key, encoding)
+
+    def _get(self, key: Key, encoding: str | None) -> Response | None:
+        cached = self._bodies.get(key)
+        if cached is None:
+            return None
+        if encoding is None or not compressible(cached.media_type, len(cached.body)):
+            return Response(content=cached.body, media_type=cached.media_type)
+        variant_key: VariantKey = (*key, encoding)
+        variant = self._bodies.get(variant_key, count=False)
+        if variant is None:
+            variant = CachedBody(compress(cached.body, encoding), cached.media_type)
+            self._bodies.put(variant_key, variant, len(variant.body), TTL)
+        return Response(
+            content=variant.body,
+            media_type=variant.media_type,
+            headers={"Content-Encoding": encoding},
+        )
+
+    async def put(self, key: Key | None, response: Response) -> None:
+        if key is None:
+            return
+        if isinstance(response, StreamingResponse):
+            response.body_iterator = self._tee(
+                key, response.body_iterator, response.media_type, response.charset
+            )
+            return
+        await shared_io(self._store, key, bytes(response.body), response.media_type)
+
+    async def _tee(
+        self,
+        key: Key,
+        body: AsyncIterator[bytes | str | memoryview],
+        media_type: str | None,
+        charset: str,
+    ) -> AsyncIterator[bytes | str | memoryview]:
+        """Passes the body on, storing it if it is sent in full and fits."""
+        chunks: list[bytes] | None = []
+        size = 0
+        async for chunk in body:
+            yield chunk
+            if chunks is None:
+                continue
+            data = chunk.encode(charset) if isinstance(chunk, str) else chunk
+            size += len(data)
+            if size > self.max_bytes:
+                chunks = None
+            else:
+                chunks.append(bytes(data))
+        if chunks is not None:
+            await shared_io(self._store, key, b"".join(chunks), media_type)
+
+    def _store(self, key: Key, body: bytes, media_type: str | None) -> None:
+        self._bodies.put(key, CachedBody(body, media_type), len(body), TTL)
+
+    async def invalidate(self, uuid: Any) -> None:
+        """Drop every representation of the resource `uuid`, in every worker."""
+        await shared_io(self._bodies.invalidate, str(uuid))
+        await shared_io(invalidations.publish, NAMESPACE, uuid)
+
+    def _invalidated(self, uuid: str) -> None:
+        # a shared backend was already updated by the worker that published
+        if not self._shared:
+            self._bodies.invalidate(uuid)
+
+    def clear(self) -> None:
+        """Empty the cache and reset its counters."""
+        self._bodies.clear()
+
+    def snapshot(self) -> dict[str, int | float]:
+        return self._bodies.snapshot()
+
+
+representation_cache = RepresentationCache()
+invalidations.subscribe(NAMESPACE, representation_cache._invalidated)
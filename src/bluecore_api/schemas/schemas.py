@@ -125,6 +125,11 @@ class SearchResultSchema(BaseModel):
     total: int
 
 
+class ContainsResultSchema(BaseModel):
+    results: Sequence[dict[str, Any]]
+    links: LinksSchema
+
+
 class SearchProfileResultSchema(BaseModel):
     results: Sequence[ProfileSchema]
     links: LinksSchema
@@ -140,3 +145,10 @@ class ExportResponseSchema(BaseModel):
     instance_uri: str
     local_id: str | None = None
     workflow_id: str
+
+
+class BatchGetSchema(BaseModel):
+    uuids: list[UUID] = []
+    uris: list[str] = []
+    format: str = "jsonld"
+    expand: bool = False
@@ -0,0 +1,178 @@
+"""
+Selective and depth-limited expansion.
+
+`?expand=true` merges every other resource a Work, Instance or Hub links to.
+`expand` may instead list the properties to expand, comma separated, with
+dots for paths through the resource's own graph:
+`expand=subject,contribution.agent`. Each step is a term of bluecore_models'
+CONTEXT, a compact IRI or an IRI. `depth` then limits how far links are
+followed: 1 (the default for a list) merges the other resources the paths
+end on, 2 also the other resources those link to, and so on.
+`expand=true&depth=N` starts from every IRI in the resource's own data.
+
+The link rows selected are read with one query per level of depth and set as
+the resource's `other_resources`, so expansion, the serializers and the
+representation cache key all see just those.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from bluecore_models.models import (
+    BibframeOtherResources,
+    Hub,
+    Instance,
+    OtherResource,
+    Work,
+)
+from bluecore_models.utils.graph import CONTEXT, load_jsonld
+from fastapi import HTTPException, Query
+from rdflib import BNode, URIRef
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
+
+from bluecore_api.app.utils.serialize.loading import GRAPH_FORMATS
+from bluecore_api.app.utils.serialize.triples import (
+    IRI,
+    ActiveContext,
+    BlankNode,
+    all_triples,
+    supported,
+)
+
+TRUE = {"true", "1", "yes", "on"}
+FALSE = {"", "false", "0", "no", "off"}
+
+_context = ActiveContext().update(CONTEXT)
+
+
+@dataclass(frozen=True)
+class Expansion:
+    # property IRI paths to expand, or None for every property
+    paths: tuple[tuple[str, ...], ...] | None = None
+    # levels of links to follow, or None for every link
+    depth: int | None = None
+
+    @property
+    def complete(self) -> bool:
+        """Every other resource, as `expand=true` has always merged."""
+        return self.paths is None and self.depth is None
+
+    def __str__(self) -> str:
+        expand = (
+            "true"
+            if self.paths is None
+            else ",".join(".".join(path) for path in self.paths)
+        )
+        return expand if self.depth is None else f"{expand};depth={self.depth}"
+
+
+def parse_expansion(expand: str, depth: int | None = None) -> Expansion | None:
+    """The expansion `expand` and `depth` ask for, or None for none."""
+    value = expand.strip()
+    if value.lower() in FALSE:
+        return None
+    if value.lower() in TRUE:
+        return Expansion(depth=depth)
+    paths = []
+    for path in value.split(","):
+        steps = path.strip().split(".")
+        if not all(steps):
+            raise HTTPException(
+                status_code=422, detail=f"Invalid expand path {path.strip()!r}"
+            )
+        paths.append(tuple(_context.expand(step) or step for step in steps))
+    return Expansion(paths=tuple(paths), depth=depth or 1)
+
+
+def expansion_param(
+    expand: str = Query(
+        "false",
+        description="true, false, or properties to expand such as "
+        "subject,contribution.agent",
+    ),
+    depth: int | None = Query(
+        None, ge=1, description="Levels of linked resources to expand"
+    ),
+) -> Expansion | None:
+    """The `expand` and `depth` query parameters of the resource GET routes."""
+    return parse_expansion(expand, depth)
+
+
+async def select_links(
+    db: AsyncSession,
+    doc: Hub | Instance | Work,
+    expansion: Expansion | None,
+    representation: str | None,
+) -> None:
+    """
+    Loads only the link rows `expansion` selects into `doc.other_resources`,
+    when it is selective and `representation` renders the resource's graph
+    (Hubs fall back to JSON-LD). Otherwise the route's loader options
+    already cover what it needs.
+    """
+    if expansion is None or expansion.complete:
+        return
+    if representation not in GRAPH_FORMATS and not isinstance(doc, Hub):
+        return
+    uris = _start(doc.data, doc.uri, expansion.paths)
+    seen = {doc.uri}
+    links: list[BibframeOtherResources] = []
+    for _ in range(expansion.depth or 1):
+        uris -= seen
+        if not uris:
+            break
+        seen |= uris
+        stmt = (
+            select(BibframeOtherResources)
+            .join(BibframeOtherResources.other_resource)
+            .where(
+                BibframeOtherResources.bibframe_resource_id == doc.id,
+                OtherResource.uri.in_(uris),
+            )
+            .options(contains_eager(BibframeOtherResources.other_resource))
+        )
+        rows = (await db.execute(stmt)).scalars().all()
+        links.extend(rows)
+        uris = {
+            str(node)
+            for row in rows
+            for _, _, node in _node_triples(row.other_resource.data)
+            if isinstance(node, IRI)
+        }
+    set_committed_value(doc, "other_resources", links)
+
+
+def _start(data: Any, uri: str, paths: tuple[tuple[str, ...], ...] | None) -> set[str]:
+    """The IRIs `paths` reach from `uri`, or every IRI `data` links to."""
+    triples = list(_node_triples(data))
+    if paths is None:
+        return {str(node) for _, _, node in triples if isinstance(node, IRI)}
+    objects: defaultdict[tuple[str, str], list] = defaultdict(list)
+    for subject, predicate, node in triples:
+        objects[subject, predicate].append(node)
+    reached: set[str] = set()
+    for path in paths:
+        nodes = [uri]
+        for predicate in path:
+            nodes = [o for node in nodes for o in objects.get((node, predicate), ())]
+        reached.update(str(node) for node in nodes if isinstance(node, IRI))
+    return reached
+
+
+def _node_triples(data: Any) -> Iterator[tuple[str, str, IRI | BlankNode]]:
+    """The triples of `data` whose object is an IRI or blank node."""
+    if supported(data):
+        for subject, predicate, node in all_triples([data]):
+            if isinstance(node, (IRI, BlankNode)):
+                yield subject, predicate, node
+        return
+    for subject, predicate, node in load_jsonld(data):
+        if isinstance(node, URIRef):
+            yield str(subject), str(predicate), IRI(node)
+        elif isinstance(node, BNode):
+            yield str(subject), str(predicate), BlankNode(node)
@@ -0,0 +1,304 @@
+"""
+Cache storage and invalidation shared between the API's workers.
+
+Every uvicorn worker used to keep its own caches, so with several workers on
+several nodes most requests met a cold cache, and a PUT only dropped the
+entries of the worker that handled it. With CACHE_URL pointing at a
+Redis-protocol server (Redis, Valkey, KeyDB):
+
+- rendered representations are stored there, for every worker to read
+- invalidations are published on a channel every worker listens to, so a
+  change handled by one worker also drops the others' in-process entries
+
+Without CACHE_URL everything stays in process, as before. `cache_backend`
+picks the storage: a `SizedLRU`, or a `RedisBackend` with the same methods.
+Keys are tuples whose first element is the resource they belong to, and are
+namespaced by cache, so `invalidate` drops a resource's entries at once.
+The shared backend never fails a request: Redis errors are logged, counted
+and treated as misses. Its client blocks, for up to SOCKET_TIMEOUT, so
+callers on the event loop go through `shared_io`, which runs them in a
+thread when CACHE_URL is set.
+
+- CACHE_URL: redis:// or rediss:// URL of the server, needs the `redis`
+  package, the `shared-cache` extra (unset keeps caches in process)
+- CACHE_PREFIX: prefix of the keys and channel, for deployments sharing a
+  server (default "bluecore")
+- CACHE_TTL: seconds cached entries live (default 86400, 0 for no expiry)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable, Hashable
+from typing import Any
+
+import orjson
+
+from bluecore_api.sized_lru import SizedLRU
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+CACHE_URL = os.getenv("CACHE_URL")
+PREFIX = os.getenv("CACHE_PREFIX", "bluecore")
+TTL = int(os.getenv("CACHE_TTL", "86400")) or None
+
+# a slow or unreachable server costs a request at most this many seconds
+SOCKET_TIMEOUT = 0.5
+
+logger = logging.getLogger(__name__)
+
+type Listener = Callable[[str], None]
+
+
+class RedisBackend[K: tuple, V]:
+    """
+    Entries in a Redis-protocol server, under `{prefix}:{namespace}:`. Each
+    resource's keys are also kept in a set so `invalidate` can find them.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        namespace: str,
+        max_bytes: int,
+        encode: Callable[[V], bytes],
+        decode: Callable[[bytes], V],
+        prefix: str = PREFIX,
+    ):
+        self.max_bytes = max_bytes
+        self._client = client
+        self._namespace = f"{prefix}:{namespace}"
+        self._encode = encode
+        self._decode = decode
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: K, count: bool = True) -> V | None:
+        """The value for `key`; `count` records the lookup as a hit or miss."""
+        try:
+            data = self._client.get(self._name(key))
+        except redis.RedisError as error:
+            self._failed("read", error)
+            data = None
+        with self._lock:
+            if data is None:
+                self.misses += count
+                return None
+            self.hits += count
+        return self._decode(data)
+
+    def put(self, key: K, value: V, size: int, ttl: float | None = None) -> None:
+        """Store `value`, which takes about `size` bytes, for `ttl` seconds."""
+        if size > self.max_bytes:
+            return
+        name = self._name(key)
+        group = self._group(key[0])
+        seconds = None if ttl is None else max(1, round(ttl))
+        try:
+            with self._client.pipeline() as pipeline:
+                pipeline.set(name, self._encode(value), ex=seconds)
+                pipeline.sadd(group, name)
+                if seconds is not None:
+                    # outlives the entries it lists, it is renewed with each
+                    pipeline.expire(group, seconds)
+                pipeline.execute()
+        except redis.RedisError as error:
+            self._failed("write", error)
+
+    def invalidate(self, group: Hashable) -> None:
+        """Drop every entry whose key starts with `group`, for every worker."""
+        try:
+            names = self._client.smembers(self._group(group))
+            self._client.delete(self._group(group), *names)
+        except redis.RedisError as error:
+            self._failed("invalidate", error)
+            return
+        with self._lock:
+            self.invalidations += len(names)
+
+    def clear(self) -> None:
+        """Empty the namespace and reset this worker's counters."""
+        try:
+            names = list(self._client.scan_iter(match=f"{self._namespace}:*"))
+            if names:
+                self._client.delete(*names)
+        except redis.RedisError as error:
+            self._failed("clear", error)
+        with self._lock:
+            self.hits = self.misses = self.invalidations = self.errors = 0
+
+    def snapshot(self) -> dict[str, int | float | str]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "redis",
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+
+    def _group(self, group: Hashable) -> str:
+        return f"{self._namespace}:{group}"
+
+    def _name(self, key: K) -> str:
+        # the rest of a key can be long (expanded resources list their links)
+        digest = hashlib.blake2b(repr(key[1:]).encode(), digest_size=16)
+        return f"{self._group(key[0])}:{digest.hexdigest()}"
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        with self._lock:
+            self.errors += 1
+        logger.warning(
+            "Shared cache %s failed in %s: %s", operation, self._namespace, error
+        )
+
+
+class Invalidations:
+    """
+    Tells every cache that a resource changed. Caches `subscribe` to their
+    namespace; `publish` calls their listeners with the resource's group.
+    This one reaches the listeners of this worker only.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: dict[str, list[Listener]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, namespace: str, listener: Listener) -> None:
+        with self._lock:
+            self._listeners.setdefault(namespace, []).append(listener)
+
+    def publish(self, namespace: str, group: Hashable) -> None:
+        self._deliver(namespace, str(group))
+
+    def _deliver(self, namespace: str, group: str) -> None:
+        with self._lock:
+            listeners = list(self._listeners.get(namespace, ()))
+        for listener in listeners:
+            listener(group)
+
+    def close(self) -> None:
+        pass
+
+
+class RedisInvalidations(Invalidations):
+    """
+    Also publishes on `{prefix}:invalidate`, and delivers what other workers
+    publish there to this worker's listeners from a background thread,
+    started by the first `subscribe`.
+    """
+
+    def __init__(self, client: Any, prefix: str = PREFIX):
+        super().__init__()
+        self.channel = f"{prefix}:invalidate"
+        self._client = client
+        # this worker's listeners are called straight away, not on the echo
+        self._sender = uuid.uuid4().hex
+        self._thread: Any = None
+
+    def subscribe(self, namespace: str, listener: Listener) -> None:
+        super().subscribe(namespace, listener)
+        with self._lock:
+            if self._thread is None:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._message})
+                self._thread = pubsub.run_in_thread(
+                    sleep_time=1.0, daemon=True, exception_handler=_reconnect
+                )
+
+    def publish(self, namespace: str, group: Hashable) -> None:
+        super().publish(namespace, group)
+        message = orjson.dumps([self._sender, namespace, str(group)])
+        try:
+            self._client.publish(self.channel, message)
+        except redis.RedisError as error:
+            logger.warning(
+                "Could not publish the invalidation of %s %s: %s",
+                namespace,
+                group,
+                error,
+            )
+
+    def _message(self, message: dict[str, Any]) -> None:
+        try:
+            sender, namespace, group = orjson.loads(message["data"])
+        except (orjson.JSONDecodeError, TypeError, ValueError):
+            logger.warning("Ignoring malformed invalidation %r", message["data"])
+            return
+        if sender != self._sender:
+            self._deliver(namespace, group)
+
+    def close(self) -> None:
+        """Stop listening."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.stop()
+            thread.join(timeout=5)
+
+
+def _reconnect(error: Exception, pubsub: Any, thread: Any) -> None:
+    """Keeps the listener running while the server is away; it resubscribes."""
+    logger.warning("Lost the invalidation channel, retrying: %s", error)
+    time.sleep(1.0)
+
+
+def connect(url: str) -> Any:
+    if redis is None:
+        raise RuntimeError(
+            "CACHE_URL is set but the redis package is not installed,"
+            " install the shared-cache extra"
+        )
+    return redis.Redis.from_url(
+        url, socket_timeout=SOCKET_TIMEOUT, socket_connect_timeout=SOCKET_TIMEOUT
+    )
+
+
+client = connect(CACHE_URL) if CACHE_URL else None
+invalidations: Invalidations = (
+    RedisInvalidations(client) if client is not None else Invalidations()
+)
+
+
+async def shared_io[R](fn: Callable[..., R], *args: Any) -> R:
+    """
+    `fn(*args)`, for a cache operation that may talk to the shared server:
+    in a thread when CACHE_URL is set, so the event loop never waits on
+    Redis, and straight away when caches are in process.
+    """
+    if client is None:
+        return fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
+
+def cache_backend[K: tuple, V](
+    namespace: str,
+    max_bytes: int,
+    encode: Callable[[V], bytes],
+    decode: Callable[[bytes], V],
+) -> SizedLRU[K, V] | RedisBackend[K, V]:
+    """
+    Storage for the cache `namespace`: shared through CACHE_URL when it is
+    set, bounded to `max_bytes` in total in process or per entry in Redis.
+    `encode` and `decode` turn values into bytes and back for Redis.
+    """
+    if client is None:
+        return SizedLRU(max_bytes)
+    return RedisBackend(client, namespace, max_bytes, encode, decode)
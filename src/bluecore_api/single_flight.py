@@ -0,0 +1,179 @@
+"""
+Coalescing of concurrent identical reads.
+
+When a record is linked from a popular page, or a harvester fans out, dozens
+of identical requests for it arrive at once, and each used to load and render
+it on its own: for a CBD, several queries and a large graph built and
+serialized in the CPU pool. Now requests for the same path, representation,
+expansion and version (the ETag, so a change is never hidden) that arrive
+while one of them is rendering wait for it and all get its body.
+
+A response no other request waited for is returned as it is, streamed bodies
+included; one that is shared is read into memory once. If the request doing
+the work is cancelled because its client went away, a waiting request takes
+over; if it fails, the waiting requests fail with the same error.
+
+- COALESCE_READS: "false" renders every request on its own (default "true")
+"""
+
+import asyncio
+import os
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from bluecore_api.conditional import Validators
+from bluecore_api.content_encoding import negotiate
+from bluecore_api.selective_expansion import Expansion
+
+ENABLED = os.getenv("COALESCE_READS", "true") == "true"
+
+
+@dataclass(frozen=True)
+class SharedResponse:
+    status_code: int
+    headers: dict[str, str]
+    body: bytes
+
+    @classmethod
+    async def read(cls, response: Response) -> "SharedResponse":
+        """`response` with its body read in full, streamed or not."""
+        if isinstance(response, StreamingResponse):
+            chunks = []
+            async for chunk in response.body_iterator:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode(response.charset)
+                chunks.append(bytes(chunk))
+            body = b"".join(chunks)
+        else:
+            body = bytes(response.body)
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name != "content-length"
+        }
+        return cls(response.status_code, headers, body)
+
+    def response(self) -> Response:
+        """A response of its own for each request, as middleware may alter it."""
+        return Response(
+            content=self.body, status_code=self.status_code, headers=self.headers
+        )
+
+
+class _Abandoned(Exception):
+    """The request rendering the response was cancelled."""
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.result: asyncio.Future[SharedResponse] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self.waiting = 0
+
+
+class SingleFlight:
+    def __init__(self, enabled: bool = ENABLED):
+        self.enabled = enabled
+        # flights and counters are only touched from the event loop
+        self._flights: dict[Hashable, _Flight] = {}
+        self.renders = 0
+        self.shared = 0
+        self.coalesced = 0
+        self.takeovers = 0
+
+    async def run(
+        self, key: Hashable | None, render: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        """
+        The response `render` returns, or the one a concurrent call with the
+        same `key` is rendering. A None key is never coalesced.
+        """
+        if key is None or not self.enabled:
+            return await render()
+        while (flight := self._flights.get(key)) is not None:
+            flight.waiting += 1
+            try:
+                # a cancelled follower leaves the rendering to run on
+                shared = await asyncio.shield(flight.result)
+            except _Abandoned:
+                self.takeovers += 1
+                continue
+            finally:
+                flight.waiting -= 1
+            self.coalesced += 1
+            return shared.response()
+        return await self._lead(key, render)
+
+    async def _lead(
+        self, key: Hashable, render: Callable[[], Awaitable[Response]]
+    ) -> Response:
+        flight = self._flights[key] = _Flight()
+        self.renders += 1
+        try:
+            response = await render()
+            # nothing is awaited between the check and the flight ending, so
+            # no one can start waiting for a response that isn't shared
+            if flight.waiting:
+                shared = await SharedResponse.read(response)
+                flight.result.set_result(shared)
+                self.shared += 1
+                response = shared.response()
+        except asyncio.CancelledError:
+            if flight.waiting:
+                flight.result.set_exception(_Abandoned())
+            raise
+        except Exception as error:
+            if flight.waiting:
+                flight.result.set_exception(error)
+            raise
+        finally:
+            del self._flights[key]
+        return response
+
+    def snapshot(self) -> dict[str, int | bool]:
+        """
+        Renders run, those whose response was shared, requests that got a
+        shared response instead of rendering, and requests that had to take
+        over from a cancelled one.
+        """
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "renders": self.renders,
+            "shared": self.shared,
+            "coalesced": self.coalesced,
+            "takeovers": self.takeovers,
+        }
+
+    def clear(self) -> None:
+        """Reset the counters."""
+        self.renders = self.shared = self.coalesced = self.takeovers = 0
+
+
+def read_key(
+    request: Request,
+    representation: str | None,
+    expansion: Expansion | None,
+    validators: Validators | None,
+) -> tuple | None:
+    """
+    What makes two reads of a resource identical. The negotiated encoding is
+    part of it, as cached representations can come compressed. Missing
+    resources (no validators) are not coalesced.
+    """
+    if validators is None:
+        return None
+    return (
+        request.url.path,
+        representation,
+        str(expansion),
+        validators.etag,
+        negotiate(request.headers.get("accept-encoding")),
+    )
+
+
+single_flight = SingleFlight()
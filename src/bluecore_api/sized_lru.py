@@ -0,0 +1,110 @@
+"""
+A thread-safe LRU mapping bounded by the total size of its values.
+
+Keys are tuples whose first element names the resource an entry belongs to,
+so all of a resource's entries can be dropped at once when it changes.
+Entries stored with a `ttl` expire after that many seconds.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class SizedLRU[K: tuple, V]:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[K, tuple[V, int, float | None]] = OrderedDict()
+        self._keys_by_group: dict[Hashable, set[K]] = {}
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: K, count: bool = True) -> V | None:
+        """The value for `key`; `count` records the lookup as a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and _expired(entry[2]):
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += count
+                return None
+            self._entries.move_to_end(key)
+            self.hits += count
+            return entry[0]
+
+    def put(self, key: K, value: V, size: int, ttl: float | None = None) -> None:
+        """
+        Store `value`, which takes about `size` bytes, for `ttl` seconds or
+        until it is evicted, evicting others as needed.
+        """
+        if size > self.max_bytes:
+            return
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                if not _expired(existing[2]):
+                    return
+                self._remove(key)
+                self.expirations += 1
+            self._entries[key] = (value, size, expires)
+            self._keys_by_group.setdefault(key[0], set()).add(key)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, group: Hashable) -> None:
+        """Drop every entry whose key starts with `group`."""
+        with self._lock:
+            for key in self._keys_by_group.get(group, set()).copy():
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Empty the cache and reset its counters."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_group.clear()
+            self.size = 0
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+            self.expirations = 0
+
+    def _remove(self, key: K) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+        keys = self._keys_by_group[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_group[key[0]]
+
+    def snapshot(self) -> dict[str, int | float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "expirations": self.expirations,
+            }
+
+
+def _expired(expires: float | None) -> bool:
+    return expires is not None and expires <= time.monotonic()
@@ -0,0 +1,119 @@
+import json
+import pathlib
+
+import rdflib
+from bluecore_models.models import (
+    BibframeOtherResources,
+    Instance,
+    OtherResource,
+    Work,
+)
+from bluecore_models.utils.graph import BF, init_graph, load_jsonld
+from rdflib.compare import isomorphic
+
+from bluecore_api.constants import CONTEXT_URL
+
+work_uuid = "370ccc0a-3280-4036-9ca1-d9b5d5daf7df"
+work_uri = f"https://api.sinopia.io/resources/{work_uuid}"
+work_data = json.loads(pathlib.Path("tests/blue-core-work.jsonld").read_text())
+
+instance_uuid = "9f2a3c1e-3b6e-4c1e-8a43-6f0d2f9c7b11"
+instance_uri = rdflib.URIRef(f"https://bcld.info/instances/{instance_uuid}")
+eng_uri = rdflib.URIRef("http://id.loc.gov/vocabulary/languages/eng")
+instance_graph = init_graph()
+instance_graph.add((instance_uri, rdflib.RDF.type, BF.Instance))
+instance_graph.add((instance_uri, BF.language, eng_uri))
+eng_data = json.loads(pathlib.Path("tests/blue-core-other-resources.json").read_text())
+
+
+def add_resources(db_session):
+    db_session.add(Work(id=1, uuid=work_uuid, uri=work_uri, data=work_data))
+    instance = Instance(
+        id=2,
+        uuid=instance_uuid,
+        uri=str(instance_uri),
+        data=json.loads(instance_graph.serialize(format="json-ld")),
+    )
+    db_session.add(instance)
+    other_resource = OtherResource(id=3, uri=str(eng_uri), data=eng_data)
+    db_session.add(other_resource)
+    db_session.add(
+        BibframeOtherResources(
+            id=1, other_resource=other_resource, bibframe_resource=instance
+        )
+    )
+    db_session.commit()
+    return instance
+
+
+def test_batch_get_jsonld_in_request_order(client, db_session):
+    add_resources(db_session)
+
+    response = client.post(
+        "/resources/batch-get",
+        json={
+            "uuids": [instance_uuid, "00000000-0000-0000-0000-000000000000"],
+            "uris": [work_uri, str(instance_uri)],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/ld+json"
+    docs = response.json()
+    # the missing uuid is left out and the instance, asked for twice, sent once
+    assert [doc["@id"] for doc in docs] == [str(instance_uri), work_uri]
+    assert all(doc["@context"] == CONTEXT_URL for doc in docs)
+
+
+def test_batch_get_vnd_sinopia_json(client, db_session):
+    add_resources(db_session)
+
+    response = client.post(
+        "/resources/batch-get",
+        json={"uuids": [work_uuid], "format": "vnd.sinopia.json"},
+    )
+
+    assert response.status_code == 200
+    [doc] = response.json()
+    assert doc["uuid"] == work_uuid
+    assert doc["data"]["@context"] == CONTEXT_URL
+
+
+def test_batch_get_ntriples_expanded(client, db_session, query_budget):
+    instance = add_resources(db_session)
+    expected = (
+        load_jsonld(db_session.get(Work, 1).data)
+        + load_jsonld(instance.data)
+        + load_jsonld(eng_data)
+    )
+
+    with query_budget(4):
+        response = client.post(
+            "/resources/batch-get",
+            json={
+                "uuids": [work_uuid, instance_uuid],
+                "format": "nt",
+                "expand": True,
+            },
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/n-triples")
+    graph = rdflib.Graph().parse(data=response.text, format="nt")
+    assert isomorphic(graph, expected)
+
+
+def test_batch_get_limits(client, monkeypatch):
+    monkeypatch.setattr("bluecore_api.app.routes.batch_get.BATCH_GET_MAX", 1)
+
+    too_many = client.post(
+        "/resources/batch-get", json={"uuids": [work_uuid], "uris": [work_uri]}
+    )
+    bad_format = client.post(
+        "/resources/batch-get", json={"uuids": [work_uuid], "format": "cbd.xml"}
+    )
+    bad_uuid = client.post("/resources/batch-get", json={"uuids": ["not-a-uuid"]})
+
+    assert too_many.status_code == 422
+    assert bad_format.status_code == 422
+    assert bad_uuid.status_code == 422
@@ -0,0 +1,170 @@
+"""CompressionMiddleware against stub ASGI apps, and cached compressed variants."""
+
+import gzip
+import json
+import pathlib
+
+import pytest
+from bluecore_models.models import Work
+
+from bluecore_api.content_encoding import negotiate
+from bluecore_api.middleware.compression import CompressionMiddleware
+from bluecore_api.representation_cache import representation_cache
+
+BODY = b'{"@id": "https://bcld.info/works/1"}' * 100
+
+
+class _App:
+    """Sends `chunks` as a response of `media_type`."""
+
+    def __init__(
+        self, chunks, media_type="application/ld+json", headers=(), status=200
+    ):
+        self.chunks = chunks
+        self.headers = [(b"content-type", media_type.encode()), *headers]
+        self.status = status
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status,
+                "headers": self.headers,
+            }
+        )
+        for i, chunk in enumerate(self.chunks):
+            more_body = i < len(self.chunks) - 1
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+
+
+async def _request(
+    app, accept_encoding: str | None = "gzip", **extra: str
+) -> tuple[dict, bytes]:
+    headers = [
+        (name.replace("_", "-").encode(), value.encode())
+        for name, value in extra.items()
+    ]
+    if accept_encoding is not None:
+        headers.append((b"accept-encoding", accept_encoding.encode()))
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": headers}
+    sent: list[dict] = []
+
+    async def send(message):
+        sent.append(message)
+
+    await CompressionMiddleware(app)(scope, None, send)
+    start, *bodies = sent
+    return start, b"".join(message["body"] for message in bodies)
+
+
+def _header(start: dict, name: str) -> str | None:
+    for key, value in start["headers"]:
+        if key.decode().lower() == name:
+            return value.decode()
+    return None
+
+
+def test_negotiate():
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("*") is not None
+    assert negotiate("identity") is None
+    assert negotiate(None) is None
+
+
+@pytest.mark.asyncio
+async def test_compresses_large_json():
+    start, body = await _request(
+        _App([BODY], headers=[(b"etag", b'"abc"')]), "gzip, br;q=0"
+    )
+
+    assert _header(start, "content-encoding") == "gzip"
+    assert _header(start, "vary") == "Accept-Encoding"
+    assert _header(start, "etag") == 'W/"abc"'
+    assert int(_header(start, "content-length")) == len(body)
+    assert gzip.decompress(body) == BODY
+
+
+@pytest.mark.asyncio
+async def test_not_modified_keeps_the_weak_etag():
+    not_modified = _App([b""], headers=[(b"etag", b'"abc"')], status=304)
+
+    start, _ = await _request(not_modified, if_none_match='W/"abc"')
+    assert _header(start, "etag") == 'W/"abc"'
+
+    start, _ = await _request(not_modified, if_none_match='"abc"')
+    assert _header(start, "etag") == '"abc"'
+
+
+@pytest.mark.asyncio
+async def test_streams_compressed_chunks():
+    chunks = [BODY[:2000], BODY[2000:]]
+
+    start, body = await _request(_App(chunks))
+
+    assert _header(start, "content-encoding") == "gzip"
+    assert _header(start, "content-length") is None
+    assert gzip.decompress(body) == BODY
+
+
+@pytest.mark.asyncio
+async def test_brotli_round_trip():
+    brotli = pytest.importorskip("brotli")
+    chunks = [BODY[:2000], BODY[2000:]]
+
+    start, body = await _request(_App(chunks), "br")
+
+    assert _header(start, "content-encoding") == "br"
+    assert brotli.decompress(body) == BODY
+
+
+@pytest.mark.asyncio
+async def test_zstd_round_trip():
+    zstandard = pytest.importorskip("zstandard")
+    chunks = [BODY[:2000], BODY[2000:]]
+
+    start, body = await _request(_App(chunks), "zstd")
+
+    assert _header(start, "content-encoding") == "zstd"
+    # streamed frames don't record their size, so decode them as a stream
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(body) == BODY
+
+
+@pytest.mark.asyncio
+async def test_leaves_small_other_and_unasked_bodies():
+    start, body = await _request(_App([b"{}"]))
+    assert _header(start, "content-encoding") is None
+    assert body == b"{}"
+
+    start, body = await _request(_App([BODY], media_type="image/png"))
+    assert _header(start, "content-encoding") is None
+    assert _header(start, "vary") is None
+
+    start, body = await _request(_App([BODY]), accept_encoding=None)
+    assert _header(start, "content-encoding") is None
+    assert _header(start, "vary") == "Accept-Encoding"
+    assert body == BODY
+
+
+def test_cached_variant(client, db_session):
+    uuid = "370ccc0a-3280-4036-9ca1-d9b5d5daf7df"
+    data = json.loads(pathlib.Path("tests/blue-core-work.jsonld").read_text())
+    db_session.add(
+        Work(id=1, uuid=uuid, uri=f"https://api.sinopia.io/resources/{uuid}", data=data)
+    )
+    db_session.commit()
+    headers = {"Accept-Encoding": "gzip"}
+
+    first = client.get(f"/works/{uuid}.jsonld", headers=headers)
+    second = client.get(f"/works/{uuid}.jsonld", headers=headers)
+    third = client.get(f"/works/{uuid}.jsonld", headers=headers)
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert second.headers["content-encoding"] == "gzip"
+    assert first.content == second.content == third.content
+    snapshot = representation_cache.snapshot()
+    # the body and its gzip variant, built once
+    assert snapshot["entries"] == 2
+    assert (snapshot["hits"], snapshot["misses"]) == (2, 1)
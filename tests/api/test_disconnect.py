@@ -0,0 +1,98 @@
+"""Unit tests for CancelOnDisconnectMiddleware against stub ASGI apps."""
+
+import asyncio
+
+import pytest
+
+from bluecore_api.middleware.disconnect import CancelOnDisconnectMiddleware
+
+
+class _SlowApp:
+    """Stands in for a handler stuck on a long query."""
+
+    def __init__(self) -> None:
+        self.cancelled = False
+        self.finished = False
+
+    async def __call__(self, scope, receive, send) -> None:
+        await receive()
+        try:
+            await asyncio.sleep(0.2)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"done"})
+        self.finished = True
+
+
+def _client_that_leaves() -> tuple:
+    """receive() for a client that sends its request, then disconnects."""
+    messages = [
+        {"type": "http.request", "body": b"", "more_body": False},
+        {"type": "http.disconnect"},
+    ]
+
+    async def receive():
+        message = messages.pop(0)
+        if message["type"] == "http.disconnect":
+            await asyncio.sleep(0.01)
+        return message
+
+    sent: list[dict] = []
+
+    async def send(message):
+        sent.append(message)
+
+    return receive, send, sent
+
+
+def _scope(method: str) -> dict:
+    return {"type": "http", "method": method, "path": "/search/"}
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_read():
+    app = _SlowApp()
+    receive, send, sent = _client_that_leaves()
+
+    await CancelOnDisconnectMiddleware(app)(_scope("GET"), receive, send)
+
+    assert app.cancelled
+    assert sent == []
+
+
+@pytest.mark.asyncio
+async def test_disconnect_does_not_cancel_write():
+    app = _SlowApp()
+    receive, send, _ = _client_that_leaves()
+
+    await CancelOnDisconnectMiddleware(app)(_scope("POST"), receive, send)
+
+    assert app.finished
+    assert not app.cancelled
+
+
+@pytest.mark.asyncio
+async def test_connected_client_gets_response():
+    app = _SlowApp()
+    response_sent = asyncio.Event()
+    sent: list[dict] = []
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # like a server, report the disconnect once the response is out
+        await response_sent.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.body":
+            response_sent.set()
+
+    await CancelOnDisconnectMiddleware(app)(_scope("GET"), receive, send)
+
+    assert app.finished
+    assert sent[-1]["body"] == b"done"
@@ -0,0 +1,80 @@
+import json
+import pathlib
+
+import pytest
+from bluecore_models.models import BibframeOtherResources, Instance, OtherResource, Work
+
+work_uuid = "370ccc0a-3280-4036-9ca1-d9b5d5daf7df"
+instance_uuid = "75d831b9-e0d6-40f0-abb3-e9130622eb8a"
+work_data = json.loads(pathlib.Path("tests/blue-core-work.jsonld").read_text())
+instance_data = json.loads(pathlib.Path("tests/blue-core-instance.jsonld").read_text())
+
+
+def add_resources(db_session):
+    work = Work(
+        id=1,
+        uuid=work_uuid,
+        uri=f"https://api.sinopia.io/resources/{work_uuid}",
+        data=work_data,
+    )
+    instance = Instance(
+        id=2,
+        uuid=instance_uuid,
+        uri=f"https://bluecore.info/instances/{instance_uuid}",
+        data=instance_data,
+        work=work,
+    )
+    db_session.add_all([work, instance])
+    db_session.commit()
+    return work, instance
+
+
+def add_links(db_session, resources, start: int, count: int):
+    for i in range(start, start + count):
+        uri = f"http://id.loc.gov/vocabulary/languages/x{i}"
+        other_resource = OtherResource(
+            id=100 + i,
+            uri=uri,
+            data={
+                "@id": uri,
+                "@type": ["http://id.loc.gov/ontologies/bibframe/Language"],
+                "http://www.w3.org/2000/01/rdf-schema#label": f"Language {i}",
+            },
+        )
+        db_session.add(other_resource)
+        for resource in resources:
+            db_session.add(
+                BibframeOtherResources(
+                    other_resource=other_resource, bibframe_resource=resource
+                )
+            )
+    db_session.commit()
+
+
+@pytest.mark.parametrize(
+    "path,headers",
+    [
+        (f"/works/{work_uuid}.jsonld?expand=true", {}),
+        (f"/works/{work_uuid}.nt?expand=true", {}),
+        (f"/works/{work_uuid}", {"Accept": "application/rdf+xml"}),
+        (f"/works/{work_uuid}", {"Accept": "text/html"}),
+        (f"/instances/{instance_uuid}", {"Accept": "text/html"}),
+        (f"/instances/{instance_uuid}.cbd.xml", {}),
+        (f"/instances/{instance_uuid}.cbd.jsonld", {}),
+    ],
+)
+def test_query_count_does_not_grow_with_links(
+    client, db_session, query_budget, path, headers
+):
+    resources = add_resources(db_session)
+    add_links(db_session, resources, start=0, count=2)
+
+    with query_budget(8) as few_links:
+        assert client.get(path, headers=headers).status_code == 200
+
+    add_links(db_session, resources, start=2, count=20)
+
+    with query_budget(8) as many_links:
+        assert client.get(path, headers=headers).status_code == 200
+
+    assert len(many_links) == len(few_links)
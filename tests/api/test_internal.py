@@ -0,0 +1,40 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from bluecore_api.db_pool import PoolStats, instrumented_pool
+
+
+def test_pool_stats_endpoint(client):
+    response = client.get("/internal/pool")
+    assert response.status_code == 200
+    stats = response.json()["primary"]
+    assert "checkouts" in stats
+    assert "timeouts" in stats
+    assert "wait_histogram" in stats
+
+
+def test_cache_stats_endpoint(client):
+    response = client.get("/internal/cache")
+    assert response.status_code == 200
+    assert response.json()["representations"]["hits"] == 0
+
+
+def test_instrumented_pool_records_checkouts_and_timeouts():
+    stats = PoolStats("test")
+    pool = instrumented_pool(QueuePool, stats)(
+        creator=MagicMock, pool_size=1, max_overflow=0, timeout=0.01
+    )
+
+    connection = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    connection.close()
+
+    snapshot = stats.snapshot()
+    assert snapshot["checkouts"] == 1
+    assert snapshot["timeouts"] == 1
+    assert snapshot["checked_out"] == 0
+    assert sum(snapshot["wait_histogram"].values()) == 1
@@ -106,3 +106,11 @@ async def test_options_always_bypasses(path):
     """OPTIONS (CORS preflight) is always public, regardless of path."""
     inner, keycloak = await _route("OPTIONS", path)
     assert inner.called and not keycloak.called
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", sorted(BypassKeycloakForGet.READ_POST_PATHS))
+async def test_read_only_post_bypasses_keycloak(path):
+    """A POST that only reads, like /resources/batch-get, is as public as a GET."""
+    inner, keycloak = await _route("POST", path)
+    assert inner.called and not keycloak.called
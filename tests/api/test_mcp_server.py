@@ -81,5 +81,6 @@ async def test_mcp_list_tools_request(mcp_client):
 
     data = response.json()
     tools = sorted(data["result"]["tools"], key=lambda x: x["name"])
-    assert len(tools) == 39
-    assert tools[0]["name"].startswith("batch_upload")
+    assert len(tools) == 41
+    assert tools[0]["name"] == "batch_get_resources"
+    assert tools[1]["name"].startswith("batch_upload")
@@ -129,6 +129,24 @@ def test_read_slice_other_resources(client, db_session):
     assert "prev" not in returned_payload
 
 
+def test_read_slice_leaves_search_vector(client, db_session, query_budget):
+    for i in range(3):
+        db_session.add(
+            OtherResource(
+                uri=f"https://example.com/{i + 1}",
+                data={"label": f"A label for {i + 1}"},
+            )
+        )
+    db_session.commit()
+    db_session.expunge_all()
+
+    # the statement timeout, the page and the count
+    with query_budget(3) as statements:
+        response = client.get("/resources/")
+    assert len(response.json()["resources"]) == 3
+    assert not any("data_vector" in statement for statement in statements)
+
+
 def test_read_slice_offset(client, db_session):
     # create 8 OtherResources
     for i in range(8):
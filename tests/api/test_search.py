@@ -1,12 +1,17 @@
 import json
 import pathlib
+import uuid
 
 import pytest
 from bluecore_models.models import Profile, Work
+from fastapi import Depends
 from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from bluecore_api.app.routes.search import format_query
+from bluecore_api.database import get_async_db, get_search_db, set_statement_timeout
 
 
 def test_format_query():
@@ -171,6 +176,28 @@ def test_search(client: TestClient, db_session: Session):
     )
 
 
+def test_search_query_count(client: TestClient, db_session: Session, query_budget):
+    work_jsonld = pathlib.Path("tests/blue-core-work.jsonld").read_text()
+    for i in range(1, 6):
+        work_uuid = str(uuid.uuid4())
+        db_session.add(
+            Work(
+                id=i,
+                uuid=work_uuid,
+                uri=f"https://api.sinopia.io/resources/{work_uuid}",
+                # the models keep only the graph about the Work's own uri
+                data=json.loads(work_jsonld.replace(test_work_uuid, work_uuid)),
+            )
+        )
+    # committed first, so the inserts aren't flushed inside the budget
+    db_session.commit()
+
+    # the statement timeout, the count and the page, however many results
+    with query_budget(3):
+        response = client.get("/search/", params={"q": "kumae chedo mit"})
+    assert response.json()["total"] == 5
+
+
 def test_search_html(client: TestClient, db_session: Session):
     add_data(db_session)
 
@@ -346,5 +373,94 @@ def test_search_profile_limit(client: TestClient, db_session: Session):
     assert result["total"] == 2
 
 
+# the models store data compacted against their context
+CARRIER = "carrier"
+
+
+def add_carrier_works(db_session: Session) -> None:
+    carriers = ["nc", "nc", "cr", "nc"]
+    for i, carrier in enumerate(carriers, start=1):
+        uri = f"https://bcld.info/works/{i}"
+        db_session.add(
+            Work(
+                id=i,
+                uuid=str(uuid.uuid4()),
+                uri=uri,
+                data={
+                    "@id": uri,
+                    "@type": "Work",
+                    CARRIER: {
+                        "@id": f"http://id.loc.gov/vocabulary/carriers/{carrier}"
+                    },
+                },
+            )
+        )
+    db_session.commit()
+
+
+def test_search_contains(client: TestClient, db_session: Session):
+    add_carrier_works(db_session)
+    # written the way the stored JSON-LD has it
+    fragment = {CARRIER: db_session.get(Work, 1).data[CARRIER]}
+
+    response = client.get("/search/contains", params={"fragment": json.dumps(fragment)})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["id"] for result in results] == [1, 2, 4]
+    assert set(results[0]) == {"id", "uri", "uuid", "type", "updated_at"}
+    assert results[0]["uri"] == "https://bcld.info/works/1"
+
+
+def test_search_contains_keyset_pages(client: TestClient, db_session: Session):
+    add_carrier_works(db_session)
+    fragment = json.dumps({CARRIER: db_session.get(Work, 1).data[CARRIER]})
+
+    first_page = client.get(
+        "/search/contains", params={"fragment": fragment, "limit": 2}
+    ).json()
+    assert [result["id"] for result in first_page["results"]] == [1, 2]
+    assert first_page["links"]["next"].endswith("&after=2")
+
+    second_page = client.get(
+        "/search/contains", params={"fragment": fragment, "limit": 2, "after": 2}
+    ).json()
+    assert [result["id"] for result in second_page["results"]] == [4]
+    assert second_page["links"]["next"] is None
+
+
+def test_search_contains_projection(client: TestClient, db_session: Session):
+    add_carrier_works(db_session)
+    fragment = {"@id": "https://bcld.info/works/3", "@context": {}}
+
+    response = client.get(
+        "/search/contains",
+        params={"fragment": json.dumps(fragment), "fields": ["uri", "data"]},
+    )
+    (result,) = response.json()["results"]
+    assert set(result) == {"id", "uri", "data"}
+    assert result["data"]["@id"] == "https://bcld.info/works/3"
+
+
+@pytest.mark.parametrize("fragment", ["not json", "[1, 2]", "{}"])
+def test_search_contains_bad_fragment(client: TestClient, fragment: str):
+    response = client.get("/search/contains", params={"fragment": fragment})
+    assert response.status_code == 422
+
+
+def test_search_statement_timeout(client: TestClient, app, db_session: Session):
+    async def slow_search_db(db: AsyncSession = Depends(get_async_db)):
+        await set_statement_timeout(db, 10)
+        await db.execute(text("SELECT pg_sleep(1)"))
+        return db
+
+    app.dependency_overrides[get_search_db] = slow_search_db
+    try:
+        response = client.get("/search/", params={"q": "kumae"})
+    finally:
+        del app.dependency_overrides[get_search_db]
+        db_session.rollback()
+    assert response.status_code == 503
+
+
 if __name__ == "__main__":
     pytest.main()
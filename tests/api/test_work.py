@@ -10,7 +10,9 @@ from bluecore_models.models import (
     Work,
 )
 from bluecore_models.utils.graph import BF, CONTEXT, init_graph, load_jsonld
+from rdflib.compare import isomorphic
 
+from bluecore_api.app.utils.serialize.binary import decode_graph
 from bluecore_api.constants import CONTEXT_URL
 
 test_work_uuid = "370ccc0a-3280-4036-9ca1-d9b5d5daf7df"
@@ -180,6 +182,34 @@ def test_get_work_turtle(client, db_session):
     assert response.headers["Content-Type"].startswith("text/turtle")
 
 
+def test_get_expanded_work_streamed(client, db_session):
+    add_test_expanded_work(db_session)
+
+    response = client.get(f"/works/{expanded_work_uuid}.nt?expand=true")
+    assert response.status_code == 200
+    assert len(rdflib.Graph().parse(data=response.text, format="nt")) == 5
+
+    response = client.get(f"/works/{expanded_work_uuid}.ttl")
+    assert response.status_code == 200
+    assert len(rdflib.Graph().parse(data=response.text, format="turtle")) == 2
+
+
+def test_get_expanded_work_binary_rdf(client, db_session):
+    add_test_expanded_work(db_session)
+
+    response = client.get(
+        f"/works/{expanded_work_uuid}?expand=true",
+        headers={"Accept": "application/vnd.bluecore.rdf"},
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/vnd.bluecore.rdf"
+    assert len(decode_graph(response.content)) == 5
+
+    response = client.get(f"/works/{expanded_work_uuid}.brdf")
+    assert response.status_code == 200
+    assert isomorphic(decode_graph(response.content), expanded_work_graph)
+
+
 def test_get_work_html(client, db_session):
     add_test_work(db_session)
 
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import pytest
-from bluecore_models.models import Instance, Work
+from bluecore_models.models import Instance, ResourceBase, Version, Work
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
@@ -196,5 +196,22 @@ def test_instance_entry_point_update(client: TestClient, db_session: Session) ->
     assert ChangeSetSchema(**response.json()) == as_schema
 
 
+def test_change_set_query_count(
+    client: TestClient, db_session: Session, query_budget
+) -> None:
+    add_works(db_session, start_index=0)
+    update_works(db_session, start_index=0)
+    db_session.expunge_all()
+
+    # the statement timeout, the feed's validators, the count and one page of
+    # versions joined to their resources
+    with query_budget(4) as statements:
+        response = client.get("/change_documents/works/page/1")
+    assert response.status_code == 200
+    assert len(response.json()["orderedItems"]) == TEST_PAGE_LENGTH
+    for table in (Version.__table__, ResourceBase.__table__):
+        assert f"{table.name}.data AS" not in statements[-1]
+
+
 if __name__ == "__main__":
     pytest.main()
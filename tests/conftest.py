@@ -26,6 +26,13 @@ from pytest_mock_resources import (
     StaticStatements,
     create_postgres_fixture,
 )
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
 
 if os.getenv("DATABASE_URL") is None:
     os.environ["DATABASE_URL"] = (
@@ -41,6 +48,8 @@ os.environ["API_KEYCLOAK_CLIENT_SECRET"] = "abcded235"
 
 os.environ["ACTIVITY_STREAMS_PAGE_LENGTH"] = "2"
 os.environ["ACTIVITY_STREAMS_HOST"] = "http://127.0.0.1:3000"
+# test_cpu_pool.py covers the process pool
+os.environ["CPU_POOL_KIND"] = "thread"
 
 
 @pytest.fixture(scope="session")
@@ -127,8 +136,62 @@ async def mcp_client(app):
         yield ac, headers
 
 
+@pytest.fixture
+def query_budget(db_session):
+    """
+    N+1 detector: fails the test if the block runs more than `max_queries`
+    SQL statements, and lists the statements it ran.
+
+        with query_budget(2) as statements:
+            client.get("/search/")
+    """
+    engine = db_session.get_bind()
+
+    @contextmanager
+    def budget(max_queries: int):
+        statements: list[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        if len(statements) > max_queries:
+            pytest.fail(
+                f"{len(statements)} queries, expected at most {max_queries}:\n"
+                + "\n".join(" ".join(s.split()) for s in statements)
+            )
+
+    return budget
+
+
+class _AsyncSessionAdapter:
+    """
+    Presents db_session through the AsyncSession methods the read routes use.
+    Reads then see rows a test added without committing, just as they did
+    when every route shared the sync session.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+    async def scalar(self, *args, **kwargs):
+        return self.session.scalar(*args, **kwargs)
+
+    async def execute(self, *args, **kwargs):
+        return self.session.execute(*args, **kwargs)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.session, *args, **kwargs)
+
+
 @pytest.fixture
 def client(mocker, db_session, app):
+    from bluecore_api.materialized import resource_expansions
+
     Base.metadata.create_all(
         bind=db_session.get_bind(),
         tables=[
@@ -142,10 +205,24 @@ def client(mocker, db_session, app):
             ResourceBibframeClass.__table__,
             Version.__table__,
             Work.__table__,
+            resource_expansions,
         ],
     )
 
-    from bluecore_api.database import get_db, get_session_maker
+    from bluecore_api.database import get_async_db, get_db, get_session_maker
+    from bluecore_api.other_resource_cache import other_resource_cache
+    from bluecore_api.query_stats import instrument
+    from bluecore_api.representation_cache import representation_cache
+
+    # the database is new for each test, so are the resources' versions
+    representation_cache.clear()
+    other_resource_cache.clear()
+
+    # log per-request query stats for the test database too
+    instrument(db_session.get_bind())
+
+    async def override_get_async_db():
+        yield _AsyncSessionAdapter(db_session)
 
     def override_get_db():
         db = db_session
@@ -167,6 +244,7 @@ def client(mocker, db_session, app):
         return use_existing_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.dependency_overrides[get_session_maker] = override_get_session_maker
 
     with TestClient(app) as c:
@@ -176,6 +254,30 @@ def client(mocker, db_session, app):
     Base.metadata.drop_all(bind=db_session.get_bind())
 
 
+@pytest.fixture
+def async_db_client(client, app, db_session):
+    """
+    `client` with the read routes on a real AsyncSession over asyncpg, as in
+    production, so a lazy load outside `run_sync` fails (MissingGreenlet)
+    instead of passing on db_session. Rows must be committed to be read.
+    """
+    from bluecore_api.database import async_db_url, get_async_db
+
+    engine = create_async_engine(
+        async_db_url(db_session.get_bind().url), poolclass=NullPool
+    )
+    session_maker = async_sessionmaker(
+        bind=engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+    )
+
+    async def override_get_async_db():
+        async with session_maker() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield client
+
+
 class _StubKeycloak:
     """
     Stand-in for the external Keycloak Server.
@@ -0,0 +1,83 @@
+"""The read routes on a real AsyncSession, where a lazy load outside run_sync fails."""
+
+import json
+import pathlib
+
+import pytest
+from bluecore_models.models import (
+    BibframeOtherResources,
+    Instance,
+    OtherResource,
+    Work,
+)
+
+work_uuid = "370ccc0a-3280-4036-9ca1-d9b5d5daf7df"
+instance_uuid = "75d831b9-e0d6-40f0-abb3-e9130622eb8a"
+
+
+def add_resources(db_session):
+    work = Work(
+        id=1,
+        uuid=work_uuid,
+        uri=f"https://api.sinopia.io/resources/{work_uuid}",
+        data=json.loads(pathlib.Path("tests/blue-core-work.jsonld").read_text()),
+    )
+    instance = Instance(
+        id=2,
+        uuid=instance_uuid,
+        uri=f"https://bluecore.info/instances/{instance_uuid}",
+        data=json.loads(pathlib.Path("tests/blue-core-instance.jsonld").read_text()),
+        work=work,
+    )
+    language = OtherResource(
+        id=3,
+        uri="http://id.loc.gov/vocabulary/languages/eng",
+        data=json.loads(
+            pathlib.Path("tests/blue-core-other-resources.json").read_text()
+        ),
+    )
+    db_session.add_all([work, instance, language])
+    for resource in (work, instance):
+        db_session.add(
+            BibframeOtherResources(other_resource=language, bibframe_resource=resource)
+        )
+    db_session.commit()
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        f"/works/{work_uuid}",
+        f"/works/{work_uuid}.jsonld",
+        f"/works/{work_uuid}.jsonld?expand=true",
+        f"/works/{work_uuid}.jsonld?expand=language",
+        f"/works/{work_uuid}.vnd.sinopia.json",
+        f"/works/{work_uuid}.ttl?expand=true",
+        f"/works/{work_uuid}.rdf",
+        f"/instances/{instance_uuid}.nt?expand=true",
+        f"/instances/{instance_uuid}.cbd.xml",
+        f"/instances/{instance_uuid}.html",
+        "/resources/3",
+        "/search/?q=kumae",
+        "/change_documents/works/feed",
+        "/change_documents/instances/page/1",
+    ],
+)
+def test_read_routes(async_db_client, db_session, path):
+    add_resources(db_session)
+
+    response = async_db_client.get(path)
+
+    assert response.status_code == 200
+
+
+def test_batch_get(async_db_client, db_session):
+    add_resources(db_session)
+
+    response = async_db_client.post(
+        "/resources/batch-get",
+        json={"uuids": [work_uuid, instance_uuid], "format": "nt", "expand": True},
+    )
+
+    assert response.status_code == 200
+    assert response.text
@@ -0,0 +1,160 @@
+import json
+import pathlib
+from datetime import UTC, datetime, timedelta
+
+from bluecore_models.models import BibframeOtherResources, OtherResource, Work
+from fastapi import Request
+
+from bluecore_api.conditional import make_validators
+
+work_uuid = "370ccc0a-3280-4036-9ca1-d9b5d5daf7df"
+work_data = json.loads(pathlib.Path("tests/blue-core-work.jsonld").read_text())
+LAST_MODIFIED = datetime(2025, 3, 1, 12, 30, 15, 250000, tzinfo=UTC)
+
+
+def make_request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+def test_validators_headers():
+    validators = make_validators(LAST_MODIFIED, "abc", "ttl", False)
+    headers = validators.headers()
+    assert headers["ETag"].startswith('"') and headers["ETag"].endswith('"')
+    assert headers["Last-Modified"] == "Sat, 01 Mar 2025 12:30:15 GMT"
+    assert validators.etag != make_validators(LAST_MODIFIED, "abc", "nt", False).etag
+
+
+def test_if_none_match():
+    validators = make_validators(LAST_MODIFIED, "abc")
+    assert validators.matches(make_request(if_none_match=validators.etag))
+    assert validators.matches(make_request(if_none_match=f'"x", W/{validators.etag}'))
+    assert validators.matches(make_request(if_none_match="*"))
+    assert not validators.matches(make_request(if_none_match='"x"'))
+    # If-None-Match wins over If-Modified-Since
+    last_modified = validators.headers()["Last-Modified"]
+    assert not validators.matches(
+        make_request(if_none_match='"x"', if_modified_since=last_modified)
+    )
+
+
+def test_if_modified_since():
+    validators = make_validators(LAST_MODIFIED, "abc")
+    last_modified = validators.headers()["Last-Modified"]
+    assert validators.matches(make_request(if_modified_since=last_modified))
+    assert not validators.matches(
+        make_request(if_modified_since="Sat, 01 Mar 2025 12:30:14 GMT")
+    )
+    assert not validators.matches(make_request(if_modified_since="not a date"))
+    assert not validators.matches(make_request())
+
+
+def add_work(db_session) -> Work:
+    work = Work(
+        id=1,
+        uuid=work_uuid,
+        uri=f"https://api.sinopia.io/resources/{work_uuid}",
+        data=work_data,
+    )
+    db_session.add(work)
+    db_session.commit()
+    return work
+
+
+def test_work_not_modified(client, db_session, query_budget):
+    add_work(db_session)
+    response = client.get(f"/works/{work_uuid}.jsonld")
+    etag = response.headers["ETag"]
+    assert "Last-Modified" not in response.headers
+
+    # answered from the metadata query alone
+    with query_budget(1):
+        response = client.get(
+            f"/works/{work_uuid}.jsonld", headers={"If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    # other representations have their own ETag
+    response = client.get(f"/works/{work_uuid}.ttl", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_work_etag_changes_with_updates(client, db_session):
+    work = add_work(db_session)
+    etag = client.get(f"/works/{work_uuid}.jsonld").headers["ETag"]
+
+    work.updated_at = work.updated_at + timedelta(seconds=1)
+    db_session.commit()
+    response = client.get(f"/works/{work_uuid}.jsonld", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_no_last_modified_when_links_can_shrink(client, db_session):
+    work = add_work(db_session)
+    other = OtherResource(id=5, uri="https://example.com/5", data={"a": 1})
+    other.updated_at = work.updated_at + timedelta(days=1)
+    db_session.add(BibframeOtherResources(other_resource=other, bibframe_resource=work))
+    db_session.commit()
+    response = client.get(f"/works/{work_uuid}.jsonld?expand=true")
+    assert "Last-Modified" not in response.headers
+    since = make_validators(other.updated_at).headers()["Last-Modified"]
+
+    # removing the newest link moves the latest date back, not forward
+    response = client.delete("/resources/5", headers={"X-User": "cataloger"})
+    assert response.status_code == 204
+    response = client.get(
+        f"/works/{work_uuid}.jsonld?expand=true",
+        headers={"If-Modified-Since": since},
+    )
+    assert response.status_code == 200
+
+
+def test_other_resource_not_modified(client, db_session):
+    db_session.add(OtherResource(id=5, uri="https://example.com/5", data={"a": 1}))
+    db_session.commit()
+    response = client.get("/resources/5")
+    last_modified = response.headers["Last-Modified"]
+
+    response = client.get("/resources/5", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+
+def test_feed_not_modified(client, db_session):
+    add_work(db_session)
+    response = client.get("/change_documents/works/page/1")
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        "/change_documents/works/page/1", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert client.get("/change_documents/works/feed").headers["ETag"] != etag
+
+
+def test_feed_has_no_last_modified(client, db_session):
+    add_work(db_session)
+    response = client.get("/change_documents/works/page/1")
+    etag = response.headers["ETag"]
+    assert "Last-Modified" not in response.headers
+
+    # the deleted Work's versions go with it, and the feed changes
+    response = client.delete(f"/works/{work_uuid}", headers={"X-User": "cataloger"})
+    assert response.status_code == 204
+    response = client.get(
+        "/change_documents/works/page/1", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert "Last-Modified" not in response.headers
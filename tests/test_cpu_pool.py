@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import pathlib
+import threading
+
+import pytest
+from bluecore_models.utils.graph import load_jsonld
+from rdflib import Graph
+from rdflib.compare import isomorphic
+from starlette.requests import ClientDisconnect
+
+from bluecore_api.app.utils.serialize.response_generator import write_graph
+from bluecore_api.cpu_pool import (
+    CpuPool,
+    CpuPoolUnavailable,
+    OffloadedResponse,
+    cpu_pool,
+    rendered,
+    spool,
+)
+
+work_data = json.loads(pathlib.Path("tests/blue-core-work.jsonld").read_text())
+release = threading.Event()
+
+
+def write_body(destination: str) -> None:
+    with spool(destination) as out:
+        out.write(b"body")
+
+
+def wait_for_release() -> str:
+    release.wait(5)
+    return "released"
+
+
+@pytest.fixture(autouse=True)
+def reset_release():
+    release.clear()
+    yield
+    release.set()
+
+
+@pytest.mark.asyncio
+async def test_run_records_timings():
+    pool = CpuPool(kind="thread", workers=2)
+
+    assert await pool.run(sum, [1, 2, 3]) == 6
+
+    snapshot = pool.snapshot()
+    assert (snapshot["submitted"], snapshot["completed"], snapshot["active"]) == (
+        1,
+        1,
+        0,
+    )
+    assert sum(snapshot["queue_wait"]["histogram"].values()) == 1
+    assert sum(snapshot["execution"]["histogram"].values()) == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_full_pool_rejects():
+    pool = CpuPool(kind="thread", workers=1, max_queue=1)
+    task = asyncio.ensure_future(pool.run(wait_for_release))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(CpuPoolUnavailable):
+        await pool.run(sum, [1])
+
+    release.set()
+    assert await task == "released"
+    assert pool.snapshot()["rejected"] == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout():
+    pool = CpuPool(kind="thread", workers=1, timeout=0.05)
+
+    with pytest.raises(CpuPoolUnavailable):
+        await pool.run(wait_for_release)
+
+    assert pool.snapshot()["timeouts"] == 1
+    # the running task still counts until it finishes
+    assert pool.snapshot()["active"] == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_writes_graph(tmp_path):
+    pool = CpuPool(kind="process", workers=1)
+    destination = tmp_path / "body.rdf"
+    destination.touch()
+
+    await pool.run(write_graph, str(destination), [work_data], [], "xml")
+
+    graph = Graph().parse(destination, format="xml")
+    assert isomorphic(graph, load_jsonld(work_data))
+    assert pool.snapshot()["completed"] == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_starts_a_new_pool():
+    pool = CpuPool(kind="process", workers=1)
+
+    # the worker exits as if it had been killed
+    with pytest.raises(CpuPoolUnavailable):
+        await pool.run(os._exit, 1)
+
+    assert await pool.run(sum, [1, 2, 3]) == 6
+    snapshot = pool.snapshot()
+    assert (snapshot["restarts"], snapshot["failed"], snapshot["active"]) == (1, 1, 0)
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_submit_to_broken_pool():
+    pool = CpuPool(kind="thread", workers=1)
+    pool._get_executor().shutdown()
+
+    with pytest.raises(CpuPoolUnavailable):
+        await pool.run(sum, [1])
+
+    # the slot was given back, and the next task gets a working pool
+    assert pool.snapshot()["active"] == 0
+    assert await pool.run(sum, [1, 2]) == 3
+    assert pool.snapshot()["restarts"] == 1
+    pool.shutdown()
+
+
+def test_full_pool_is_503(client, monkeypatch):
+    monkeypatch.setattr(cpu_pool, "max_queue", 0)
+
+    response = client.post(
+        "/marc2bibframe",
+        headers={"X-User": "cataloger", "Content-Type": "application/xml"},
+        content=b"<collection/>",
+    )
+
+    assert response.status_code == 503
+    assert cpu_pool.snapshot()["rejected"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_unsent_body_is_removed():
+    response = await rendered(OffloadedResponse(write_body, media_type="text/plain"))
+    assert os.path.exists(response.path)
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        # the client is gone before the body is read
+        raise OSError("disconnected")
+
+    scope = {
+        "type": "http",
+        "asgi": {"spec_version": "2.4"},
+        "method": "GET",
+        "path": "/",
+        "headers": [],
+    }
+    with pytest.raises(ClientDisconnect):
+        await response(scope, receive, send)
+    assert not os.path.exists(response.path)
@@ -0,0 +1,99 @@
+import uuid
+
+from bluecore_models.models import (
+    BibframeOtherResources,
+    Hub,
+    Instance,
+    OtherResource,
+    Work,
+)
+
+from bluecore_api import deletion
+from bluecore_api.shared_cache import invalidations
+
+
+def add_hierarchy(db_session, works: int, instances_per_work: int):
+    hub = Hub(id=1, uri="https://bcld.info/hubs/1", data={"@id": "hub"})
+    language = OtherResource(
+        id=2,
+        uri="http://id.loc.gov/vocabulary/languages/eng",
+        data={"@id": "http://id.loc.gov/vocabulary/languages/eng"},
+    )
+    db_session.add_all([hub, language])
+    db_session.flush()
+    next_id = 3
+    for _ in range(works):
+        work = Work(
+            id=next_id, uri=f"https://bcld.info/works/{next_id}", data={}, hub_id=1
+        )
+        db_session.add(work)
+        db_session.add(
+            BibframeOtherResources(other_resource=language, bibframe_resource=work)
+        )
+        next_id += 1
+        for _ in range(instances_per_work):
+            instance = Instance(
+                id=next_id,
+                uri=f"https://bcld.info/instances/{next_id}",
+                data={},
+                work=work,
+            )
+            db_session.add(instance)
+            db_session.add(
+                BibframeOtherResources(
+                    other_resource=language, bibframe_resource=instance
+                )
+            )
+            next_id += 1
+    db_session.commit()
+
+
+def test_delete_hub_counts(client, db_session):
+    add_hierarchy(db_session, works=3, instances_per_work=2)
+
+    counts = deletion.delete_hub(db_session, 1)
+    db_session.commit()
+
+    assert counts["instances"] == 6
+    assert counts["works"] == 3
+    assert counts["hubs"] == 1
+    assert counts["bibframe_other_resources"] == 9
+    assert counts["resource_base"] == 10
+    assert db_session.query(Hub).count() == 0
+    assert db_session.query(Work).count() == 0
+    assert db_session.query(Instance).count() == 0
+    # the linked Other Resource is left alone
+    assert db_session.query(OtherResource).count() == 1
+
+
+def test_delete_other_resource_removes_links_to_it(client, db_session):
+    add_hierarchy(db_session, works=2, instances_per_work=1)
+
+    counts = deletion.delete_other_resource(db_session, 2)
+    db_session.commit()
+
+    assert counts["bibframe_other_resources"] == 4
+    assert db_session.query(BibframeOtherResources).count() == 0
+    assert db_session.query(OtherResource).count() == 0
+    assert db_session.query(Work).count() == 2
+
+
+def test_delete_hub_invalidates_the_cascade(client, db_session, monkeypatch):
+    add_hierarchy(db_session, works=2, instances_per_work=1)
+    resources = [*db_session.query(Hub), *db_session.query(Work)]
+    resources += db_session.query(Instance)
+    for resource in resources:
+        resource.uuid = uuid.uuid4()
+    db_session.commit()
+    expected = {str(resource.uuid) for resource in resources}
+    published = []
+    monkeypatch.setattr(
+        invalidations, "publish", lambda namespace, group: published.append(group)
+    )
+
+    hub_uuid = db_session.get(Hub, 1).uuid
+    response = client.delete(f"/hubs/{hub_uuid}", headers={"X-User": "cataloger"})
+
+    assert response.status_code == 204
+    assert len(expected) == 5
+    assert set(published) == expected
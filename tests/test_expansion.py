@@ -0,0 +1,73 @@
+import json
+import pathlib
+
+import rdflib
+from bluecore_models.models import BibframeOtherResources, OtherResource, Work
+from bluecore_models.utils.graph import BF, CONTEXT, init_graph, load_jsonld
+from rdflib.compare import isomorphic
+
+from bluecore_api.app.utils.serialize.response_generator import as_jsonld
+from bluecore_api.constants import CONTEXT_URL
+from bluecore_api.expansion import expand_resource_as_graph, expand_resource_graph
+
+work_uri = rdflib.URIRef("https://bcld.info/works/7b7ed475")
+languages = {
+    "http://id.loc.gov/vocabulary/languages/eng": "tests/blue-core-other-resources.json",
+    "http://id.loc.gov/vocabulary/languages/kor": "tests/blue-core-other-resources2.json",
+}
+
+
+def expanded_work() -> Work:
+    graph = init_graph()
+    graph.add((work_uri, rdflib.RDF.type, BF.Work))
+    for uri in languages:
+        graph.add((work_uri, BF.language, rdflib.URIRef(uri)))
+    work = Work(uri=str(work_uri), data=json.loads(graph.serialize(format="json-ld")))
+    for i, (uri, path) in enumerate(languages.items()):
+        other = OtherResource(
+            id=i, uri=uri, data=json.loads(pathlib.Path(path).read_text())
+        )
+        work.other_resources.append(
+            BibframeOtherResources(other_resource=other, bibframe_resource=work)
+        )
+    return work
+
+
+def round_trip_expansion(work: Work) -> rdflib.Graph:
+    """Expansion as it was: serialize each other resource and parse it again."""
+    graph = load_jsonld(work.data)
+    for row in work.other_resources:
+        other_graph = load_jsonld(row.other_resource.data)
+        graph.parse(data=other_graph.serialize(format="json-ld"), format="json-ld")
+    return graph
+
+
+def test_expand_resource_as_graph():
+    work = expanded_work()
+
+    graph = expand_resource_as_graph(work, load_jsonld(work.data))
+
+    assert isomorphic(graph, round_trip_expansion(work))
+
+
+def test_expand_resource_graph():
+    work = expanded_work()
+    stored = json.dumps(work.data)
+
+    data = expand_resource_graph(work)
+
+    # checked first: load_jsonld adds a missing @context to what it's given
+    assert json.dumps(work.data) == stored
+    assert data["@id"] == str(work_uri)
+    assert isomorphic(
+        load_jsonld({**data, "@context": CONTEXT}), round_trip_expansion(work)
+    )
+
+
+def test_expanded_jsonld_response():
+    work = expanded_work()
+
+    body = json.loads(as_jsonld(work, expand=True).body)
+
+    assert body["@id"] == str(work_uri)
+    assert body["@context"] == CONTEXT_URL
@@ -0,0 +1,160 @@
+import json
+import pathlib
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import rdflib
+from bluecore_models.models import BibframeOtherResources, OtherResource, Work
+from bluecore_models.utils.graph import BF, CONTEXT, init_graph, load_jsonld
+from sqlalchemy import select, update
+
+from bluecore_api import materialized
+from bluecore_api.materialized import resource_expansions
+
+work_uuid = "8c3a0f1e-2f4b-4f43-9c6e-5a3a0d7f1b21"
+work_uri = rdflib.URIRef(f"https://bcld.info/works/{work_uuid}")
+eng_uri = "http://id.loc.gov/vocabulary/languages/eng"
+eng_data = json.loads(pathlib.Path("tests/blue-core-other-resources.json").read_text())
+UPDATED_AT = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(materialized, "ENABLED", True)
+
+
+def add_work(db_session) -> Work:
+    graph = init_graph()
+    graph.add((work_uri, rdflib.RDF.type, BF.Work))
+    graph.add((work_uri, BF.language, rdflib.URIRef(eng_uri)))
+    work = Work(
+        id=1,
+        uuid=work_uuid,
+        uri=str(work_uri),
+        data=json.loads(graph.serialize(format="json-ld")),
+        updated_at=UPDATED_AT,
+    )
+    other = OtherResource(id=2, uri=eng_uri, data=eng_data, updated_at=UPDATED_AT)
+    db_session.add_all(
+        [
+            work,
+            other,
+            BibframeOtherResources(id=1, other_resource=other, bibframe_resource=work),
+        ]
+    )
+    db_session.commit()
+    return work
+
+
+def stored(db_session) -> dict:
+    return db_session.scalar(
+        select(resource_expansions.c.data).where(resource_expansions.c.resource_id == 1)
+    )
+
+
+def mark(db_session) -> None:
+    """Replace the stored expansion so a response shows where it came from."""
+    db_session.execute(
+        update(resource_expansions).values(data={"@id": "urn:materialized"})
+    )
+    db_session.commit()
+
+
+def test_expanded_get_reads_row(client, db_session, query_budget):
+    materialized.refresh(db_session, add_work(db_session))
+    assert len(load_jsonld({**stored(db_session), "@context": CONTEXT})) == 5
+    mark(db_session)
+
+    with query_budget(3):
+        response = client.get(f"/works/{work_uuid}.jsonld?expand=true")
+
+    assert response.json()["@id"] == "urn:materialized"
+    response = client.get(
+        f"/works/{work_uuid}?expand=true",
+        headers={"Accept": "application/vnd.sinopia+json"},
+    )
+    assert response.json()["data"]["@id"] == "urn:materialized"
+    # other formats, and unexpanded JSON-LD, don't use it
+    response = client.get(f"/works/{work_uuid}.jsonld")
+    assert response.json()["@id"] == str(work_uri)
+
+
+def test_stale_row_is_ignored(client, db_session):
+    work = add_work(db_session)
+    materialized.refresh(db_session, work)
+    mark(db_session)
+
+    # an edit to the other resource made outside the API
+    db_session.get(OtherResource, 2).updated_at = UPDATED_AT + timedelta(seconds=1)
+    db_session.commit()
+
+    response = client.get(f"/works/{work_uuid}.jsonld?expand=true")
+    assert response.json()["@id"] == str(work_uri)
+
+
+def test_other_resource_update_rebuilds(client, db_session):
+    materialized.refresh(db_session, add_work(db_session))
+    mark(db_session)
+
+    response = client.put(
+        "/resources/2",
+        headers={"X-User": "cataloger"},
+        json={"data": json.dumps(eng_data)},
+    )
+    assert response.status_code == 200
+
+    assert stored(db_session)["@id"] == str(work_uri)
+    response = client.get(f"/works/{work_uuid}.jsonld?expand=true")
+    assert response.json()["@id"] == str(work_uri)
+
+
+def test_work_update_builds_row_in_background(client, db_session):
+    add_work(db_session)
+    graph = init_graph()
+    graph.add((work_uri, rdflib.RDF.type, BF.Work))
+    graph.add((work_uri, BF.language, rdflib.URIRef(eng_uri)))
+
+    response = client.put(
+        f"/works/{work_uuid}",
+        headers={"X-User": "cataloger"},
+        json={"data": graph.serialize(format="json-ld")},
+    )
+    assert response.status_code == 200
+
+    # the test client runs background tasks before it returns
+    assert stored(db_session)["@id"] == str(work_uri)
+    assert materialized.check(db_session)["stale"] == []
+
+
+def test_rebuild_and_check(client, db_session):
+    add_work(db_session)
+
+    assert materialized.check(db_session)["missing"] == [1]
+    assert materialized.rebuild(db_session, limit=1) == {"rebuilt": 1, "next": 1}
+    assert materialized.rebuild(db_session, after=1) == {"rebuilt": 0, "next": None}
+
+    report = materialized.check(db_session)
+    assert (report["checked"], report["missing"], report["stale"]) == (1, [], [])
+    assert report["mismatched"] == []
+
+    mark(db_session)
+    assert materialized.check(db_session)["mismatched"] == [1]
+
+    db_session.get(Work, 1).updated_at = UPDATED_AT + timedelta(seconds=1)
+    db_session.commit()
+    assert materialized.check(db_session)["stale"] == [1]
+
+
+def test_rebuild_route_needs_update_role(client, db_session):
+    add_work(db_session)
+
+    read_only = client.post(
+        "/internal/expansions/rebuild", headers={"X-User": "cataloger-conflicting"}
+    )
+    anonymous = client.post("/internal/expansions/rebuild")
+    response = client.post(
+        "/internal/expansions/rebuild", headers={"X-User": "cataloger"}
+    )
+
+    assert (read_only.status_code, anonymous.status_code) == (403, 403)
+    assert response.json() == {"rebuilt": 1, "next": None}
@@ -0,0 +1,101 @@
+import json
+import pathlib
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from bluecore_models.models import OtherResource
+from bluecore_models.utils.graph import load_jsonld
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from bluecore_api.other_resource_cache import OtherResourceCache, other_resource_cache
+from bluecore_api.shared_cache import invalidations
+
+UPDATED_AT = datetime(2025, 1, 1, tzinfo=UTC)
+eng_data = json.loads(pathlib.Path("tests/blue-core-other-resources.json").read_text())
+
+
+def make_other(id=2, updated_at=UPDATED_AT, data=eng_data):
+    return SimpleNamespace(id=id, updated_at=updated_at, data=data)
+
+
+def test_hit_and_miss():
+    cache = OtherResourceCache(max_bytes=1024 * 1024)
+
+    first = cache.triples(make_other())
+    second = cache.triples(make_other())
+
+    assert second is first
+    assert isomorphic(cache.add_to(Graph(), make_other()), load_jsonld(eng_data))
+    snapshot = cache.snapshot()
+    assert (snapshot["hits"], snapshot["misses"]) == (2, 1)
+    assert snapshot["hit_rate"] == 0.6667
+
+
+def test_key_follows_updated_at():
+    cache = OtherResourceCache(max_bytes=1024 * 1024)
+    cache.triples(make_other())
+    cache.triples(make_other(updated_at=UPDATED_AT + timedelta(seconds=1)))
+
+    assert cache.snapshot()["misses"] == 2
+    assert cache.snapshot()["entries"] == 2
+
+
+def test_evicts_least_recently_used():
+    cache = OtherResourceCache(max_bytes=1024 * 1024)
+    cache.triples(make_other(1))
+    size = cache.snapshot()["bytes"]
+
+    cache = OtherResourceCache(max_bytes=size * 2)
+    for id in (1, 2, 1, 3):
+        cache.triples(make_other(id))
+
+    assert cache.snapshot()["evictions"] == 1
+    cache.triples(make_other(1))
+    assert cache.snapshot()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_disabled():
+    cache = OtherResourceCache(max_bytes=1024 * 1024)
+    cache.triples(make_other(2))
+    cache.triples(make_other(3))
+
+    await cache.invalidate(2)
+
+    assert cache.snapshot()["entries"] == 1
+    assert cache.snapshot()["invalidations"] == 1
+
+    disabled = OtherResourceCache(max_bytes=0)
+    disabled.triples(make_other())
+    assert disabled.snapshot()["entries"] == 0
+
+
+def test_invalidated_by_other_workers():
+    other_resource_cache.clear()
+    other_resource_cache.triples(make_other(2))
+
+    # what the invalidation channel delivers when another worker updates it
+    invalidations.publish("other_resources", 2)
+
+    assert other_resource_cache.snapshot()["entries"] == 0
+
+
+def test_update_invalidates(client, db_session):
+    db_session.add(
+        OtherResource(
+            id=2, uri="http://id.loc.gov/vocabulary/languages/eng", data=eng_data
+        )
+    )
+    db_session.commit()
+    other_resource_cache.triples(db_session.get(OtherResource, 2))
+    assert other_resource_cache.snapshot()["entries"] == 1
+
+    response = client.put(
+        "/resources/2",
+        headers={"X-User": "cataloger"},
+        json={"data": json.dumps(eng_data)},
+    )
+    assert response.status_code == 200
+    assert other_resource_cache.snapshot()["entries"] == 0
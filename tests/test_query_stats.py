@@ -0,0 +1,40 @@
+import logging
+
+from sqlalchemy import create_engine, text
+
+from bluecore_api.query_stats import QueryStats, current_query_stats, instrument
+
+
+def test_instrument_records_statements():
+    engine = create_engine("sqlite://")
+    instrument(engine)
+    instrument(engine)  # listeners are only added once
+
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+    finally:
+        current_query_stats.reset(token)
+
+    assert stats.count == 2
+    assert stats.total_time >= stats.slowest_time > 0
+    assert stats.slowest_statement in ("SELECT 1", "SELECT 2")
+
+
+def test_no_request_no_stats():
+    engine = create_engine("sqlite://")
+    instrument(engine)
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+    assert current_query_stats.get() is None
+
+
+def test_request_log(client, caplog):
+    with caplog.at_level(logging.INFO, logger="bluecore_api.query_stats"):
+        client.get("/search/")
+    assert any(
+        "GET /search/: 3 queries" in record.getMessage() for record in caplog.records
+    )
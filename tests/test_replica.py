@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from bluecore_api import replica
+
+
+@pytest.fixture(autouse=True)
+def clear_recent_writes():
+    replica._recent_writes.clear()
+    yield
+    replica._recent_writes.clear()
+
+
+def test_read_your_writes_window(mocker):
+    clock = mocker.patch("bluecore_api.replica.time.monotonic", return_value=100.0)
+
+    replica.record_write("cataloger")
+    assert replica.wrote_recently("cataloger")
+    assert not replica.wrote_recently("someone-else")
+
+    clock.return_value = 100.0 + replica.READ_YOUR_WRITES_SECONDS + 1
+    assert not replica.wrote_recently("cataloger")
+
+
+def test_anonymous_writes_are_not_tracked():
+    replica.record_write("anonymous")
+    replica.record_write(None)
+    assert replica._recent_writes == {}
+    assert not replica.wrote_recently("anonymous")
+
+
+class _Connection:
+    def __init__(self, lag):
+        self.lag = lag
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def scalar(self, query):
+        if isinstance(self.lag, Exception):
+            raise self.lag
+        return self.lag
+
+
+class _Engine:
+    def __init__(self, lag):
+        self.lag = lag
+        self.checks = 0
+
+    def connect(self):
+        self.checks += 1
+        return _Connection(self.lag)
+
+
+def test_lag_monitor_fails_over_when_behind():
+    engine = _Engine(replica.MAX_LAG_SECONDS + 10)
+    monitor = replica.ReplicaLagMonitor(engine)
+    assert asyncio.run(monitor.within_limit()) is False
+
+
+def test_lag_monitor_caches_checks():
+    engine = _Engine(0)
+    monitor = replica.ReplicaLagMonitor(engine)
+
+    async def check_twice():
+        return [await monitor.within_limit(), await monitor.within_limit()]
+
+    assert asyncio.run(check_twice()) == [True, True]
+    assert engine.checks == 1
+
+
+def test_lag_monitor_fails_over_on_error():
+    monitor = replica.ReplicaLagMonitor(_Engine(RuntimeError("replica down")))
+    assert asyncio.run(monitor.within_limit()) is False
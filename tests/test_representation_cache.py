@@ -0,0 +1,195 @@
+import json
+import pathlib
+import threading
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+from bluecore_models.models import Work
+from fastapi import Response
+
+from bluecore_api import shared_cache
+from bluecore_api.representation_cache import RepresentationCache, representation_cache
+from bluecore_api.selective_expansion import Expansion
+
+UPDATED_AT = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def make_doc(uuid="abc", updated_at=UPDATED_AT, links=()):
+    return SimpleNamespace(
+        uuid=uuid,
+        updated_at=updated_at,
+        other_resources=[
+            SimpleNamespace(other_resource=SimpleNamespace(id=id, updated_at=at))
+            for id, at in links
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_hit_and_miss():
+    cache = RepresentationCache(max_bytes=1024)
+    key = cache.key(make_doc(), "ttl", None)
+
+    assert await cache.get(key) is None
+    await cache.put(key, Response(content="<a> <b> <c> .", media_type="text/turtle"))
+    response = await cache.get(key)
+
+    assert response.body == b"<a> <b> <c> ."
+    assert response.media_type == "text/turtle"
+    assert cache.snapshot()["hits"] == 1
+    assert cache.snapshot()["misses"] == 1
+
+
+def test_key_follows_versions():
+    cache = RepresentationCache(max_bytes=1024)
+    later = UPDATED_AT + timedelta(seconds=1)
+    link = (7, UPDATED_AT)
+
+    assert cache.key(make_doc(), "nt", None) != cache.key(
+        make_doc(updated_at=later), "nt", None
+    )
+    # expanded bodies also change with the linked other resources
+    assert cache.key(make_doc(links=[link]), "nt", Expansion()) != cache.key(
+        make_doc(links=[(7, later)]), "nt", Expansion()
+    )
+    assert cache.key(make_doc(links=[link]), "nt", Expansion()) != cache.key(
+        make_doc(), "nt", Expansion()
+    )
+
+
+def test_only_graph_formats_are_cached():
+    cache = RepresentationCache(max_bytes=1024)
+    assert cache.key(make_doc(), "html", None) is None
+    assert cache.key(make_doc(), "cbd.xml", None) is None
+    assert cache.key(make_doc(), None, None) is None
+    assert RepresentationCache(max_bytes=0).key(make_doc(), "ttl", None) is None
+
+
+@pytest.mark.asyncio
+async def test_evicts_least_recently_used():
+    cache = RepresentationCache(max_bytes=10)
+    first, second, third = (
+        cache.key(make_doc(uuid), "nt", None) for uuid in ("a", "b", "c")
+    )
+    await cache.put(first, Response(content="1234"))
+    await cache.put(second, Response(content="1234"))
+    await cache.get(first)
+    await cache.put(third, Response(content="1234"))
+
+    assert await cache.get(second) is None
+    assert await cache.get(first) is not None
+    assert cache.snapshot()["evictions"] == 1
+    assert cache.snapshot()["bytes"] == 8
+
+
+@pytest.mark.asyncio
+async def test_invalidate():
+    cache = RepresentationCache(max_bytes=1024)
+    ttl = cache.key(make_doc(), "ttl", None)
+    nt = cache.key(make_doc(), "nt", None)
+    other = cache.key(make_doc("other"), "nt", None)
+    for key in (ttl, nt, other):
+        await cache.put(key, Response(content="x"))
+
+    await cache.invalidate("abc")
+
+    assert await cache.get(ttl) is None
+    assert await cache.get(nt) is None
+    assert await cache.get(other) is not None
+    assert cache.snapshot()["invalidations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_between_workers(monkeypatch):
+    monkeypatch.setattr(
+        "bluecore_api.shared_cache.client",
+        fakeredis.FakeRedis(server=fakeredis.FakeServer()),
+    )
+    first, second = RepresentationCache(max_bytes=1024), RepresentationCache(1024)
+    key = first.key(make_doc(), "ttl", None)
+
+    await first.put(key, Response(content="<a> <b> <c> .", media_type="text/turtle"))
+    response = await second.get(key)
+
+    assert response.body == b"<a> <b> <c> ."
+    assert response.media_type == "text/turtle"
+
+    await first.invalidate("abc")
+
+    assert await second.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_is_used_off_the_event_loop(monkeypatch):
+    client = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    monkeypatch.setattr(shared_cache, "client", client)
+    threads = set()
+    execute_command = client.execute_command
+
+    def recording(*args, **options):
+        threads.add(threading.current_thread())
+        return execute_command(*args, **options)
+
+    monkeypatch.setattr(client, "execute_command", recording)
+    cache = RepresentationCache(max_bytes=1024)
+    key = cache.key(make_doc(), "ttl", None)
+
+    await cache.put(key, Response(content="<a> <b> <c> .", media_type="text/turtle"))
+    assert (await cache.get(key)).body == b"<a> <b> <c> ."
+    await cache.invalidate("abc")
+
+    assert await cache.get(key) is None
+    # a slow server holds up a worker thread, not every request
+    assert threads and threading.current_thread() not in threads
+
+
+def test_work_route_uses_cache(client, db_session):
+    work_uuid = "370ccc0a-3280-4036-9ca1-d9b5d5daf7df"
+    db_session.add(
+        Work(
+            id=1,
+            uuid=work_uuid,
+            uri=f"https://api.sinopia.io/resources/{work_uuid}",
+            data=json.loads(pathlib.Path("tests/blue-core-work.jsonld").read_text()),
+        )
+    )
+    db_session.commit()
+
+    first = client.get(f"/works/{work_uuid}.ttl")
+    second = client.get(f"/works/{work_uuid}.ttl")
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["content-type"] == first.headers["content-type"]
+    assert representation_cache.snapshot()["hits"] == 1
+
+    response = client.delete(f"/works/{work_uuid}", headers={"X-User": "cataloger"})
+    assert response.status_code == 204
+    assert representation_cache.snapshot()["entries"] == 0
+
+
+def test_expanded_and_unexpanded_reads_are_cached_apart(client, db_session):
+    work_uuid = "370ccc0a-3280-4036-9ca1-d9b5d5daf7df"
+    db_session.add(
+        Work(
+            id=1,
+            uuid=work_uuid,
+            uri=f"https://api.sinopia.io/resources/{work_uuid}",
+            data=json.loads(pathlib.Path("tests/blue-core-work.jsonld").read_text()),
+        )
+    )
+    db_session.commit()
+
+    plain = client.get(f"/works/{work_uuid}.jsonld")
+    expanded = client.get(f"/works/{work_uuid}.jsonld", params={"expand": "true"})
+    assert plain.status_code == expanded.status_code == 200
+    assert representation_cache.snapshot()["entries"] == 2
+    assert representation_cache.snapshot()["hits"] == 0
+
+    assert client.get(f"/works/{work_uuid}.jsonld").content == plain.content
+    assert (
+        client.get(f"/works/{work_uuid}.jsonld", params={"expand": "true"}).content
+        == expanded.content
+    )
+    assert representation_cache.snapshot()["hits"] == 2
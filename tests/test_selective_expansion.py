@@ -0,0 +1,126 @@
+import json
+import pathlib
+
+import pytest
+import rdflib
+from bluecore_models.models import BibframeOtherResources, OtherResource, Work
+from bluecore_models.utils.graph import BF, init_graph
+from fastapi import HTTPException
+from rdflib import RDFS
+
+from bluecore_api.selective_expansion import Expansion, parse_expansion
+
+work_uuid = "5d1c8f0a-6b7e-4e2a-9f3c-2a8b7c6d5e41"
+work_uri = rdflib.URIRef(f"https://bcld.info/works/{work_uuid}")
+eng_uri = rdflib.URIRef("http://id.loc.gov/vocabulary/languages/eng")
+agent_uri = rdflib.URIRef("http://id.loc.gov/authorities/names/n00000001")
+place_uri = rdflib.URIRef("http://id.loc.gov/authorities/names/n00000002")
+eng_data = json.loads(pathlib.Path("tests/blue-core-other-resources.json").read_text())
+agent_data = {
+    "@id": str(agent_uri),
+    "@type": [str(BF.Agent)],
+    str(RDFS.label): [{"@value": "Yun, Yŏ-ch'ang"}],
+    str(BF.place): [{"@id": str(place_uri)}],
+}
+place_data = {"@id": str(place_uri), str(RDFS.label): [{"@value": "Seoul"}]}
+
+
+def add_work(db_session) -> None:
+    graph = init_graph()
+    contribution = rdflib.BNode()
+    graph.add((work_uri, rdflib.RDF.type, BF.Work))
+    graph.add((work_uri, BF.language, eng_uri))
+    graph.add((work_uri, BF.contribution, contribution))
+    graph.add((contribution, BF.agent, agent_uri))
+    work = Work(
+        id=1,
+        uuid=work_uuid,
+        uri=str(work_uri),
+        data=json.loads(graph.serialize(format="json-ld")),
+    )
+    db_session.add(work)
+    for id, (uri, data) in enumerate(
+        [(eng_uri, eng_data), (agent_uri, agent_data), (place_uri, place_data)],
+        start=2,
+    ):
+        other = OtherResource(id=id, uri=str(uri), data=data)
+        db_session.add_all(
+            [
+                other,
+                BibframeOtherResources(
+                    id=id, other_resource=other, bibframe_resource=work
+                ),
+            ]
+        )
+    db_session.commit()
+
+
+def expanded_subjects(client, query: str) -> set:
+    response = client.get(f"/works/{work_uuid}.nt?{query}")
+    assert response.status_code == 200
+    graph = rdflib.Graph().parse(data=response.text, format="nt")
+    return set(graph.subjects(RDFS.label)) | set(graph.subjects(BF.code))
+
+
+def test_parse_expansion():
+    assert parse_expansion("false") is None
+    assert parse_expansion("true") == Expansion()
+    assert parse_expansion("true").complete
+    assert parse_expansion("True", 2) == Expansion(depth=2)
+
+    expansion = parse_expansion("subject, contribution.agent")
+    assert expansion.paths == (
+        (str(BF.subject),),
+        (str(BF.contribution), str(BF.agent)),
+    )
+    assert expansion.depth == 1
+    assert not expansion.complete
+    assert str(expansion) == f"{BF.subject},{BF.contribution}.{BF.agent};depth=1"
+
+    with pytest.raises(HTTPException):
+        parse_expansion("contribution..agent")
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("expand=true", {eng_uri, agent_uri, place_uri}),
+        ("expand=language", {eng_uri}),
+        ("expand=contribution.agent", {agent_uri}),
+        ("expand=contribution.agent&depth=2", {agent_uri, place_uri}),
+        ("expand=true&depth=1", {eng_uri, agent_uri}),
+        ("expand=subject", set()),
+    ],
+)
+def test_selected_links(client, db_session, query, expected):
+    add_work(db_session)
+
+    assert expanded_subjects(client, query) == expected
+
+
+def test_selected_links_query_count(client, db_session, query_budget):
+    add_work(db_session)
+
+    # validators, the Work, then one query per level of depth
+    with query_budget(4):
+        response = client.get(
+            f"/works/{work_uuid}.jsonld?expand=contribution.agent&depth=2"
+        )
+
+    assert response.status_code == 200
+
+
+def test_selective_etag(client, db_session):
+    add_work(db_session)
+
+    language = client.get(f"/works/{work_uuid}.nt?expand=language")
+    agent = client.get(f"/works/{work_uuid}.nt?expand=contribution.agent")
+
+    assert language.headers["etag"] != agent.headers["etag"]
+
+
+def test_invalid_expansion(client, db_session):
+    add_work(db_session)
+
+    assert client.get(f"/works/{work_uuid}.nt?expand=.agent").status_code == 422
+    assert client.get(f"/works/{work_uuid}.nt?expand=true&depth=0").status_code == 422
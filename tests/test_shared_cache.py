@@ -0,0 +1,146 @@
+import time
+
+import fakeredis
+import pytest
+import redis
+
+from bluecore_api.shared_cache import (
+    Invalidations,
+    RedisBackend,
+    RedisInvalidations,
+)
+from bluecore_api.sized_lru import SizedLRU
+
+
+def make_backend(client, max_bytes=1024) -> RedisBackend:
+    return RedisBackend(client, "test", max_bytes, str.encode, bytes.decode)
+
+
+def wait_for(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def test_redis_backend_is_shared(server):
+    first = make_backend(fakeredis.FakeRedis(server=server))
+    second = make_backend(fakeredis.FakeRedis(server=server))
+
+    assert first.get(("abc", "nt")) is None
+    first.put(("abc", "nt"), "<a> <b> <c> .", 13)
+
+    assert second.get(("abc", "nt")) == "<a> <b> <c> ."
+    assert first.snapshot()["misses"] == 1
+    assert second.snapshot()["hits"] == 1
+
+
+def test_redis_backend_namespaces_keys(server):
+    client = fakeredis.FakeRedis(server=server)
+    backend = make_backend(client)
+    other = RedisBackend(client, "other", 1024, str.encode, bytes.decode)
+
+    backend.put(("abc", "nt"), "x", 1)
+
+    assert other.get(("abc", "nt")) is None
+    assert all(name.startswith(b"bluecore:test:abc") for name in client.scan_iter())
+
+
+def test_redis_backend_ttl_and_size(server):
+    client = fakeredis.FakeRedis(server=server)
+    backend = make_backend(client, max_bytes=4)
+
+    backend.put(("abc", "nt"), "x", 1, ttl=60)
+    backend.put(("abc", "ttl"), "too large", 9, ttl=60)
+
+    assert backend.get(("abc", "ttl")) is None
+    assert 0 < client.ttl(backend._name(("abc", "nt"))) <= 60
+    assert client.ttl(backend._group("abc")) == client.ttl(backend._name(("abc", "nt")))
+
+
+def test_redis_backend_invalidate(server):
+    backend = make_backend(fakeredis.FakeRedis(server=server))
+    for key in [("abc", "nt"), ("abc", "ttl"), ("other", "nt")]:
+        backend.put(key, "x", 1)
+
+    backend.invalidate("abc")
+
+    assert backend.get(("abc", "nt")) is None
+    assert backend.get(("abc", "ttl")) is None
+    assert backend.get(("other", "nt")) == "x"
+    assert backend.snapshot()["invalidations"] == 2
+
+
+def test_redis_errors_are_misses(server):
+    backend = make_backend(fakeredis.FakeRedis(server=server))
+    server.connected = False
+
+    backend.put(("abc", "nt"), "x", 1)
+    backend.invalidate("abc")
+
+    assert backend.get(("abc", "nt")) is None
+    assert backend.snapshot()["errors"] == 3
+
+
+def test_sized_lru_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr("bluecore_api.sized_lru.time.monotonic", lambda: now)
+    lru: SizedLRU[tuple, str] = SizedLRU(1024)
+    lru.put(("abc", "nt"), "x", 1, ttl=60)
+    lru.put(("abc", "ttl"), "y", 1)
+
+    now += 61
+
+    assert lru.get(("abc", "nt")) is None
+    assert lru.get(("abc", "ttl")) == "y"
+    assert lru.snapshot()["expirations"] == 1
+    assert lru.snapshot()["bytes"] == 1
+
+
+def test_local_invalidations():
+    invalidations = Invalidations()
+    received = []
+    invalidations.subscribe("representations", received.append)
+
+    invalidations.publish("representations", "abc")
+    invalidations.publish("other_resources", 2)
+
+    assert received == ["abc"]
+
+
+def test_redis_invalidations_reach_other_workers(server):
+    first = RedisInvalidations(fakeredis.FakeRedis(server=server))
+    second = RedisInvalidations(fakeredis.FakeRedis(server=server))
+    first_received, second_received = [], []
+    first.subscribe("other_resources", first_received.append)
+    second.subscribe("other_resources", second_received.append)
+    try:
+        first.publish("other_resources", 2)
+
+        wait_for(lambda: second_received == ["2"])
+        # the publisher's own listeners run once, without waiting for the echo
+        time.sleep(0.1)
+        assert first_received == ["2"]
+    finally:
+        first.close()
+        second.close()
+
+
+def test_publish_survives_redis_errors(server, monkeypatch):
+    invalidations = RedisInvalidations(fakeredis.FakeRedis(server=server))
+    received = []
+    invalidations.subscribe("representations", received.append)
+    invalidations.close()
+
+    def unavailable(*args):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(invalidations._client, "publish", unavailable)
+    invalidations.publish("representations", "abc")
+
+    assert received == ["abc"]
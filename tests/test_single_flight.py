@@ -0,0 +1,189 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from bluecore_api.conditional import Validators
+from bluecore_api.selective_expansion import Expansion
+from bluecore_api.single_flight import SingleFlight, read_key
+
+
+class Renderer:
+    """A render that blocks until released, counting its calls."""
+
+    def __init__(self, response=None, error=None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.response = response or Response(
+            content=b"<rdf:RDF/>", media_type="application/rdf+xml"
+        )
+        self.error = error
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+async def started(*coroutines) -> list[asyncio.Task]:
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    # let every task reach the flight
+    for _ in range(3):
+        await asyncio.sleep(0)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_render():
+    flight = SingleFlight(enabled=True)
+    render = Renderer()
+
+    tasks = await started(*(flight.run("key", render) for _ in range(5)))
+    render.release.set()
+    responses = await asyncio.gather(*tasks)
+
+    assert render.calls == 1
+    assert {response.body for response in responses} == {b"<rdf:RDF/>"}
+    assert all(
+        response.headers["content-type"] == "application/rdf+xml"
+        for response in responses
+    )
+    assert len({id(response) for response in responses}) == 5
+    assert flight.snapshot() == {
+        "enabled": True,
+        "in_flight": 0,
+        "renders": 1,
+        "shared": 1,
+        "coalesced": 4,
+        "takeovers": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_streamed_bodies_are_shared():
+    async def chunks():
+        yield b"<a> <b> "
+        yield "<c> ."
+
+    flight = SingleFlight(enabled=True)
+    render = Renderer(StreamingResponse(chunks(), media_type="application/n-triples"))
+
+    tasks = await started(flight.run("key", render), flight.run("key", render))
+    render.release.set()
+    first, second = await asyncio.gather(*tasks)
+
+    assert first.body == second.body == b"<a> <b> <c> ."
+    assert second.headers["content-length"] == "13"
+
+
+@pytest.mark.asyncio
+async def test_unshared_responses_are_returned_as_they_are():
+    flight = SingleFlight(enabled=True)
+    render = Renderer(StreamingResponse(iter([b"x"])))
+    render.release.set()
+
+    response = await flight.run("key", render)
+
+    assert response is render.response
+    assert flight.snapshot()["shared"] == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_render_separately():
+    flight = SingleFlight(enabled=True)
+    render = Renderer()
+
+    tasks = await started(
+        flight.run("nt", render), flight.run("ttl", render), flight.run(None, render)
+    )
+    render.release.set()
+    await asyncio.gather(*tasks)
+
+    assert render.calls == 3
+    assert flight.snapshot()["coalesced"] == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_request():
+    flight = SingleFlight(enabled=True)
+    render = Renderer(error=HTTPException(status_code=404))
+
+    tasks = await started(flight.run("key", render), flight.run("key", render))
+    render.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert render.calls == 1
+    assert all(isinstance(result, HTTPException) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_waiting_request_takes_over_from_a_cancelled_one():
+    flight = SingleFlight(enabled=True)
+    render = Renderer()
+
+    leader, follower = await started(
+        flight.run("key", render), flight.run("key", render)
+    )
+    leader.cancel()
+    await started()
+    render.release.set()
+    response = await follower
+
+    assert leader.cancelled()
+    assert response.body == b"<rdf:RDF/>"
+    assert render.calls == 2
+    assert flight.snapshot()["takeovers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_follower_leaves_the_render_running():
+    flight = SingleFlight(enabled=True)
+    render = Renderer()
+
+    leader, follower = await started(
+        flight.run("key", render), flight.run("key", render)
+    )
+    follower.cancel()
+    await started()
+    render.release.set()
+
+    assert (await leader).body == b"<rdf:RDF/>"
+    assert render.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled():
+    flight = SingleFlight(enabled=False)
+    render = Renderer()
+
+    tasks = await started(flight.run("key", render), flight.run("key", render))
+    render.release.set()
+    await asyncio.gather(*tasks)
+
+    assert render.calls == 2
+
+
+def test_read_key():
+    def request(accept_encoding="gzip") -> Request:
+        return Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/instances/abc.cbd.xml",
+                "query_string": b"",
+                "headers": [(b"accept-encoding", accept_encoding.encode())],
+            }
+        )
+
+    validators = Validators(etag='"1"', last_modified=None)
+    changed = Validators(etag='"2"', last_modified=None)
+    key = read_key(request(), "cbd.xml", None, validators)
+
+    assert key == read_key(request(), "cbd.xml", None, validators)
+    assert key != read_key(request(), "cbd.xml", None, changed)
+    assert key != read_key(request(), "cbd.xml", Expansion(), validators)
+    assert key != read_key(request("identity"), "cbd.xml", None, validators)
+    assert read_key(request(), "cbd.xml", None, None) is None
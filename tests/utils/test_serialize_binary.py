@@ -0,0 +1,94 @@
+"""The binary RDF writer and its reference decoder round-trip the graph."""
+
+import copy
+import json
+import pathlib
+
+import pytest
+from bluecore_models.utils.graph import load_jsonld
+from rdflib.compare import isomorphic
+
+from bluecore_api.app.utils.serialize.binary import (
+    MAGIC,
+    binary_rdf,
+    decode,
+    decode_graph,
+    graph_triples,
+)
+from bluecore_api.app.utils.serialize.ntriples import CHUNK_SIZE
+from bluecore_api.app.utils.serialize.triples import (
+    IRI,
+    BlankNode,
+    Literal,
+    all_triples,
+)
+
+FILES = [
+    "tests/blue-core-work.jsonld",
+    "tests/blue-core-instance.jsonld",
+    "tests/blue-core-hub.jsonld",
+    "tests/23807141.jsonld",
+]
+
+
+@pytest.mark.parametrize("path", FILES)
+def test_round_trip(path):
+    data = json.loads(pathlib.Path(path).read_text())
+    triples = list(all_triples([data]))
+
+    body = b"".join(binary_rdf(triples))
+
+    assert list(decode(body)) == triples
+    assert isomorphic(decode_graph(body), load_jsonld(copy.deepcopy(data)))
+
+
+def test_terms_are_written_once():
+    subject = IRI("https://bcld.info/works/1")
+    label = Literal("Title", language="en")
+    triples = [
+        (subject, IRI("http://www.w3.org/2000/01/rdf-schema#label"), label),
+        (subject, IRI("http://id.loc.gov/ontologies/bibframe/title"), label),
+        (BlankNode("b0"), IRI("http://id.loc.gov/ontologies/bibframe/title"), label),
+        (IRI("b0"), IRI("http://id.loc.gov/ontologies/bibframe/title"), label),
+    ]
+
+    body = b"".join(binary_rdf(triples))
+
+    assert body.count(b"Title") == 1
+    assert body.count(b"http://id.loc.gov/ontologies/bibframe/") == 1
+    assert list(decode(body)) == triples
+    # a blank node and an IRI with the same label stay apart
+    assert [type(s) for s, _, _ in decode(body)] == [IRI, IRI, BlankNode, IRI]
+
+
+def test_graph_triples():
+    data = json.loads(pathlib.Path(FILES[0]).read_text())
+    graph = load_jsonld(data)
+
+    body = b"".join(binary_rdf(graph_triples(graph)))
+
+    assert isomorphic(decode_graph(body), graph)
+
+
+def test_chunks():
+    batch = json.loads(pathlib.Path("sample/batch.jsonld").read_text())
+
+    chunks = list(binary_rdf(all_triples(batch, batch[0]["@context"])))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < 2 * CHUNK_SIZE for chunk in chunks)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"BCRDF\x02",
+        MAGIC + b"\x07\x01\x01\x01",
+        MAGIC + b"\x08\x01\x01",
+        MAGIC + b"\x04\x05ab",
+        MAGIC + b"\x63",
+    ],
+)
+def test_malformed(body):
+    with pytest.raises(ValueError):
+        list(decode(body))
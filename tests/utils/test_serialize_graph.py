@@ -0,0 +1,85 @@
+"""`load_graph` reads stored JSON-LD into the Graph `load_jsonld` would."""
+
+import copy
+import json
+import pathlib
+
+import pytest
+from bluecore_models.utils.graph import load_jsonld
+from rdflib.compare import isomorphic
+
+from bluecore_api.app.utils.serialize import graph
+from bluecore_api.app.utils.serialize.graph import (
+    add_document,
+    load_graph,
+    rdf_triples,
+)
+
+FILES = sorted(str(path) for path in pathlib.Path("tests").glob("*.jsonld"))
+BATCH = json.loads(pathlib.Path("sample/batch.jsonld").read_text())
+
+
+@pytest.fixture
+def parsed_by_rdflib(monkeypatch):
+    """Records the documents that fell back to `load_jsonld`."""
+    documents = []
+
+    def load_jsonld_spy(data):
+        documents.append(data)
+        return load_jsonld(data)
+
+    monkeypatch.setattr(graph, "load_jsonld", load_jsonld_spy)
+    return documents
+
+
+@pytest.mark.parametrize("path", FILES)
+def test_files(path, parsed_by_rdflib):
+    data = json.loads(pathlib.Path(path).read_text())
+
+    loaded = load_graph(copy.deepcopy(data))
+
+    assert not parsed_by_rdflib
+    assert isomorphic(loaded, load_jsonld(data))
+
+
+@pytest.mark.parametrize("index", range(len(BATCH)))
+def test_batch(index, parsed_by_rdflib):
+    data = BATCH[index]
+
+    loaded = load_graph(copy.deepcopy(data))
+
+    assert not parsed_by_rdflib
+    assert isomorphic(loaded, load_jsonld(copy.deepcopy(data)))
+
+
+def test_doubles(parsed_by_rdflib):
+    data = {"@id": "http://example.org/a", "http://example.org/ratio": 1.23456789}
+
+    loaded = load_graph(copy.deepcopy(data))
+
+    assert not parsed_by_rdflib
+    assert isomorphic(loaded, load_jsonld(data))
+
+
+def test_add_document():
+    documents = [json.loads(pathlib.Path(path).read_text()) for path in FILES[:2]]
+    expected = load_jsonld(copy.deepcopy(documents[0]))
+    expected += load_jsonld(copy.deepcopy(documents[1]))
+
+    loaded = add_document(load_graph(documents[0]), documents[1])
+
+    assert isomorphic(loaded, expected)
+
+
+def test_unsupported_documents_use_rdflib(parsed_by_rdflib):
+    data = {
+        "@id": "http://example.org/a",
+        "@reverse": {"http://example.org/vocab#knows": {"@id": "http://example.org/b"}},
+    }
+
+    loaded = load_graph(data)
+    triples = set(rdf_triples(data))
+
+    assert parsed_by_rdflib == [data, data]
+    assert set(loaded) == triples
+    assert len(triples) == 1
@@ -0,0 +1,70 @@
+"""The fast JSON-LD / Sinopia JSON encoders match the pydantic schemas."""
+
+import json
+import pathlib
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from bluecore_models.models import Hub, Instance, Work
+
+from bluecore_api.app.utils.serialize.response_generator import (
+    as_jsonld,
+    as_vnd_sinopia_json,
+)
+from bluecore_api.constants import CONTEXT_URL
+from bluecore_api.schemas.schemas import HubSchema, InstanceSchema, WorkSchema
+
+work_data = json.loads(pathlib.Path("tests/blue-core-work.jsonld").read_text())
+instance_data = json.loads(pathlib.Path("tests/blue-core-instance.jsonld").read_text())
+hub_data = json.loads(pathlib.Path("tests/blue-core-hub.jsonld").read_text())
+
+
+def resource(model, data, **kwargs):
+    return model(
+        id=7,
+        uuid=uuid.uuid4(),
+        uri="https://bcld.info/resources/7",
+        data=data,
+        created_at=datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=UTC),
+        updated_at=datetime(2025, 2, 3, 4, 5, 6, tzinfo=UTC),
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "doc,schema",
+    [
+        (resource(Work, work_data, hub_id=3), WorkSchema),
+        (resource(Instance, instance_data, work_id=4), InstanceSchema),
+        (resource(Hub, hub_data), HubSchema),
+    ],
+)
+def test_sinopia_json_matches_schema(doc, schema):
+    expected = schema.model_validate(doc).model_dump(mode="json")
+    expected["data"] = {**doc.data, "@context": CONTEXT_URL}
+
+    assert json.loads(as_vnd_sinopia_json(doc, expand=False).body) == expected
+
+
+class DriverUUID(uuid.UUID):
+    """asyncpg reads uuid columns as a subclass of uuid.UUID."""
+
+
+def test_sinopia_json_driver_uuid():
+    doc = resource(Work, work_data, hub_id=3)
+    doc.uuid = DriverUUID(str(doc.uuid))
+
+    body = json.loads(as_vnd_sinopia_json(doc, expand=False).body)
+
+    assert body["uuid"] == str(doc.uuid)
+
+
+def test_jsonld_swaps_context_without_touching_doc():
+    doc = resource(Work, work_data, hub_id=3)
+    stored = json.dumps(doc.data)
+
+    body = json.loads(as_jsonld(doc, expand=False).body)
+
+    assert body == {**doc.data, "@context": CONTEXT_URL}
+    assert json.dumps(doc.data) == stored
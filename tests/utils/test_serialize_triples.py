@@ -0,0 +1,195 @@
+"""The streaming N-Triples, Turtle and RDF/XML writers give the graph rdflib reads."""
+
+import copy
+import json
+import pathlib
+import tracemalloc
+
+import pytest
+from bluecore_models.utils.graph import load_jsonld
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from bluecore_api.app.utils.serialize.ntriples import (
+    CHUNK_SIZE,
+    ntriples,
+    rdfxml,
+    turtle,
+)
+from bluecore_api.app.utils.serialize.triples import all_triples, supported
+
+FILES = [
+    "tests/blue-core-work.jsonld",
+    "tests/blue-core-instance.jsonld",
+    "tests/blue-core-hub.jsonld",
+    "tests/23807141.jsonld",
+]
+WRITERS = [(ntriples, "nt"), (turtle, "turtle"), (rdfxml, "xml")]
+
+
+def expected_graph(*documents) -> Graph:
+    graph = Graph()
+    for data in documents:
+        graph += load_jsonld(copy.deepcopy(data))
+    return graph
+
+
+def written_graph(writer, documents, format) -> Graph:
+    return Graph().parse(
+        data=b"".join(writer(all_triples(documents))).decode(), format=format
+    )
+
+
+@pytest.mark.parametrize("writer,format", WRITERS)
+@pytest.mark.parametrize("path", FILES)
+def test_matches_rdflib(path, writer, format):
+    data = json.loads(pathlib.Path(path).read_text())
+    assert supported(data)
+
+    assert isomorphic(written_graph(writer, [data], format), expected_graph(data))
+
+
+@pytest.mark.parametrize("writer,format", WRITERS)
+def test_compacted_documents(writer, format):
+    """The sample batch is compacted with its own context."""
+    batch = json.loads(pathlib.Path("sample/batch.jsonld").read_text())[:5]
+    context = batch[0]["@context"]
+
+    triples = b"".join(writer(all_triples(batch, context))).decode()
+    graph = Graph().parse(data=triples, format=format)
+
+    expected = Graph()
+    for data in batch:
+        expected.parse(data=json.dumps(data), format="json-ld")
+    assert isomorphic(graph, expected)
+
+
+def test_own_context_replaces_context():
+    """A document with its own @context is read with it alone, as rdflib does."""
+    data = {
+        "@context": {"@vocab": "http://example.org/"},
+        "@id": "http://example.org/a",
+        "hasInstance": {"@id": "http://example.org/b", "label": "b"},
+    }
+
+    assert supported(data)
+    assert isomorphic(
+        Graph().parse(
+            data=b"".join(ntriples(all_triples([data]))).decode(), format="nt"
+        ),
+        expected_graph(data),
+    )
+
+
+def test_context_terms_read_with_vocab():
+    """CONTEXT defines hasInstance by its @type only, so @vocab gives its IRI."""
+    data = {
+        "@id": "https://bcld.info/works/1",
+        "@type": "Work",
+        "hasInstance": "https://bcld.info/instances/1",
+    }
+
+    assert isomorphic(written_graph(ntriples, [data], "nt"), expected_graph(data))
+    assert len(expected_graph(data)) == 2
+
+
+def test_values_and_lists():
+    context = {
+        "@vocab": "http://example.org/",
+        "ex": "http://example.org/",
+        "link": {"@id": "ex:link", "@type": "@id"},
+        "when": {"@id": "ex:when", "@type": "http://www.w3.org/2001/XMLSchema#date"},
+        "items": {"@id": "ex:items", "@container": "@list"},
+    }
+    data = {
+        "@id": "http://example.org/a",
+        "@type": "Thing",
+        "link": "http://example.org/b",
+        "when": "2025-01-01",
+        "items": ["one", 2, True],
+        "label": [{"@value": 'say "hi"\nthere', "@language": "en"}, None],
+        "nested": {"name": "blank"},
+        "empty": {"@list": []},
+    }
+
+    triples = b"".join(ntriples(all_triples([data], context))).decode()
+    expected = json.dumps({**data, "@context": context})
+
+    assert isomorphic(
+        Graph().parse(data=triples, format="nt"),
+        Graph().parse(data=expected, format="json-ld"),
+    )
+
+
+def test_doubles_keep_their_precision():
+    data = {
+        "@id": "https://bcld.info/works/1",
+        "http://example.org/ratio": [1.23456789, {"@value": 123456789012345.6}],
+    }
+
+    triples = b"".join(ntriples(all_triples([data]))).decode()
+
+    assert '"1.23456789E0"' in triples
+    assert '"1.234567890123456E14"' in triples
+    assert isomorphic(Graph().parse(data=triples, format="nt"), expected_graph(data))
+
+
+def test_unsupported_documents():
+    assert not supported({"@id": "http://example.org/a", "@reverse": {}})
+    assert not supported([{"@id": "relative"}])
+    assert not supported({"@id": "http://example.org/a"}, "https://example.org/ctx")
+    assert supported({"@context": {"@vocab": "http://example.org/"}, "@graph": []})
+
+
+def test_streams_in_chunks(monkeypatch):
+    monkeypatch.setattr("bluecore_api.app.utils.serialize.ntriples.CHUNK_SIZE", 1024)
+    data = json.loads(pathlib.Path("tests/23807141.jsonld").read_text())
+
+    chunks = list(ntriples(all_triples([data])))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) < 2048 for chunk in chunks)
+
+
+def test_rdfxml_declares_other_namespaces():
+    data = {
+        "@id": "http://example.org/a",
+        "http://example.org/vocab#label": {"@value": "<a> & b", "@language": "en"},
+        "http://example.org/vocab#link": {"@id": "_:b0"},
+    }
+
+    body = b"".join(rdfxml(all_triples([data], {}))).decode()
+
+    assert isomorphic(
+        Graph().parse(data=body, format="xml"),
+        Graph().parse(data=json.dumps(data), format="json-ld"),
+    )
+
+
+def large_document(nodes: int) -> dict:
+    return {
+        "@graph": [
+            {
+                "@id": f"http://example.org/works/{i}",
+                "@type": "http://id.loc.gov/ontologies/bibframe/Work",
+                "http://www.w3.org/2000/01/rdf-schema#label": f"Work number {i}",
+            }
+            for i in range(nodes)
+        ]
+    }
+
+
+@pytest.mark.parametrize("writer,format", WRITERS)
+def test_memory_bounded_by_chunk_size(writer, format):
+    """Peak memory while writing follows the chunk size, not the body size."""
+    documents = [large_document(20_000)]
+
+    tracemalloc.start()
+    try:
+        size = sum(len(chunk) for chunk in writer(all_triples(documents)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert size > 16 * CHUNK_SIZE
+    assert peak < 8 * CHUNK_SIZE